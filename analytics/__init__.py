@@ -0,0 +1 @@
+# Shared analytics pipeline code used by the notebooks and the consultant tool.
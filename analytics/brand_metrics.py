@@ -0,0 +1,87 @@
+"""Per-brand base metrics computed inside SQLite.
+
+The GROUP BY queries below replace pulling the whole tweets/products tables
+into pandas: only one row per brand ever leaves the database.
+"""
+import pandas as pd
+
+# --- Configuration ---
+# Tweets whose date does not look like 'Mon Oct 20 16:41:09 +0000 2025' are dropped by the
+# notebook's cleaning step (unparseable -> NaT), so they are not counted here either.
+TWEET_DATE_GLOB = '[A-Z][a-z][a-z] [A-Z][a-z][a-z] [0-3][0-9] [0-2][0-9]:[0-5][0-9]:[0-6][0-9] +0000 [0-9][0-9][0-9][0-9]'
+
+METRIC_COLUMNS = ['brand_name', 'tweet_volume', 'market_saturation', 'avg_perceived_quality', 'avg_num_reviews']
+RATING_SCALE = 1000 # Ratings are summed as integer thousandths, so the averages are exact
+
+
+# --- Indexes ---
+def ensure_indexes(conn):
+    """Indexes that let the aggregates below run as index-only scans. scraper/init_db.py creates them;
+    the write stages (streaming_metrics, hype_velocity) call this for databases made before that,
+    never the read path (a schema write there can hit 'database is locked' while a scraper runs)."""
+    cursor = conn.cursor()
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_brand_date ON tweets (brand_name, tweet_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_brand_id ON products (brand_id)")
+    conn.commit()
+
+
+# --- Aggregation Queries ---
+def query_tweet_volume(conn):
+    """tweet_volume per brand (tweets with a parseable date only)."""
+    return pd.read_sql_query("""
+        SELECT brand_name, COUNT(*) AS tweet_volume
+        FROM tweets
+        WHERE brand_name IS NOT NULL
+          AND tweet_date GLOB ?
+        GROUP BY brand_name
+    """, conn, params=(TWEET_DATE_GLOB,))
+
+
+def query_product_metrics(conn):
+    """market_saturation, avg_perceived_quality and avg_num_reviews per brand.
+    Missing ratings/review counts count as 0 (same as the notebook's cleaning step)."""
+    df = pd.read_sql_query("""
+        SELECT
+            b.brand_name,
+            COUNT(p.product_name) AS market_saturation,
+            SUM(CAST(ROUND(COALESCE(p.avg_rating, 0) * ?) AS INTEGER)) AS rating_total,
+            SUM(CAST(COALESCE(p.num_reviews, 0) AS INTEGER)) AS num_reviews_total,
+            COUNT(*) AS n_products
+        FROM products p
+        JOIN brands b ON p.brand_id = b.id
+        GROUP BY b.brand_name
+    """, conn, params=(RATING_SCALE,))
+    # Averaged and rounded (half up, for cleaner display) in integer arithmetic: a float AVG/mean
+    # depends on summation order and can land 0.01 apart at a rounding boundary
+    df['avg_perceived_quality'] = rounded_mean(df['rating_total'], df['n_products'] * RATING_SCALE)
+    df['avg_num_reviews'] = rounded_mean(df['num_reviews_total'], df['n_products'])
+    return df[['brand_name', 'market_saturation', 'avg_perceived_quality', 'avg_num_reviews']]
+
+
+def rounded_mean(totals, counts, decimals=2):
+    """Exact totals / counts (integer Series) rounded half up to `decimals`."""
+    scale = 10 ** decimals
+    totals, counts = totals.astype('int64'), counts.astype('int64')
+    return ((2 * totals * scale + counts) // (2 * counts)) / scale
+
+
+def combine_metrics(df_tweet_volume, df_product_metrics):
+    """Outer-joins the tweet and product aggregates, filling brands missing on one side with 0."""
+    df_combined = pd.merge(df_tweet_volume, df_product_metrics, on='brand_name', how='outer')
+    df_combined['tweet_volume'] = df_combined['tweet_volume'].fillna(0).astype(int)
+    df_combined['market_saturation'] = df_combined['market_saturation'].fillna(0).astype(int)
+    df_combined['avg_perceived_quality'] = df_combined['avg_perceived_quality'].fillna(0)
+    df_combined['avg_num_reviews'] = df_combined['avg_num_reviews'].fillna(0)
+    return df_combined[METRIC_COLUMNS].sort_values('brand_name').reset_index(drop=True)
+
+
+def fetch_brand_metrics(conn):
+    """One row per brand: tweet_volume, market_saturation, avg_perceived_quality, avg_num_reviews."""
+    return combine_metrics(query_tweet_volume(conn), query_product_metrics(conn))
+
+
+def attach_sentiment(df_metrics, df_sentiment):
+    """Adds avg_tweet_sentiment (computed from tweet text outside SQL) to the base metrics."""
+    df_combined = pd.merge(df_metrics, df_sentiment[['brand_name', 'avg_tweet_sentiment']], on='brand_name', how='left')
+    df_combined['avg_tweet_sentiment'] = df_combined['avg_tweet_sentiment'].fillna(0.0)
+    return df_combined
@@ -0,0 +1,82 @@
+"""Compact in-memory layout for the loaded tweet, product and brand metrics frames.
+
+read_sql_query() / read_csv() give every string column Python string objects
+and every number int64/float64. compact_frame() rewrites a frame so that:
+  - low-cardinality strings (brand_name, platform, language, ...) become categoricals,
+  - the remaining free-text strings become Arrow-backed strings (when pyarrow is
+    installed; without it they are left as they are),
+  - integers use the smallest type that holds their values,
+  - floats become float32 where that loses nothing (whole numbers, halves, ...).
+
+Values are unchanged, so the compacted frames are drop-in replacements for the
+ones they were built from.
+"""
+import numpy as np
+import pandas as pd
+
+# --- Configuration ---
+CATEGORY_MAX_RATIO = 0.5 # A string column becomes categorical if it has at most this many distinct values per row
+MB = 1024 * 1024
+
+
+def arrow_string_dtype():
+    """pandas' Arrow-backed string dtype (missing values stay NaN, as in object columns),
+    or None if pyarrow is not installed."""
+    try:
+        import pyarrow # noqa: F401 (only checks that it is installed)
+    except ImportError:
+        return None
+    return pd.StringDtype('pyarrow', na_value=np.nan)
+
+
+def is_arrow_string(dtype):
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow'
+
+
+def is_text_column(series):
+    return (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)) \
+        and pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty')
+
+
+def compact_floats(series):
+    """float32 if every value survives the round trip, else the series unchanged."""
+    as_float32 = series.astype(np.float32)
+    if np.array_equal(as_float32.to_numpy(dtype=np.float64), series.to_numpy(dtype=np.float64), equal_nan=True):
+        return as_float32
+    return series
+
+
+def compact_frame(df, text_columns=(), category_max_ratio=CATEGORY_MAX_RATIO):
+    """Copy of `df` in the compact layout described above. `text_columns` are never made categorical
+    (free text, or strings that are parsed later, such as tweet dates)."""
+    df = df.copy()
+    text_dtype = arrow_string_dtype()
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series.dtype):
+            continue
+        if pd.api.types.is_integer_dtype(series.dtype):
+            df[column] = pd.to_numeric(series, downcast='integer') # Signed, like the source column
+        elif pd.api.types.is_float_dtype(series.dtype):
+            df[column] = compact_floats(series)
+        elif is_text_column(series):
+            if column not in text_columns and len(series) and series.nunique(dropna=True) <= category_max_ratio * len(series):
+                df[column] = series.astype('category')
+            elif text_dtype is not None and not is_arrow_string(series.dtype):
+                df[column] = series.astype(text_dtype)
+    return df
+
+
+def frame_memory(df):
+    """Bytes held by `df`, strings included."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def compact_and_report(df, label, text_columns=()):
+    """compact_frame() plus a one-line memory report (before -> after) printed for `label`."""
+    before = frame_memory(df)
+    df = compact_frame(df, text_columns)
+    after = frame_memory(df)
+    ratio = before / after if after else 1.0
+    print(f"   {label}: {before / MB:.1f} MB -> {after / MB:.1f} MB ({ratio:.1f}x smaller, {len(df)} rows)")
+    return df
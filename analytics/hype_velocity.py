@@ -0,0 +1,196 @@
+"""Time-windowed hype metrics: tweet velocity, week-over-week momentum and Google Trends slope.
+
+Run from the project root (after the scrapers):
+    python -m analytics.hype_velocity
+
+Daily tweet counts are grouped inside SQLite, then every brand's rolling
+windows and trend slope are computed at once on a (brands x days) NumPy matrix.
+Results go to the 'brand_hype_velocity' table, which consultant_tool_v3 reads.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from analytics.brand_metrics import TWEET_DATE_GLOB, ensure_indexes
+from analytics.instrumentation import profiled, span
+
+# --- Configuration ---
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
+
+WEEK_DAYS = 7
+MONTH_DAYS = 28
+TREND_WINDOW_DAYS = 90 # Google Trends history used for the interest slope
+NEW_BRAND_MOMENTUM = 3.0 # +300%: WoW momentum of a brand with no tweets the week before (matches the scoring clip)
+
+VELOCITY_COLUMNS = ['brand_name', 'as_of_date', 'tweets_last_7d', 'tweets_prev_7d', 'tweets_per_day_7d',
+                    'tweets_per_day_28d', 'wow_momentum', 'trend_slope']
+
+MONTHS = {'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+          'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'}
+
+
+# --- Daily Counts (SQL) ---
+def query_daily_tweet_counts(conn):
+    """(brand_name, day, n) rows. 'Mon Oct 20 16:41:09 +0000 2025' -> '2025-10-20' is built in SQL."""
+    month_case = " ".join(f"WHEN '{abbr}' THEN '{num}'" for abbr, num in MONTHS.items())
+    return pd.read_sql_query(f"""
+        SELECT brand_name,
+               substr(tweet_date, 27, 4) || '-' || CASE substr(tweet_date, 5, 3) {month_case} END
+                   || '-' || substr(tweet_date, 9, 2) AS day,
+               COUNT(*) AS n
+        FROM tweets
+        WHERE brand_name IS NOT NULL
+          AND tweet_date GLOB ?
+        GROUP BY brand_name, day
+    """, conn, params=(TWEET_DATE_GLOB,))
+
+
+def query_trend_interest(conn):
+    """(brand_name, day, interest_score) rows from the Google Trends scrape (empty if never scraped)."""
+    try:
+        return pd.read_sql_query("""
+            SELECT brand_name, date AS day, interest_score
+            FROM google_trends_data
+            WHERE brand_name IS NOT NULL AND interest_score IS NOT NULL
+        """, conn)
+    except Exception as e:
+        print(f"   Could not read google_trends_data (this is OK if trends were never scraped): {e}")
+        return pd.DataFrame(columns=['brand_name', 'day', 'interest_score'])
+
+
+# --- Vectorised Window Maths ---
+def to_day_matrix(df_daily, value_column, brands, fill_value=0.0):
+    """Pivots (brand, day, value) rows into a dense brands x days matrix over a continuous date range."""
+    days = pd.to_datetime(df_daily['day'], errors='coerce')
+    df_daily = df_daily.assign(day=days).dropna(subset=['day'])
+    if df_daily.empty:
+        return np.full((len(brands), 0), fill_value), pd.DatetimeIndex([])
+    all_days = pd.date_range(df_daily['day'].min(), df_daily['day'].max(), freq='D')
+    matrix = (df_daily.pivot_table(index='brand_name', columns='day', values=value_column, aggfunc='sum')
+              .reindex(index=brands, columns=all_days))
+    values = matrix.to_numpy(dtype=float)
+    if not np.isnan(fill_value):
+        values = np.nan_to_num(values, nan=fill_value)
+    return values, all_days
+
+
+def trailing_window_sums(counts, window):
+    """Sum of the last `window` days and of the `window` days before that, for every brand (row)."""
+    cumsum = np.concatenate([np.zeros((counts.shape[0], 1)), np.cumsum(counts, axis=1)], axis=1)
+    end = counts.shape[1]
+    last = cumsum[:, end] - cumsum[:, max(end - window, 0)]
+    prev = cumsum[:, max(end - window, 0)] - cumsum[:, max(end - 2 * window, 0)]
+    return last, prev
+
+
+def row_slopes(values):
+    """Least-squares slope (per day) of each row against its column index, ignoring NaNs."""
+    x = np.broadcast_to(np.arange(values.shape[1], dtype=float), values.shape)
+    mask = ~np.isnan(values)
+    n = mask.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.where(mask, x, 0).sum(axis=1) / n
+        y_mean = np.where(mask, values, 0).sum(axis=1) / n
+        dx = np.where(mask, x - x_mean[:, None], 0)
+        dy = np.where(mask, values - y_mean[:, None], 0)
+        slopes = (dx * dy).sum(axis=1) / (dx ** 2).sum(axis=1)
+    return np.where(n >= 2, slopes, 0.0)
+
+
+def wow_momentum(last_7, prev_7):
+    """Week-over-week change as a ratio. Without tweets the week before there is no ratio, so new
+    activity is capped at NEW_BRAND_MOMENTUM (and no activity at all is 0) instead of reporting the raw count."""
+    ratio = (last_7 - prev_7) / np.maximum(prev_7, 1)
+    return np.where(prev_7 > 0, ratio, np.where(last_7 > 0, NEW_BRAND_MOMENTUM, 0.0))
+
+
+def compute_hype_velocity(conn):
+    """One row per brand with tweet velocity, week-over-week momentum and trend-interest slope."""
+    with span('hype.query_daily_tweets') as s:
+        df_daily = query_daily_tweet_counts(conn)
+        s.add(items=len(df_daily))
+    with span('hype.query_trends') as s:
+        df_trends = query_trend_interest(conn)
+        s.add(items=len(df_trends))
+    brands = sorted(set(df_daily['brand_name']) | set(df_trends['brand_name']))
+    if not brands:
+        return pd.DataFrame(columns=VELOCITY_COLUMNS)
+
+    # All brands share the same calendar, ending at the latest tweet day in the data
+    counts, days = to_day_matrix(df_daily, 'n', brands)
+    last_7, prev_7 = trailing_window_sums(counts, WEEK_DAYS)
+    last_28, _ = trailing_window_sums(counts, MONTH_DAYS)
+    momentum = wow_momentum(last_7, prev_7)
+
+    interest, _ = to_day_matrix(df_trends, 'interest_score', brands, fill_value=np.nan)
+    interest = interest[:, -TREND_WINDOW_DAYS:]
+    trend_slope = row_slopes(interest) * WEEK_DAYS # Interest points per week
+
+    return pd.DataFrame({
+        'brand_name': brands,
+        'as_of_date': days[-1].strftime('%Y-%m-%d') if len(days) else None,
+        'tweets_last_7d': last_7.astype(int),
+        'tweets_prev_7d': prev_7.astype(int),
+        'tweets_per_day_7d': (last_7 / WEEK_DAYS).round(2),
+        'tweets_per_day_28d': (last_28 / MONTH_DAYS).round(2),
+        'wow_momentum': momentum.round(3),
+        'trend_slope': trend_slope.round(3),
+    })
+
+
+# --- Persistence ---
+def save_hype_velocity(conn, df_velocity):
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS brand_hype_velocity")
+    cursor.execute('''
+    CREATE TABLE brand_hype_velocity (
+        brand_name TEXT PRIMARY KEY,
+        as_of_date TEXT,
+        tweets_last_7d INTEGER,
+        tweets_prev_7d INTEGER,
+        tweets_per_day_7d REAL,
+        tweets_per_day_28d REAL,
+        wow_momentum REAL,
+        trend_slope REAL,
+        computed_at TEXT
+    )
+    ''')
+    df_velocity = df_velocity.assign(computed_at=datetime.now().isoformat(timespec='seconds'))
+    cursor.executemany(
+        f"INSERT INTO brand_hype_velocity ({', '.join(df_velocity.columns)}) VALUES ({', '.join('?' * len(df_velocity.columns))})",
+        df_velocity.astype(object).where(df_velocity.notna(), None).itertuples(index=False, name=None)
+    )
+    conn.commit()
+
+
+def load_hype_velocity(conn):
+    """The stored velocity metrics, or an empty frame if the stage has not been run yet."""
+    try:
+        return pd.read_sql_query(f"SELECT {', '.join(VELOCITY_COLUMNS)} FROM brand_hype_velocity", conn)
+    except Exception:
+        return pd.DataFrame(columns=VELOCITY_COLUMNS)
+
+
+# --- MAIN EXECUTION ---
+def main():
+    if not os.path.exists(DB_PATH):
+        print(f"ERROR: Database file not found at {DB_PATH}")
+        return
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        print("\n--- Computing Hype Velocity & Momentum ---")
+        ensure_indexes(conn)
+        df_velocity = compute_hype_velocity(conn)
+        with span('sqlite.save', table='brand_hype_velocity', items=len(df_velocity)):
+            save_hype_velocity(conn, df_velocity)
+        print(df_velocity.sort_values('wow_momentum', ascending=False).head(10))
+        print(f"\n--- Saved velocity metrics for {len(df_velocity)} brands to 'brand_hype_velocity'. ---")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    with profiled('analytics.hype_velocity'):
+        main()
@@ -0,0 +1,262 @@
+"""Timing spans, counters and opt-in profiling for the scrapers, the analytics pipeline and the consultant tool.
+
+    with span('apify.actor_call', actor=ACTOR_ID, brand=brand_name) as s:
+        run = client.actor(ACTOR_ID).call(run_input=actor_input)
+        s.add(cost=run.get('usageTotalUsd'))
+
+Every finished span becomes one JSON line: name, start time, duration_s,
+status ('ok' or 'error' plus the exception), the enclosing span on the same
+thread, the measures added with add() (items, bytes, retries, cost; they
+accumulate) and any other fields. count('sqlite.commits') sums counters in
+the process; they are written as one 'counters' line at exit.
+
+Output is off unless KSA_TRACE is set: to a file path (lines are appended) or
+'-' for stderr. Spans cost a couple of perf_counter() calls when it is off.
+
+KSA_PROFILE=cprofile, tracemalloc or both (comma-separated) profiles every
+entry point wrapped in profiled(): the cProfile stats are saved to
+KSA_PROFILE_DIR (default data/profiles, open with pstats or snakeviz) and the
+top functions printed; tracemalloc prints the peak and the top allocation
+sites. cProfile only sees the thread that entered profiled() (for the GUI, the
+Tk thread; its worker threads show up in the spans). Scripts without
+profiled() can be run under it unchanged:
+    KSA_PROFILE=cprofile python -m analytics.instrumentation scraper/2_scrape_ecommerce_V2.py
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# --- Configuration ---
+TRACE_ENV = 'KSA_TRACE'
+PROFILE_ENV = 'KSA_PROFILE'
+PROFILE_DIR_ENV = 'KSA_PROFILE_DIR'
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'profiles')
+PROFILE_TOP = 25 # Functions / allocation sites printed per profile
+MEASURES = ('items', 'bytes', 'retries', 'cost')
+
+_lock = threading.Lock()
+_local = threading.local() # Per-thread stack of open spans
+_trace_file = None
+_counters = {}
+_profiling = False # A profiled() block is capturing (nested ones do not start a second profiler)
+
+
+# --- Output ---
+def tracing_enabled():
+    return bool(os.environ.get(TRACE_ENV))
+
+
+def emit(record):
+    """Writes one JSON line to the KSA_TRACE target (nothing if it is not set)."""
+    global _trace_file
+    target = os.environ.get(TRACE_ENV)
+    if not target:
+        return
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _lock:
+        if target == '-':
+            print(line, file=sys.stderr, flush=True)
+            return
+        if _trace_file is None or _trace_file.name != target:
+            _trace_file = open(target, 'a', encoding='utf-8')
+        _trace_file.write(line + "\n")
+        _trace_file.flush()
+
+
+# --- Spans ---
+class Span:
+    """One timed unit of work; see the module docstring. Use through span()."""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.measures = {}
+        self.add(**{key: fields.pop(key) for key in MEASURES if key in fields})
+        self.started_at = None
+        self.start = None
+        self.duration = None
+
+    def add(self, **measures):
+        """Adds to the span's measures (numbers accumulate, None is ignored), e.g. add(items=len(rows))."""
+        for key, value in measures.items():
+            if value is not None:
+                self.measures[key] = self.measures.get(key, 0) + value
+        return self
+
+    def set(self, **fields):
+        """Extra fields for the span's line (last value wins)."""
+        self.fields.update(fields)
+        return self
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        _local.stack.pop()
+        if tracing_enabled():
+            # sys.exit(0) from a script's main() is a normal finish
+            failed = exc_type is not None and not (issubclass(exc_type, SystemExit) and exc.code in (0, None))
+            record = {'event': 'span', 'name': self.name, 'started_at': self.started_at,
+                      'duration_s': round(self.duration, 6), 'status': 'error' if failed else 'ok'}
+            if failed:
+                record['error'] = f"{exc_type.__name__}: {exc}"
+            if self.parent:
+                record['parent'] = self.parent
+            record.update(self.measures)
+            record.update(self.fields)
+            record.update({'pid': os.getpid(), 'thread': threading.current_thread().name})
+            emit(record)
+        return False # Exceptions propagate
+
+
+def span(name, **fields):
+    """Context manager timing the block as `name`. Keyword fields go on its JSON line
+    (items/bytes/retries/cost start its measures)."""
+    return Span(name, fields)
+
+
+def traced_chunks(name, chunks, **fields):
+    """Yields from `chunks` (e.g. read_sql_query(chunksize=...)), timing each fetch as a span with items=len(chunk)."""
+    chunks = iter(chunks)
+    while True:
+        with span(name, **fields) as s:
+            chunk = next(chunks, None)
+            if chunk is not None:
+                s.add(items=len(chunk))
+        if chunk is None:
+            return
+        yield chunk
+
+
+def json_bytes(items):
+    """Approximate payload size of API items (their JSON encoding), for a span's bytes measure.
+    None (ignored by add()) when tracing is off, so untraced runs do not encode every dataset."""
+    if not tracing_enabled():
+        return None
+    return len(json.dumps(items, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+@contextmanager
+def client_retries(s, stats):
+    """Adds the retries an API client made inside the block to span `s`. `stats` counts API calls and
+    HTTP requests (apify_client's client.stats); every request beyond one per call is a retry."""
+    calls, requests = stats.calls, stats.requests
+    try:
+        yield
+    finally:
+        s.add(retries=(stats.requests - requests) - (stats.calls - calls))
+
+
+# --- Counters ---
+def count(name, n=1):
+    """Adds `n` to a process-wide counter (written as one 'counters' line at exit)."""
+    with _lock:
+        if not _counters:
+            atexit.register(flush_counters)
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def flush_counters():
+    """Emits the counters as one line and resets them."""
+    with _lock:
+        values = dict(_counters)
+        _counters.clear()
+    if values:
+        emit({'event': 'counters', 'at': datetime.now().isoformat(timespec='milliseconds'),
+              'pid': os.getpid(), 'counters': values})
+
+
+# --- Profiling (KSA_PROFILE) ---
+def profile_modes():
+    return {mode.strip().lower() for mode in os.environ.get(PROFILE_ENV, '').split(',') if mode.strip()}
+
+
+def save_cprofile(profiler, name):
+    import pstats
+    profile_dir = os.environ.get(PROFILE_DIR_ENV) or PROFILE_DIR
+    os.makedirs(profile_dir, exist_ok=True)
+    path = os.path.join(profile_dir, f"{name}-{datetime.now():%Y%m%d-%H%M%S}.prof")
+    profiler.dump_stats(path)
+    print(f"\n--- cProfile: {name} (saved to {os.path.abspath(path)}) ---")
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_TOP)
+    return path
+
+
+def report_tracemalloc(name):
+    import tracemalloc
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    top = snapshot.statistics('lineno')[:PROFILE_TOP]
+    print(f"\n--- tracemalloc: {name} (peak {peak / 1024 / 1024:.1f} MB, {current / 1024 / 1024:.1f} MB still allocated) ---")
+    for stat in top:
+        print(f"   {stat}")
+    emit({'event': 'memory', 'name': name, 'peak_bytes': peak, 'current_bytes': current,
+          'top': [{'site': str(stat.traceback), 'bytes': stat.size, 'blocks': stat.count} for stat in top[:10]]})
+
+
+@contextmanager
+def profiled(name):
+    """An entry point's outermost span; also runs cProfile/tracemalloc over it when KSA_PROFILE asks for them.
+    Nested entry points (a script run through main() below) only add their span."""
+    global _profiling
+    modes = set() if _profiling else profile_modes()
+    _profiling = _profiling or bool(modes)
+    profiler = None
+    if 'tracemalloc' in modes:
+        import tracemalloc
+        tracemalloc.start()
+    if 'cprofile' in modes:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        with span(name, entry_point=True):
+            yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if modes:
+            _profiling = False
+        if 'tracemalloc' in modes:
+            report_tracemalloc(name) # Before the cProfile report, whose allocations would show up here
+        if profiler is not None:
+            save_cprofile(profiler, name)
+        flush_counters()
+
+
+# --- MAIN EXECUTION ---
+def main(argv=None):
+    """python -m analytics.instrumentation script.py [args...]: runs the script as __main__ under profiled()."""
+    import runpy
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python -m analytics.instrumentation script.py [args...]")
+        return 2
+    script = argv[0]
+    sys.argv = list(argv)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script))) # As if the script had been run directly
+    with profiled(os.path.splitext(os.path.basename(script))[0]):
+        runpy.run_path(script, run_name='__main__')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
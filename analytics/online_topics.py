@@ -0,0 +1,229 @@
+"""Online (incrementally updated) per-brand topic models.
+
+Run after any scraper, from the project root:
+    python -m analytics.online_topics
+
+Each brand keeps a persisted LDA model that is only ever updated with
+`partial_fit` on tweets it has not seen yet, so a refresh costs as much as the
+new tweets, not the history. One tweets.id watermark (in MODEL_DIR/state.joblib)
+moves past every tweet read; the cleaned tweets of brands that do not have
+enough for a first fit yet are buffered there until they do. Each model also
+remembers the last tweet id it was fitted on, so a run cut short before the
+state was saved does not fit those tweets twice. The watermark row's
+(tweet_id, tweet_date) is remembered too: if that row is gone or different, the
+tweets table was cleared and re-filled (ids restart), so every model starts over.
+A HashingVectorizer means there is no vocabulary to refit.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+import joblib
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.utils import murmurhash3_32
+
+from analytics.instrumentation import profiled, span
+from analytics.preprocessing import clean_text
+from analytics.topic_modeling import build_stopwords, NUM_TOPICS, NUM_TOP_WORDS, MIN_TWEET_LENGTH
+
+# --- Configuration ---
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
+MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'topic_models')
+STATE_FILE = 'state.joblib' # Watermark, its row, the first-fit buffers and the brand names seen, in MODEL_DIR
+
+HASH_FEATURES = 2 ** 15 # Fixed feature space shared by every brand's model
+EXPECTED_DOCS_PER_BRAND = 10000 # LDA 'total_samples' (scales each online update)
+
+
+# --- Vectorizer & Model Helpers ---
+def make_vectorizer(stop_words):
+    """Stateless vectorizer: raw term counts hashed into HASH_FEATURES columns."""
+    return HashingVectorizer(n_features=HASH_FEATURES, alternate_sign=False, norm=None,
+                             stop_words=stop_words)
+
+def hash_column(token):
+    """Column a token lands in (same hashing as HashingVectorizer with alternate_sign=False)."""
+    return abs(murmurhash3_32(token, seed=0)) % HASH_FEATURES
+
+def new_brand_model(generation=0):
+    """Fresh state for a brand that has never been fitted."""
+    lda = LatentDirichletAllocation(n_components=NUM_TOPICS, learning_method='online',
+                                    learning_offset=50., total_samples=EXPECTED_DOCS_PER_BRAND,
+                                    random_state=42)
+    # 'vocab' remembers a readable token for each hashed column so topics can be displayed
+    return {'lda': lda, 'vocab': {}, 'last_tweet_id': 0, 'n_docs': 0, 'generation': generation}
+
+def model_path(brand_name):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', brand_name).strip('_').lower() or 'brand'
+    digest = hashlib.md5(brand_name.encode('utf-8')).hexdigest()[:8] # Keeps e.g. 'Al-Hilal'/'Al Hilal' apart
+    return os.path.join(MODEL_DIR, f"{slug}_{digest}.joblib")
+
+def load_brand_model(brand_name, generation=0):
+    """The brand's saved model, or a fresh one if there is none from this tweets table generation."""
+    path = model_path(brand_name)
+    if os.path.exists(path):
+        model = joblib.load(path)
+        if model.get('generation', 0) == generation:
+            return model
+    return new_brand_model(generation)
+
+def save_brand_model(brand_name, model):
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    joblib.dump(model, model_path(brand_name))
+
+def new_state(generation=0):
+    # 'watermark_row' is the (tweet_id, tweet_date) of the row with id == watermark;
+    # 'brand_names' (every brand read so far) are stopwords, so no refresh has to scan the whole table for them
+    return {'generation': generation, 'watermark': 0, 'watermark_row': None, 'pending': {}, 'brand_names': []}
+
+def load_state():
+    path = os.path.join(MODEL_DIR, STATE_FILE)
+    if os.path.exists(path):
+        return {**new_state(), **joblib.load(path)}
+    return new_state()
+
+def save_state(state):
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    joblib.dump(state, os.path.join(MODEL_DIR, STATE_FILE))
+
+def tweets_were_reset(conn, state):
+    """True if the watermark row is no longer the tweet it was (the table was cleared and re-filled)."""
+    if not state['watermark']:
+        return False
+    row = conn.execute("SELECT tweet_id, tweet_date FROM tweets WHERE id = ?", (state['watermark'],)).fetchone()
+    return row is None or tuple(row) != tuple(state['watermark_row'])
+
+def top_topic_words(model):
+    """{"Topic 1": "w1, w2, ...", ...} using the remembered tokens for each hashed column."""
+    topics = {}
+    vocab = model['vocab']
+    for topic_idx, weights in enumerate(model['lda'].components_):
+        # Columns never seen in a tweet only carry the prior, so they are skipped
+        top_words = [vocab[col] for col in weights.argsort()[::-1] if col in vocab][:NUM_TOP_WORDS]
+        topics[f"Topic {topic_idx+1}"] = ", ".join(top_words)
+    return topics
+
+
+# --- Incremental Update ---
+def update_brand_model(model, texts, tweet_ids, vectorizer):
+    """partial_fit the brand's model on NEW (cleaned) tweets only."""
+    counts = vectorizer.transform(texts)
+    model['lda'].partial_fit(counts)
+    analyzer = vectorizer.build_analyzer()
+    for text in texts:
+        for token in analyzer(text):
+            model['vocab'].setdefault(hash_column(token), token)
+    model['n_docs'] += len(texts)
+    model['last_tweet_id'] = max(model['last_tweet_id'], int(max(tweet_ids)))
+    return model
+
+
+def save_topic_summaries(conn, brand_name, model, topics):
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS brand_topic_summaries (
+        brand_name TEXT NOT NULL,
+        topic_key TEXT NOT NULL,
+        top_words TEXT,
+        n_docs INTEGER,
+        last_tweet_id INTEGER,
+        updated_at TEXT,
+        PRIMARY KEY (brand_name, topic_key)
+    )
+    ''')
+    updated_at = datetime.now().isoformat(timespec='seconds')
+    cursor.execute("DELETE FROM brand_topic_summaries WHERE brand_name = ?", (brand_name,))
+    cursor.executemany(
+        """INSERT INTO brand_topic_summaries
+           (brand_name, topic_key, top_words, n_docs, last_tweet_id, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [(brand_name, key, words, model['n_docs'], model['last_tweet_id'], updated_at) for key, words in topics.items()]
+    )
+    conn.commit()
+
+
+def update_all_brands(conn):
+    """Feeds every brand's unseen tweets into its online model. Returns {brand: new docs used}."""
+    state = load_state()
+    if tweets_were_reset(conn, state):
+        # Every model learned from the old rows, so all of them start over
+        print("   The tweets table was cleared and re-filled since the last refresh. Rebuilding all models.")
+        state = new_state(state['generation'] + 1)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'brand_topic_summaries'").fetchone():
+            conn.execute("DELETE FROM brand_topic_summaries")
+            conn.commit()
+
+    # One range scan on the tweets primary key picks up everything not read yet
+    watermark = state['watermark']
+    with span('topics.read_new_tweets', watermark=watermark) as s:
+        df_new = pd.read_sql_query(
+            """SELECT id, brand_name, tweet_id, tweet_date, tweet_content FROM tweets
+               WHERE id > ? AND brand_name IS NOT NULL ORDER BY id""",
+            conn, params=(watermark,)
+        )
+        s.add(items=len(df_new))
+    print(f"   {len(df_new)} tweets newer than watermark {watermark}.")
+    if df_new.empty:
+        save_state(state)
+        return {}
+
+    state['brand_names'] = sorted(set(state['brand_names']) | set(df_new['brand_name']))
+    vectorizer = make_vectorizer(build_stopwords(state['brand_names']))
+    updated = {}
+    for brand_name, group_df in df_new.groupby('brand_name'):
+        model = load_brand_model(brand_name, state['generation'])
+        pending = state['pending'].pop(brand_name, [])
+        if model['n_docs']:
+            # Saved by a run that stopped before its state was: the buffer and the tweets
+            # up to last_tweet_id are already in the model
+            pending = []
+            group_df = group_df[group_df['id'] > model['last_tweet_id']]
+            if group_df.empty:
+                continue
+        texts = group_df['tweet_content'].apply(clean_text)
+        texts = pending + texts[texts.str.len() > MIN_TWEET_LENGTH].tolist()
+        model['last_tweet_id'] = int(group_df['id'].max())
+        if model['n_docs'] == 0 and len(texts) < NUM_TOPICS * 2:
+            # Buffered until there are enough tweets for a sensible first fit
+            state['pending'][brand_name] = texts
+            print(f"   Holding {brand_name}: only {len(texts)} usable tweets for a first fit.")
+            continue
+        if not texts:
+            save_brand_model(brand_name, model)
+            continue
+
+        with span('topics.partial_fit', brand=brand_name, items=len(texts)):
+            update_brand_model(model, texts, group_df['id'], vectorizer)
+        with span('topics.save', brand=brand_name):
+            save_brand_model(brand_name, model)
+            save_topic_summaries(conn, brand_name, model, top_topic_words(model))
+        updated[brand_name] = len(texts)
+        print(f"   Updated {brand_name} with {updated[brand_name]} new tweets ({model['n_docs']} total).")
+
+    last = df_new.iloc[-1]
+    state['watermark'] = int(last['id'])
+    state['watermark_row'] = (last['tweet_id'], last['tweet_date'])
+    save_state(state)
+    return updated
+
+
+# --- MAIN EXECUTION ---
+def main():
+    if not os.path.exists(DB_PATH):
+        print(f"ERROR: Database file not found at {DB_PATH}")
+        return
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        print("\n--- Updating Online Topic Models ---")
+        updated = update_all_brands(conn)
+        print(f"\n--- Topic Refresh Complete! {len(updated)} brands updated. ---")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    with profiled('analytics.online_topics'):
+        main()
@@ -0,0 +1,32 @@
+import re
+
+import pandas as pd
+
+# --- Tweet Cleaning (same rules as the notebook's Cell 2) ---
+
+# The format from the scraped JSON looks like: 'Mon Oct 20 16:41:09 +0000 2025'
+TWEET_DATE_FORMAT = '%a %b %d %H:%M:%S +0000 %Y'
+
+def clean_text(text):
+    """Removes URLs and stray symbols (keeps basic punctuation and Arabic), lowercases."""
+    if isinstance(text, str):
+        text = re.sub(r'http\S+', '', text) # Remove URLs
+        # Keep basic punctuation, remove others. Keep Arabic.
+        text = re.sub(r'[^\w\s.,!?-_\u0600-\u06FF]+', '', text)
+        text = text.lower().strip()
+    # Return empty string if input wasn't a string (handles potential None/NaN)
+    return text if isinstance(text, str) else ''
+
+ENGAGEMENT_COLUMNS = ['reply_count', 'retweet_count', 'like_count', 'quote_count']
+
+def clean_tweets(df_tweets):
+    """Cell 2's tweet cleaning on any frame (or chunk) of raw tweet rows:
+    parses dates (dropping unparseable ones), coerces engagement counts, adds 'cleaned_content'."""
+    df_tweets = df_tweets.copy()
+    df_tweets['tweet_date'] = pd.to_datetime(df_tweets['tweet_date'], format=TWEET_DATE_FORMAT, errors='coerce')
+    df_tweets = df_tweets.dropna(subset=['tweet_date'])
+    for col in ENGAGEMENT_COLUMNS:
+        if col in df_tweets.columns:
+            df_tweets[col] = pd.to_numeric(df_tweets[col], errors='coerce').fillna(0).astype(int)
+    df_tweets['cleaned_content'] = df_tweets['tweet_content'].apply(clean_text)
+    return df_tweets
@@ -0,0 +1,21 @@
+# --- Tweet Sentiment (VADER compound score, same as the notebook's Phase 3a) ---
+
+_analyzer = None
+
+def get_analyzer():
+    """Creates the VADER analyzer once (loading its lexicon is the slow part)."""
+    global _analyzer
+    if _analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+def get_vader_sentiment(text):
+    # Compound score: normalized, weighted composite score, -1 (most neg) to +1 (most pos)
+    if isinstance(text, str) and text.strip(): # Check if text is a non-empty string
+        return get_analyzer().polarity_scores(text)['compound']
+    return 0.0 # Return neutral score for empty strings or non-string data
+
+def score_texts(texts):
+    """Sentiment score for every entry of a pandas Series of (cleaned) texts."""
+    return texts.apply(get_vader_sentiment)
@@ -0,0 +1,191 @@
+"""Out-of-core brand metrics for tweet tables larger than RAM.
+
+Run from the project root:
+    python -m analytics.streaming_metrics --chunksize 100000
+
+Tweets are read in chunks, cleaned and sentiment-scored one chunk at a time,
+and folded into per-brand running aggregates, so memory is bounded by the
+chunk size and the number of brands, never by the size of the tweets table.
+The product metrics come from the SQL aggregation layer (one row per brand).
+
+Each tweet's sentiment score is also stored in the tweet_sentiment table (one
+row per tweet), so the consultant tool can bootstrap confidence intervals for
+the sentiment mean without re-running VADER (see app/score_bootstrap.py).
+"""
+import argparse
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from analytics import brand_metrics
+from analytics.instrumentation import profiled, span, traced_chunks
+from analytics.preprocessing import clean_tweets, ENGAGEMENT_COLUMNS
+from analytics.sentiment import score_texts
+
+# --- Configuration ---
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
+OUTPUT_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'brand_metrics_final_v2.csv')
+CHUNK_SIZE = 100000
+SQL_IN_CHUNK = 500 # Brand names per IN (...) query
+
+TWEET_COLUMNS = ['tweet_id', 'brand_name', 'tweet_date', 'tweet_content'] + ENGAGEMENT_COLUMNS
+STATE_COLUMNS = ['tweet_volume', 'sentiment_sum', 'sentiment_m2'] + [f"total_{col}" for col in ENGAGEMENT_COLUMNS]
+
+
+# --- Running Aggregates ---
+def empty_state():
+    return pd.DataFrame(columns=STATE_COLUMNS, index=pd.Index([], name='brand_name'), dtype=float)
+
+
+def chunk_aggregates(df_chunk):
+    """Per-brand count / sentiment sum / sum of squared deviations / engagement totals for ONE chunk."""
+    grouped = df_chunk.groupby('brand_name')
+    stats = pd.DataFrame({
+        'tweet_volume': grouped.size(),
+        'sentiment_sum': grouped['sentiment_score'].sum(),
+        'sentiment_m2': grouped['sentiment_score'].var(ddof=0) * grouped.size(),
+    })
+    for col in ENGAGEMENT_COLUMNS:
+        stats[f"total_{col}"] = grouped[col].sum()
+    return stats.astype(float)
+
+
+def merge_aggregates(state, stats):
+    """Folds one chunk's stats into the running state (Chan et al. parallel variance update)."""
+    brands = state.index.union(stats.index)
+    a = state.reindex(brands, fill_value=0.0)
+    b = stats.reindex(brands, fill_value=0.0)
+    n_a, n_b = a['tweet_volume'], b['tweet_volume']
+    n = n_a + n_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = (b['sentiment_sum'] / n_b) - (a['sentiment_sum'] / n_a)
+        correction = (delta ** 2 * n_a * n_b / n).where((n_a > 0) & (n_b > 0), 0.0)
+    merged = a + b
+    merged['sentiment_m2'] = a['sentiment_m2'] + b['sentiment_m2'] + correction
+    return merged
+
+
+def finalize_aggregates(state):
+    """Turns the running state into per-brand tweet stats (mean/variance from the sums)."""
+    df = state.copy()
+    df['tweet_volume'] = df['tweet_volume'].astype(int)
+    df['sentiment_mean'] = df['sentiment_sum'] / df['tweet_volume']
+    df['sentiment_var'] = df['sentiment_m2'] / df['tweet_volume']
+    for col in ENGAGEMENT_COLUMNS:
+        df[f"total_{col}"] = df[f"total_{col}"].astype(int)
+    return df.drop(columns=['sentiment_sum', 'sentiment_m2']).reset_index()
+
+
+# --- Per-Tweet Sentiment ---
+def create_tweet_sentiment_table(conn):
+    """(Re)creates the empty tweet_sentiment table, replacing the scores of a previous run."""
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS tweet_sentiment")
+    cursor.execute('''
+    CREATE TABLE tweet_sentiment (
+        tweet_id TEXT PRIMARY KEY,
+        brand_name TEXT NOT NULL,
+        sentiment_score REAL
+    )
+    ''')
+    cursor.execute("CREATE INDEX idx_tweet_sentiment_brand ON tweet_sentiment (brand_name)")
+
+
+def save_tweet_sentiment(conn, df_chunk):
+    """Appends one scored chunk's (tweet_id, brand_name, sentiment_score) rows."""
+    conn.executemany(
+        "INSERT OR REPLACE INTO tweet_sentiment (tweet_id, brand_name, sentiment_score) VALUES (?, ?, ?)",
+        df_chunk[['tweet_id', 'brand_name', 'sentiment_score']].itertuples(index=False, name=None)
+    )
+
+
+def load_tweet_sentiment(conn, brand_names=None):
+    """Stored per-tweet sentiment scores (only the given brands' if `brand_names` is passed),
+    or None if the streaming stage has not stored them yet."""
+    query = "SELECT brand_name, sentiment_score FROM tweet_sentiment"
+    try:
+        if brand_names is None:
+            return pd.read_sql_query(query, conn)
+        brand_names = list(brand_names)
+        chunks = [brand_names[i:i + SQL_IN_CHUNK] for i in range(0, len(brand_names), SQL_IN_CHUNK)]
+        frames = [pd.read_sql_query(query + f" WHERE brand_name IN ({','.join('?' * len(chunk))})", conn, params=chunk)
+                  for chunk in chunks]
+        return pd.concat(frames, ignore_index=True) if frames else pd.read_sql_query(query + " WHERE 0", conn)
+    except Exception:
+        return None
+
+
+# --- Streaming Passes ---
+def iter_tweet_chunks(conn, chunksize=CHUNK_SIZE):
+    """Raw tweet rows, chunksize at a time (never the whole table)."""
+    query = f"SELECT {', '.join(TWEET_COLUMNS)} FROM tweets WHERE brand_name IS NOT NULL"
+    return pd.read_sql_query(query, conn, chunksize=chunksize)
+
+
+def stream_tweet_aggregates(conn, chunksize=CHUNK_SIZE, store_scores=False):
+    """Cleans + scores each chunk and folds it into the per-brand running aggregates
+    (and into the tweet_sentiment table if `store_scores`)."""
+    state = empty_state()
+    if store_scores:
+        create_tweet_sentiment_table(conn)
+    rows_seen = 0
+    for chunk_num, df_chunk in enumerate(traced_chunks('tweets.read_chunk', iter_tweet_chunks(conn, chunksize)), start=1):
+        rows_seen += len(df_chunk)
+        with span('tweets.clean', chunk=chunk_num) as s:
+            df_chunk = clean_tweets(df_chunk)
+            s.add(items=len(df_chunk))
+        if df_chunk.empty:
+            continue
+        with span('tweets.sentiment', chunk=chunk_num, items=len(df_chunk)):
+            df_chunk['sentiment_score'] = score_texts(df_chunk['cleaned_content'])
+        with span('tweets.aggregate', chunk=chunk_num):
+            state = merge_aggregates(state, chunk_aggregates(df_chunk))
+        if store_scores:
+            with span('sqlite.insert', table='tweet_sentiment', chunk=chunk_num, items=len(df_chunk)):
+                save_tweet_sentiment(conn, df_chunk)
+        print(f"   Chunk {chunk_num}: {rows_seen} tweets read, {len(state)} brands so far.")
+    if store_scores:
+        with span('sqlite.commit', table='tweet_sentiment'):
+            conn.commit()
+    return finalize_aggregates(state)
+
+
+def stream_brand_metrics(conn, chunksize=CHUNK_SIZE, store_scores=False):
+    """Same columns and values as the notebook's in-memory df_combined_metrics, with bounded memory.
+    Returns (df_metrics, df_tweet_stats)."""
+    df_tweet_stats = stream_tweet_aggregates(conn, chunksize, store_scores)
+    brand_metrics.ensure_indexes(conn)
+    df_metrics = brand_metrics.combine_metrics(df_tweet_stats[['brand_name', 'tweet_volume']],
+                                               brand_metrics.query_product_metrics(conn))
+    df_sentiment = df_tweet_stats[['brand_name']].copy()
+    df_sentiment['avg_tweet_sentiment'] = df_tweet_stats['sentiment_mean'].round(3) # Round for readability
+    return brand_metrics.attach_sentiment(df_metrics, df_sentiment), df_tweet_stats
+
+
+# --- MAIN EXECUTION ---
+def main():
+    parser = argparse.ArgumentParser(description="Compute brand metrics by streaming the tweets table in chunks.")
+    parser.add_argument('--db', default=DB_PATH, help="Path to licensing_data.db")
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help="Tweets per chunk")
+    parser.add_argument('--output', default=OUTPUT_CSV_PATH, help="Where to write the brand metrics CSV")
+    parser.add_argument('--no-tweet-scores', action='store_true',
+                        help="Do not store per-tweet sentiment scores (disables the sentiment confidence intervals)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"ERROR: Database file not found at {args.db}")
+        return
+    conn = sqlite3.connect(args.db)
+    try:
+        print(f"\n--- Streaming Brand Metrics (chunksize={args.chunksize}) ---")
+        df_metrics, _ = stream_brand_metrics(conn, args.chunksize, store_scores=not args.no_tweet_scores)
+    finally:
+        conn.close()
+    df_metrics.to_csv(args.output, index=False)
+    print(f"\n--- Saved metrics for {len(df_metrics)} brands to: {os.path.abspath(args.output)} ---")
+
+if __name__ == "__main__":
+    with profiled('analytics.streaming_metrics'):
+        main()
@@ -0,0 +1,167 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+
+from analytics.instrumentation import span
+
+# --- Configuration ---
+NUM_TOPICS = 5 # How many topics to find per brand
+NUM_TOP_WORDS = 7 # How many top words to keep for each topic
+MIN_TWEET_LENGTH = 15 # Shorter tweets are dropped before vectorizing
+MAX_FEATURES = 20000 # Shared vocabulary size (covers all brands at once)
+N_JOBS = -1 # Worker processes for the per-brand LDA fits (-1 = all cores)
+
+# Basic Arabic stopwords (consider using a more extensive list if results are poor)
+STOP_WORDS_AR = ["من", "في", "على", "الى", "عن", "و", "يا", "اي", "ما", "هو", "هي",
+                 "هذا", "هذه", "ذلك", "تلك", "ان", "او", "كل", "لا", "لن", "لم",
+                 "تم", "قد", "مع", "به", "له", "فيه", "عليها", "اليها", "عنه",
+                 "ايضا", "كان", "يكون", "صلى", "عليه", "وسلم", "قال", "ص", "ع",
+                 "ريال", "سعودي", "انا", "انت", "هم", "هن", "نحن", "اليوم", "جدا",
+                 "الله", "بن", "تم", "اللي", "الي", "حتى", "التي", "الذي", "بعد",
+                 "هنا", "هناك", "عند", "خلال", "فقط", "إذا", "كيف", "متى", "أين",
+                 "بين", "تحت", "فوق", "ثم", "حين", "الآن"]
+# Common social media/URL artifacts
+STOP_WORDS_SOCIAL = ['rt', 'amp', 'co', 'https', 'http', 'www', 'com']
+
+
+# --- Stopwords ---
+def build_stopwords(brand_names):
+    """English + Arabic stopwords plus the (lowercase) brand names themselves.
+    Raises LookupError if the NLTK stopwords have not been downloaded."""
+    from nltk.corpus import stopwords
+    stop_words = list(stopwords.words('english')) + STOP_WORDS_AR
+    stop_words.extend(str(name).lower() for name in brand_names)
+    stop_words.extend(STOP_WORDS_SOCIAL)
+    return stop_words
+
+
+# --- Shared Vectorization ---
+def vectorize_corpus(df_tweets, stop_words, text_column='cleaned_content'):
+    """Fits ONE TF-IDF vocabulary over every brand's tweets.
+
+    Rows are ordered by brand so each brand is a contiguous row slice of the
+    returned sparse matrix. Returns (tfidf, feature_names, brand_slices) where
+    brand_slices maps brand_name -> (start_row, end_row).
+    """
+    texts = df_tweets[text_column].fillna('').astype(str)
+    keep = texts.str.strip().str.len() > MIN_TWEET_LENGTH
+    corpus = pd.DataFrame({'brand_name': df_tweets.loc[keep, 'brand_name'], 'text': texts[keep]})
+    corpus = corpus.sort_values('brand_name', kind='stable')
+
+    brand_slices = {}
+    if corpus.empty:
+        return None, np.array([]), brand_slices
+
+    brands = corpus['brand_name'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, brands[1:] != brands[:-1]])
+    ends = np.r_[starts[1:], len(brands)]
+    for start, end in zip(starts, ends):
+        brand_slices[brands[start]] = (int(start), int(end))
+
+    vectorizer = TfidfVectorizer(max_df=0.90, min_df=3, stop_words=stop_words,
+                                 max_features=MAX_FEATURES, ngram_range=(1, 2))
+    tfidf = vectorizer.fit_transform(corpus['text'].tolist()).tocsr()
+    return tfidf, vectorizer.get_feature_names_out(), brand_slices
+
+
+# --- Per-Brand LDA (runs in worker processes) ---
+def _fit_brand_lda(brand_name, brand_matrix, num_topics, num_top_words):
+    """Fits one brand's LDA on its row slice. Returns (brand_name, top word indices or error)."""
+    try:
+        # Only the columns this brand actually uses matter for its topics
+        used_cols = np.unique(brand_matrix.indices)
+        if used_cols.size == 0:
+            return brand_name, {"Error": "No features found"}
+        lda = LatentDirichletAllocation(n_components=num_topics, max_iter=15,
+                                        learning_method='online',
+                                        learning_offset=50.,
+                                        random_state=42)
+        lda.fit(brand_matrix[:, used_cols])
+        top_words = [used_cols[weights.argsort()[:-num_top_words - 1:-1]] for weights in lda.components_]
+        return brand_name, top_words
+    except ValueError as ve:
+        return brand_name, {"Error": f"ValueError: {ve}"}
+    except Exception as e:
+        return brand_name, {"Error": f"Unexpected error: {e}"}
+
+
+def fit_brand_topics(tfidf, feature_names, brand_slices, num_topics=NUM_TOPICS,
+                     num_top_words=NUM_TOP_WORDS, n_jobs=N_JOBS):
+    """Fits the per-brand LDA models in parallel over row slices of the shared matrix.
+    Returns {brand_name: {"Topic 1": "w1, w2, ...", ...}} (same shape as the notebook's brand_topics)."""
+    brand_topics = {}
+    jobs = []
+    for brand_name, (start, end) in brand_slices.items():
+        if end - start < num_topics * 2: # Need sufficient documents relative to topics
+            brand_topics[brand_name] = {"Info": "Not enough data"}
+            continue
+        jobs.append(delayed(_fit_brand_lda)(brand_name, tfidf[start:end], num_topics, num_top_words))
+
+    print(f"   Fitting LDA for {len(jobs)} brands (n_jobs={n_jobs})...")
+    for brand_name, result in Parallel(n_jobs=n_jobs)(jobs):
+        if isinstance(result, dict):
+            brand_topics[brand_name] = result
+        else:
+            brand_topics[brand_name] = {f"Topic {i+1}": ", ".join(feature_names[idx]) for i, idx in enumerate(result)}
+    return dict(sorted(brand_topics.items()))
+
+
+# --- Persistence ---
+def save_brand_topics(conn, brand_topics):
+    """Replaces the stored topics for every brand in brand_topics."""
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS brand_topics (
+        brand_name TEXT NOT NULL,
+        topic_key TEXT NOT NULL,
+        top_words TEXT,
+        fitted_at TEXT,
+        PRIMARY KEY (brand_name, topic_key)
+    )
+    ''')
+    fitted_at = datetime.now().isoformat(timespec='seconds')
+    rows = [(brand_name, topic_key, top_words, fitted_at)
+            for brand_name, topics in brand_topics.items()
+            for topic_key, top_words in topics.items()]
+    cursor.executemany("DELETE FROM brand_topics WHERE brand_name = ?", [(b,) for b in brand_topics])
+    cursor.executemany("INSERT INTO brand_topics (brand_name, topic_key, top_words, fitted_at) VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    print(f"   Saved {len(rows)} topic rows for {len(brand_topics)} brands to 'brand_topics'.")
+
+
+def load_brand_topics(conn):
+    """Reads the persisted topics back as {brand_name: {topic_key: top_words}}."""
+    rows = conn.execute("SELECT brand_name, topic_key, top_words FROM brand_topics ORDER BY brand_name, topic_key").fetchall()
+    brand_topics = {}
+    for brand_name, topic_key, top_words in rows:
+        brand_topics.setdefault(brand_name, {})[topic_key] = top_words
+    return brand_topics
+
+
+# --- Full Topic Stage ---
+def run_topic_stage(df_tweets, conn=None, n_jobs=N_JOBS):
+    """Vectorizes the whole corpus once, fits every brand in parallel and persists the topics."""
+    all_brands = df_tweets['brand_name'].unique()
+    stop_words = build_stopwords(all_brands)
+    print(f"   Using {len(stop_words)} combined stopwords.")
+    with span('topics.vectorize', items=len(df_tweets)):
+        tfidf, feature_names, brand_slices = vectorize_corpus(df_tweets, stop_words)
+    if tfidf is None:
+        print("   No sufficiently long tweets found. Skipping topic modeling.")
+        return {brand_name: {"Info": "Not enough data"} for brand_name in sorted(all_brands)}
+    print(f"   Shared TF-IDF matrix: {tfidf.shape[0]} tweets x {tfidf.shape[1]} features, {len(brand_slices)} brands.")
+
+    with span('topics.fit_lda', items=len(brand_slices), n_jobs=n_jobs):
+        brand_topics = fit_brand_topics(tfidf, feature_names, brand_slices, n_jobs=n_jobs)
+    # Brands whose tweets were all too short never got a row slice
+    for brand_name in all_brands:
+        brand_topics.setdefault(brand_name, {"Info": "Not enough data"})
+    brand_topics = dict(sorted(brand_topics.items()))
+    if conn is not None:
+        with span('sqlite.save', table='brand_topics', items=len(brand_topics)):
+            save_brand_topics(conn, brand_topics)
+    return brand_topics
@@ -0,0 +1,294 @@
+"""Headless export of the consultant tool's brand reports (text, top products and radar chart).
+
+Run from the project root:
+    python app/batch_export.py                          # every brand, HTML + PNG
+    python app/batch_export.py --formats html pdf png --top 20
+    python app/batch_export.py --brands "Al-Hilal" "الهلال" --force
+    python app/batch_export.py --scoring-mode category   # normalise/rank within each brand's category
+
+Reports are rendered with the Agg backend in a process pool. reports/manifest.json
+records a content hash per brand (metrics, products, weights, formats), so brands
+whose report would come out the same as last time are skipped.
+"""
+import argparse
+import base64
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg') # Headless: no Tk, safe in worker processes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..')) # Project root, for the shared 'analytics' package
+import data_loader
+import report_builder
+import score_bootstrap
+from analytics.instrumentation import profiled, span
+from radar_chart import RadarChart, RADAR_COLUMNS
+from scoring_engine import SCORING_MODES, WEIGHTS
+from similar_brands import SimilarityIndex
+
+# --- Configuration ---
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'reports')
+MANIFEST_NAME = 'manifest.json'
+FORMATS = ('html', 'pdf', 'png')
+DEFAULT_FORMATS = ['html', 'png']
+PRODUCTS_IN_REPORT = 10
+SIMILAR_IN_REPORT = 5
+EXPORT_VERSION = 3 # Bump when the report layout changes so every report is re-rendered
+
+
+# --- Report Jobs ---
+def report_slug(brand_name):
+    """File-name-safe, collision-free stem for a brand's report files."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', brand_name).strip('_').lower() or 'brand'
+    digest = hashlib.md5(brand_name.encode('utf-8')).hexdigest()[:8] # Keeps e.g. 'Al-Hilal'/'Al Hilal' apart
+    return f"{slug}_{digest}"
+
+
+def to_plain(value):
+    """NumPy/pandas scalars -> JSON-friendly Python values (NaN -> None)."""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def build_jobs(app_data, brand_names, formats, db_path=data_loader.PRODUCTS_DB_PATH):
+    """One picklable job per brand, with the content hash that decides whether it needs re-rendering."""
+    df_metrics = app_data.df_metrics.set_index('brand_name', drop=False)
+    avg_metrics = {column: to_plain(value) for column, value in df_metrics[RADAR_COLUMNS].mean().items()}
+    similarity_index = SimilarityIndex.from_scoring(app_data.scoring, app_data.categories)
+    bootstrap = score_bootstrap.bootstrap_app_data(app_data, db_path, brand_names) # Seeded, so hashes are stable
+    jobs = []
+    for brand_name in brand_names:
+        brand_row = {column: to_plain(value) for column, value in df_metrics.loc[brand_name].items()}
+        df_products = app_data.product_index.top(brand_name, PRODUCTS_IN_REPORT)
+        products = [{column: to_plain(value) for column, value in product.items()}
+                    for product in df_products[['product_name', 'price', 'avg_rating', 'num_reviews', 'url']].to_dict('records')]
+        similar = [[other, round(similarity, 1)] for other, _, similarity in similarity_index.similar(brand_name, SIMILAR_IN_REPORT)]
+        intervals = {column: [round(value, 4) for value in interval]
+                     for column, interval in bootstrap.brand_intervals(brand_name, app_data.scoring.weights).items()}
+        content = json.dumps({'version': EXPORT_VERSION, 'weights': WEIGHTS, 'mode': app_data.scoring.mode,
+                              'formats': sorted(formats), 'brand': brand_row, 'products': products,
+                              'average': avg_metrics, 'similar': similar, 'intervals': intervals},
+                             sort_keys=True, ensure_ascii=False, default=str)
+        jobs.append({
+            'brand_name': brand_name,
+            'slug': report_slug(brand_name),
+            'brand_row': brand_row,
+            'products': products,
+            'avg_metrics': avg_metrics,
+            'similar': similar,
+            'intervals': intervals,
+            'formats': list(formats),
+            'hash': hashlib.sha256(content.encode('utf-8')).hexdigest(),
+        })
+    return jobs
+
+
+# --- Rendering (runs in the worker processes) ---
+_radar_chart = None # One persistent RadarChart per worker process
+
+def get_radar_chart():
+    global _radar_chart
+    if _radar_chart is None:
+        _radar_chart = RadarChart()
+        FigureCanvasAgg(_radar_chart.figure)
+    return _radar_chart
+
+
+def render_report_text(job):
+    import pandas as pd
+    df_products = pd.DataFrame(job['products'], columns=['product_name', 'price', 'avg_rating', 'num_reviews', 'url'])
+    df_products['price'] = pd.to_numeric(df_products['price'], errors='coerce')
+    report = report_builder.build_report_text(job['brand_row'], job['intervals'])
+    products_report = report_builder.format_products_text(df_products, page=0, page_size=PRODUCTS_IN_REPORT)
+    similar_report = "Similar Brands (nearest metric profiles):\n" + "-"*35 + "\n" + "".join(
+        f"- {other} ({similarity:.1f}% similar)\n" for other, similarity in job['similar'])
+    return report, products_report, similar_report
+
+
+def render_html(job, report, radar_png):
+    similar = "\n".join(f"<li>{html.escape(other)} ({similarity:.1f}% similar)</li>" for other, similarity in job['similar'])
+    rows = "\n".join(
+        f"<tr><td>{html.escape(str(p['product_name']))}</td><td>{p['avg_rating']:.1f}</td><td>{p['num_reviews']}</td>"
+        f"<td>{'%.2f SAR' % p['price'] if p['price'] is not None else 'N/A'}</td></tr>"
+        for p in job['products']
+    ) or '<tr><td colspan="4">(No products found for this brand)</td></tr>'
+    brand_name = html.escape(job['brand_name'])
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{brand_name} - Brand Report</title>
+<style>body {{ font-family: sans-serif; margin: 2em; }} pre {{ font-size: 13px; }}
+table {{ border-collapse: collapse; }} td, th {{ border: 1px solid #ccc; padding: 4px 8px; }}</style></head>
+<body>
+<h1>{brand_name}</h1>
+<pre>{html.escape(report)}</pre>
+<h2>Top {PRODUCTS_IN_REPORT} Amazon.sa Products (by Rating)</h2>
+<table><tr><th>Product</th><th>Rating</th><th>Reviews</th><th>Price</th></tr>
+{rows}
+</table>
+<h2>Similar Brands (nearest metric profiles)</h2>
+<ul>
+{similar}
+</ul>
+<h2>Radar Profile</h2>
+<img alt="Radar profile" src="data:image/png;base64,{base64.b64encode(radar_png).decode('ascii')}">
+</body></html>
+"""
+
+
+def render_brand(job, output_dir):
+    """Writes the requested formats for one brand. Returns (brand_name, hash, [file names])."""
+    import io
+    report, products_report, similar_report = render_report_text(job)
+    radar_chart = get_radar_chart()
+    radar_chart.show([job['brand_row']], job['avg_metrics'])
+
+    files = []
+    stem = os.path.join(output_dir, job['slug'])
+    radar_png = None
+    if 'png' in job['formats'] or 'html' in job['formats']:
+        buffer = io.BytesIO()
+        radar_chart.figure.savefig(buffer, format='png', dpi=100)
+        radar_png = buffer.getvalue()
+    if 'png' in job['formats']:
+        with open(stem + '.png', 'wb') as f:
+            f.write(radar_png)
+        files.append(job['slug'] + '.png')
+    if 'html' in job['formats']:
+        with open(stem + '.html', 'w', encoding='utf-8') as f:
+            f.write(render_html(job, report, radar_png))
+        files.append(job['slug'] + '.html')
+    if 'pdf' in job['formats']:
+        text_page = Figure(figsize=(8.27, 11.69)) # A4
+        text_page.text(0.06, 0.96, report.strip('\n') + "\n\n" + products_report + "\n" + similar_report, family='monospace', size=8, va='top')
+        with PdfPages(stem + '.pdf') as pdf:
+            pdf.savefig(text_page)
+            pdf.savefig(radar_chart.figure)
+        files.append(job['slug'] + '.pdf')
+    return job['brand_name'], job['hash'], files
+
+
+# --- Manifest ---
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"   Could not read {MANIFEST_NAME} ({e}); re-exporting everything.")
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(path + '.tmp', path) # An interrupted export never leaves a half-written manifest
+
+
+def is_up_to_date(job, manifest, output_dir):
+    entry = manifest.get(job['brand_name'])
+    return (entry is not None and entry.get('hash') == job['hash']
+            and all(os.path.exists(os.path.join(output_dir, name)) for name in entry.get('files', [])))
+
+
+def write_index(output_dir, app_data, brand_names, manifest):
+    """reports/index.html: exported brands by suitability score, linking to their reports."""
+    df_metrics = app_data.df_metrics[app_data.df_metrics['brand_name'].isin(brand_names)]
+    rows = []
+    for row in df_metrics.sort_values('suitability_score', ascending=False).itertuples(index=False):
+        files = manifest.get(row.brand_name, {}).get('files', [])
+        links = " ".join(f'<a href="{html.escape(name)}">{os.path.splitext(name)[1][1:]}</a>' for name in files)
+        rows.append(f"<tr><td>{html.escape(row.brand_name)}</td><td>{row.suitability_score:.1f}</td><td>{links}</td></tr>")
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Brand Reports</title></head><body>\n'
+                '<h1>Brand Reports</h1>\n<table><tr><th>Brand</th><th>Score</th><th>Files</th></tr>\n'
+                + "\n".join(rows) + '\n</table></body></html>\n')
+
+
+# --- MAIN EXECUTION ---
+def select_brands(app_data, requested, top):
+    """All brands, the requested names/aliases, or the `top` N by score."""
+    if requested:
+        brand_names = []
+        for query in requested:
+            brand_name = app_data.search_index.resolve(query)
+            if brand_name is None:
+                print(f"   Unknown brand '{query}', skipping.")
+            elif brand_name not in brand_names:
+                brand_names.append(brand_name)
+    else:
+        brand_names = list(app_data.brand_list)
+    if top:
+        scores = app_data.df_metrics.set_index('brand_name')['suitability_score']
+        brand_names = sorted(brand_names, key=lambda b: -scores[b])[:top]
+    return brand_names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export brand reports without the GUI.")
+    parser.add_argument('--brands', nargs='+', help="Brand names or aliases (default: all brands)")
+    parser.add_argument('--top', type=int, default=0, help="Only the N highest-scoring brands")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=DEFAULT_FORMATS)
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Re-render even unchanged reports")
+    parser.add_argument('--scoring-mode', choices=SCORING_MODES, default='universe',
+                        help="Normalise and rank against all brands, or within each brand's category")
+    parser.add_argument('--csv', default=data_loader.DATA_CSV_PATH)
+    parser.add_argument('--db', default=data_loader.PRODUCTS_DB_PATH)
+    args = parser.parse_args(argv)
+
+    print("Loading and processing data, please wait...")
+    try:
+        app_data = data_loader.load_app_data(args.csv, args.db, WEIGHTS, scoring_mode=args.scoring_mode)
+    except (FileNotFoundError, data_loader.DataLoadError) as e:
+        print(f"ERROR: {e}\nPlease run the notebook/scrapers first.")
+        return 1
+
+    brand_names = select_brands(app_data, args.brands, args.top)
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest = load_manifest(args.output_dir)
+    with span('export.build_jobs', items=len(brand_names)):
+        jobs = build_jobs(app_data, brand_names, args.formats, args.db)
+    todo = [job for job in jobs if args.force or not is_up_to_date(job, manifest, args.output_dir)]
+    print(f"--- {len(jobs)} brands selected, {len(jobs) - len(todo)} unchanged, {len(todo)} to export ---")
+
+    if todo:
+        exported_at = datetime.now().isoformat(timespec='seconds')
+        with span('export.render', items=len(todo), formats=args.formats) as s, \
+                ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(render_brand, job, args.output_dir): job['brand_name'] for job in todo}
+            for i, future in enumerate(as_completed(futures), start=1):
+                brand_name = futures[future]
+                try:
+                    _, content_hash, files = future.result()
+                except Exception as e:
+                    print(f"   [{i}/{len(todo)}] FAILED {brand_name}: {e}")
+                    continue
+                manifest[brand_name] = {'hash': content_hash, 'files': files, 'exported_at': exported_at}
+                s.add(bytes=sum(os.path.getsize(os.path.join(args.output_dir, name)) for name in files))
+                print(f"   [{i}/{len(todo)}] {brand_name}: {', '.join(files)}")
+        save_manifest(args.output_dir, manifest)
+
+    write_index(args.output_dir, app_data, brand_names, manifest)
+    print(f"--- Reports are in {os.path.abspath(args.output_dir)} ---")
+    return 0
+
+if __name__ == "__main__":
+    with profiled('app.batch_export'):
+        status = main()
+    sys.exit(status)
@@ -0,0 +1,120 @@
+"""Brand facts that only live in the scrapers' configuration (search-query aliases, categories).
+
+The scraper scripts cannot be imported (their file names start with digits and
+they import the Apify client at module level), so their brand dicts are read
+with `ast` instead of being executed. Categories are the section comments
+inside those literals (`# Food & Beverage`), which only `tokenize` sees.
+"""
+import ast
+import glob
+import io
+import os
+import re
+import tokenize
+
+# --- Configuration ---
+SCRAPER_DIR = os.path.join(os.path.dirname(__file__), '..', 'scraper')
+BRAND_DICT_NAME = re.compile(r'^BRANDS\w*$') # BRANDS_TO_TRACK, BRANDS_TO_SCRAPE_TWITTER, ...
+
+# Words the Twitter queries add to narrow results; they are not part of a brand's name
+QUERY_QUALIFIERS = {'saudi', 'ksa'}
+# Section comments that are not categories, and the decoration around the ones that are
+CATEGORY_NOISE = re.compile(r'^[-\s]*(?:\d+\s+)?|[-\s]*$') # '# --- 10 Niche/Cultural Brands ---' -> 'Niche/Cultural Brands'
+GENERIC_CATEGORIES = {'', 'general'} # What the e-commerce scrapers store when they create a brand
+# Section headers that group brands by their role in the scrape, not by market ('# Guests / Related',
+# '# Key KSA Brands (for baseline)'); the brands under them get no category from that script
+NON_CATEGORY_SECTIONS = re.compile(r'\b(?:guests?|related|baseline)\b', re.IGNORECASE)
+
+
+def iter_brand_dicts(scraper_dir=SCRAPER_DIR):
+    """Yields every literal `BRANDS... = {"Brand": "query", ...}` dict defined in the scraper scripts."""
+    for path in sorted(glob.glob(os.path.join(scraper_dir, '*.py'))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, ValueError) as e:
+            print(f"   Skipping {os.path.basename(path)} while reading brand queries: {e}")
+            continue
+        for node in tree.body:
+            if not isinstance(node, ast.Assign) or not isinstance(node.value, ast.Dict):
+                continue
+            if not any(isinstance(target, ast.Name) and BRAND_DICT_NAME.match(target.id) for target in node.targets):
+                continue
+            try:
+                brand_dict = ast.literal_eval(node.value)
+            except ValueError:
+                continue
+            yield {k: v for k, v in brand_dict.items() if isinstance(k, str) and isinstance(v, str)}
+
+
+def query_aliases(query):
+    """'Al Hilal saudi OR الهلال' -> ['Al Hilal', 'الهلال'] (each OR-term without the qualifier words)."""
+    aliases = []
+    for term in re.split(r'\s+OR\s+', query):
+        words = [word for word in term.split() if word.lower() not in QUERY_QUALIFIERS]
+        if words:
+            aliases.append(' '.join(words))
+    return aliases
+
+
+def load_brand_aliases(scraper_dir=SCRAPER_DIR):
+    """{brand_name: [alias, ...]} gathered from every scraper's query dict (English and Arabic terms)."""
+    aliases = {}
+    for brand_dict in iter_brand_dicts(scraper_dir):
+        for brand_name, query in brand_dict.items():
+            known = aliases.setdefault(brand_name, [])
+            for alias in query_aliases(query):
+                if alias != brand_name and alias not in known:
+                    known.append(alias)
+    return aliases
+
+
+def comment_lines(source):
+    """{line number: text} of the comments that sit on a line of their own."""
+    comments = {}
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type == tokenize.COMMENT and not token.line[:token.start[1]].strip():
+                comments[token.start[0]] = token.string.lstrip('#').strip()
+    except (tokenize.TokenError, IndentationError):
+        pass
+    return comments
+
+
+def section_category(comment):
+    """'--- 10 Niche/Cultural Brands ---' -> 'Niche/Cultural Brands' (None if nothing is left, or if the
+    header is not a category)."""
+    category = CATEGORY_NOISE.sub('', comment)
+    if category.lower() in GENERIC_CATEGORIES or NON_CATEGORY_SECTIONS.search(category):
+        return None
+    return category
+
+
+def load_brand_categories(scraper_dir=SCRAPER_DIR):
+    """{brand_name: category} from the section comments above the brands in the scrapers'
+    BRANDS... dicts and lists. Later scripts in name order win (the _V2/_resume scripts supersede the originals)."""
+    categories = {}
+    for path in sorted(glob.glob(os.path.join(scraper_dir, '*.py'))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                source = f.read()
+            tree = ast.parse(source, filename=path)
+        except (OSError, SyntaxError, ValueError):
+            continue # iter_brand_dicts() already reports unreadable scripts
+        comments = comment_lines(source)
+        for node in tree.body:
+            if not isinstance(node, ast.Assign) or not isinstance(node.value, (ast.Dict, ast.List)):
+                continue
+            if not any(isinstance(target, ast.Name) and BRAND_DICT_NAME.match(target.id) for target in node.targets):
+                continue
+            names = node.value.keys if isinstance(node.value, ast.Dict) else node.value.elts
+            section = None
+            section_lines = sorted(line for line in comments if node.lineno <= line <= node.end_lineno)
+            for name in names:
+                if not isinstance(name, ast.Constant) or not isinstance(name.value, str):
+                    continue
+                while section_lines and section_lines[0] < name.lineno:
+                    section = section_category(comments[section_lines.pop(0)])
+                if section is not None:
+                    categories[name.value] = section
+    return categories
@@ -0,0 +1,131 @@
+"""Prefix and typo-tolerant brand lookup over names and their English/Arabic aliases.
+
+Every name, alias and each word inside them is normalised into a search key
+(case, punctuation, Arabic letter variants and diacritics folded) and kept in
+one sorted list, so a prefix lookup is two bisects. Typo tolerance generates
+the query's single-edit variants (delete, transpose, replace, insert) and
+bisects each one: no extra index, and still only a few milliseconds for 100k names.
+"""
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+DEFAULT_LIMIT = 50
+MIN_FUZZY_LENGTH = 3 # Shorter queries match too much to be useful with a typo allowed
+
+# Arabic spelling variants folded to one form (hamza seats, alef maqsura, ta marbuta)
+ARABIC_FOLDS = str.maketrans({
+    '\u0623': '\u0627', '\u0625': '\u0627', '\u0622': '\u0627', '\u0671': '\u0627', # Alef with hamza/madda/wasla -> alef
+    '\u0649': '\u064A', '\u0626': '\u064A', # Alef maqsura, yeh with hamza -> yeh
+    '\u0624': '\u0648', # Waw with hamza -> waw
+    '\u0629': '\u0647', # Ta marbuta -> heh
+    '\u0640': None, # Tatweel (decorative stretching)
+})
+ARABIC_DIACRITICS = re.compile(r'[\u064B-\u065F\u0670]') # Harakat, tanween, shadda, sukun, superscript alef
+SEPARATORS = re.compile(r'[\s\-_.,()/&\'"]+')
+ARABIC_DEFINITE = '\u0627\u0644' # 'al-'
+
+
+def normalize_key(text):
+    """Case/diacritic/punctuation-insensitive form of a name or query."""
+    text = unicodedata.normalize('NFKC', str(text)).casefold()
+    text = ARABIC_DIACRITICS.sub('', text).translate(ARABIC_FOLDS)
+    text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return SEPARATORS.sub(' ', text).strip()
+
+
+def key_variants(text):
+    """The full key plus every word-start suffix ('al hilal' -> 'al hilal', 'hilal').
+    Arabic words are also indexed without the definite article ('الهلال' -> 'هلال')."""
+    key = normalize_key(text)
+    if not key:
+        return []
+    words = key.split(' ')
+    variants = [' '.join(words[i:]) for i in range(len(words))]
+    for i, word in enumerate(words):
+        if word.startswith(ARABIC_DEFINITE) and len(word) > len(ARABIC_DEFINITE) + 1:
+            variants.append(' '.join([word[len(ARABIC_DEFINITE):]] + words[i + 1:]))
+    return variants
+
+
+class BrandSearchIndex:
+    """Sorted (key, brand) index for prefix search, exact resolution and one-typo matching."""
+
+    def __init__(self, brand_names, aliases=None):
+        aliases = aliases or {}
+        self.brand_names = sorted(brand_names)
+        self._exact = {} # Normalised full name/alias -> brand
+        pairs = set()
+        for brand_name in self.brand_names:
+            for text in [brand_name] + list(aliases.get(brand_name, [])):
+                self._exact.setdefault(normalize_key(text), brand_name)
+                pairs.update((variant, brand_name) for variant in key_variants(text))
+        pairs = sorted(pairs)
+        self._keys = [key for key, _ in pairs]
+        self._brands = [brand_name for _, brand_name in pairs]
+        self._alphabet = sorted(set(''.join(self._keys)))
+
+    def __len__(self):
+        return len(self.brand_names)
+
+    def resolve(self, query):
+        """The brand a typed name/alias refers to exactly (case/diacritics/punctuation-insensitive), or None."""
+        return self._exact.get(normalize_key(query))
+
+    def _prefix_range(self, prefix):
+        start = bisect_left(self._keys, prefix)
+        # '\U0010ffff' sorts after every real character, so this is the end of the prefix block
+        return start, bisect_right(self._keys, prefix + '\U0010ffff', lo=start)
+
+    def prefix_matches(self, query, limit=DEFAULT_LIMIT):
+        """Brands with a name, alias or word in them starting with `query` (in key order)."""
+        key = normalize_key(query)
+        if not key:
+            return self.brand_names[:limit]
+        start, end = self._prefix_range(key)
+        return self._collect([range(start, end)], limit)
+
+    def _edits(self, key):
+        """Every string one edit (delete, adjacent transpose, replace, insert) away from `key`."""
+        splits = [(key[:i], key[i:]) for i in range(len(key) + 1)]
+        edits = {left + right[1:] for left, right in splits if right}
+        edits |= {left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1}
+        edits |= {left + c + right[1:] for left, right in splits if right for c in self._alphabet}
+        edits |= {left + c + right for left, right in splits for c in self._alphabet}
+        edits.discard(key)
+        return edits
+
+    def fuzzy_matches(self, query, limit=DEFAULT_LIMIT):
+        """Brands whose keys start with a one-typo variant of `query`."""
+        key = normalize_key(query)
+        if len(key) < MIN_FUZZY_LENGTH:
+            return []
+        ranges = []
+        for variant in self._edits(key):
+            if len(variant) < MIN_FUZZY_LENGTH:
+                continue
+            start, end = self._prefix_range(variant)
+            if start < end:
+                ranges.append(range(start, end))
+        ranges.sort(key=lambda r: self._keys[r.start])
+        return self._collect(ranges, limit)
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Prefix matches first, then (if there is room) one-typo matches."""
+        results = self.prefix_matches(query, limit)
+        if len(results) < limit:
+            seen = set(results)
+            results += [b for b in self.fuzzy_matches(query, limit) if b not in seen][:limit - len(results)]
+        return results
+
+    def _collect(self, ranges, limit):
+        seen = set()
+        results = []
+        for positions in ranges:
+            for pos in positions:
+                brand_name = self._brands[pos]
+                if brand_name not in seen:
+                    seen.add(brand_name); results.append(brand_name)
+                    if len(results) >= limit:
+                        return results
+        return results
@@ -1,113 +1,274 @@
-import pandas as pd
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from math import pi
-from scipy.stats import percentileofscore 
-import sqlite3
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..')) # Project root, for the shared 'analytics' package
+from analytics.instrumentation import profiled, span # Standard library only, cheap on the launch path
+from scoring_weights import WEIGHTS
+# numpy/pandas/scipy/matplotlib and the modules built on them are imported by import_data_modules()
+# on the loader thread, so the window appears before they load
+np = data_loader = score_snapshot = score_history = score_bootstrap = report_builder = scoring_engine = None
+LeaderboardModel = LeaderboardView = RadarChart = FigureCanvasTkAgg = None
+RADAR_COLUMNS = MAX_RADAR_BRANDS = PRODUCTS_PAGE_SIZE = None
 
 # --- Configuration ---
 DATA_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'brand_metrics_final_v2.csv')
 PRODUCTS_DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'reports')
 
-# --- Scoring Weights (Keep as before) ---
-WEIGHTS = {
-    'hype': 0.30, 'sentiment': 0.20, 'quality': 0.25,
-    'popularity': 0.15, 'saturation': 0.10
-}
-
 # --- Global variables ---
-plot_canvas_widget = None
+radar_chart = None # RadarChart built once with the GUI; reports only update its data
+radar_canvas = None
+compare_brands = [] # Brands overlaid on the current report's radar
+current_brand = None # Brand whose report is on screen (re-rendered when the weights change)
+current_weights = dict(WEIGHTS) # Slider positions (rescaled to sum to 1 when scoring)
+pending_rescore = None # Tk 'after' id, so a burst of slider events re-scores once per frame
+leaderboard_window = None # Toplevel holding the leaderboard (None while closed)
+leaderboard_view = None
 df_all_metrics = None 
+scoring = None # ScoringEngine for df_all_metrics (norm/rank matrices, re-scoring)
 df_all_products = None 
+product_index = None # ProductIndex over df_all_products (per-brand slices, best rated first)
+products_page = 0 # Page of the current brand's product list on screen
 brand_list = [] # Master list of all brand names
+search_index = None # BrandSearchIndex over names + scraper query aliases
+pending_search = None # Tk 'after' id of the debounced combobox search
+SEARCH_DEBOUNCE_MS = 120
+MAX_SUGGESTIONS = 50
+NAVIGATION_KEYS = {'Up', 'Down', 'Return', 'Escape', 'Tab', 'Left', 'Right'}
+
+# Worker threads never touch Tk widgets: they post callbacks to ui_queue, which the Tk thread drains via root.after
+ui_queue = queue.Queue()
+UI_POLL_MS = 50
+report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report')
+report_request_id = 0 # Latest report request; results from older requests are dropped
+pending_report = None # Future of the latest report request
+score_version = 0 # Bumped on every re-score so a report computed with old scores is redone
+
+# Hot reload: the data files are stat()ed periodically; a change reloads only the changed brands in the background
+app_data = None # AppData currently on screen (the baseline for incremental reloads)
+seen_fingerprint = None # data_loader.data_fingerprint() of the files app_data (or a running reload) reflects
+reload_running = False
+WATCH_INTERVAL_MS = 3000
+
+# Similar brands: a k-d tree over the norm matrix, built by the report worker the first time it is needed
+similarity_cache = (None, None) # (norm matrix it was built from, SimilarityIndex); re-weighting keeps the norms
+SIMILAR_SHOWN = 5
+shown_similar = [] # Brand names in the order they appear in the similar brands list
+
+current_bootstrap = None # score_bootstrap.BootstrapResult for the brand on screen (its score interval follows the weights)
+
+# --- Background Work ---
+def post_to_ui(callback, *args):
+    """Called from worker threads: queues `callback(*args)` to run on the Tk thread."""
+    ui_queue.put((callback, args))
 
-# --- Normalization and Scoring Functions (Keep as before) ---
-def normalize(series, higher_is_better=True, min_possible=None, max_possible=None):
-    min_val = series.min() if min_possible is None else min_possible
-    max_val = series.max() if max_possible is None else max_possible
-    if min_possible is not None or max_possible is not None:
-        series = series.clip(lower=min_possible, upper=max_possible)
-        min_val = series.min(); max_val = series.max()
-    if max_val == min_val: return pd.Series([50] * len(series), index=series.index)
-    if higher_is_better: norm = ((series - min_val) / (max_val - min_val)) * 100
-    else: norm = ((max_val - series) / (max_val - min_val)) * 100
-    return norm.fillna(50)
-
-def calculate_suitability_score(row):
-    score = (row['norm_tweet_volume'] * WEIGHTS['hype'] +
-             row['norm_avg_tweet_sentiment'] * WEIGHTS['sentiment'] +
-             row['norm_avg_perceived_quality'] * WEIGHTS['quality'] +
-             row['norm_popularity'] * WEIGHTS['popularity'] +
-             row['norm_market_saturation'] * WEIGHTS['saturation'])
-    return round(score, 1)
-
-def generate_recommendation(score):
-    if score >= 75: return "HIGH POTENTIAL"
-    elif score >= 50: return "MODERATE POTENTIAL"
-    elif score >= 25: return "LOW POTENTIAL"
-    else: return "VERY LOW POTENTIAL"
-
-# --- Data Loading Function (Keep as before) ---
-def load_all_data():
-    """Loads all metrics and product data into global variables at startup."""
-    global df_all_metrics, df_all_products, brand_list
+def poll_ui_queue():
+    """Runs queued callbacks on the Tk thread, then re-arms itself with root.after."""
+    while True:
+        try:
+            callback, args = ui_queue.get_nowait()
+        except queue.Empty:
+            break
+        callback(*args)
+    root.after(UI_POLL_MS, poll_ui_queue)
+
+def set_busy(message):
+    status_text.set(message)
+    progress_bar.start(10)
+
+def set_idle(message=""):
+    status_text.set(message)
+    progress_bar.stop()
+
+# --- Data Loading Function (runs on a worker thread) ---
+def start_loading():
+    print("Loading and processing data, please wait...")
+    set_busy("Loading and processing data, please wait...")
+    threading.Thread(target=load_worker, name='data-loader', daemon=True).start()
+
+def import_data_modules():
+    """Loader thread: the heavy imports, bound as module globals for the functions below."""
+    global np, data_loader, score_snapshot, score_history, score_bootstrap, report_builder, scoring_engine
+    global LeaderboardModel, LeaderboardView
+    global RadarChart, RADAR_COLUMNS, MAX_RADAR_BRANDS, PRODUCTS_PAGE_SIZE, FigureCanvasTkAgg
+    import numpy as np
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    import data_loader
+    import score_snapshot
+    import score_history
+    import score_bootstrap
+    import report_builder
+    import scoring_engine
+    from leaderboard import LeaderboardModel, LeaderboardView
+    from radar_chart import RadarChart, RADAR_COLUMNS, MAX_BRANDS as MAX_RADAR_BRANDS
+    from report_builder import PRODUCTS_PAGE_SIZE
+
+def load_worker():
     try:
-        df_all_metrics = pd.read_csv(DATA_CSV_PATH)
-        if df_all_metrics.empty:
-            messagebox.showerror("Error", f"Metrics file is empty: {DATA_CSV_PATH}")
-            return False
-
-        conn = sqlite3.connect(PRODUCTS_DB_PATH)
-        df_all_products = pd.read_sql_query("""
-            SELECT p.*, b.brand_name
-            FROM products p JOIN brands b ON p.brand_id = b.id
-            WHERE p.platform = 'Amazon.sa'
-        """, conn)
-        conn.close()
-        df_all_products['avg_rating'] = pd.to_numeric(df_all_products['avg_rating'], errors='coerce').fillna(0)
-        df_all_products['num_reviews'] = pd.to_numeric(df_all_products['num_reviews'], errors='coerce').fillna(0).astype(int)
-        df_all_products['price'] = pd.to_numeric(df_all_products['price'], errors='coerce')
-
-        # --- Pre-calculate all scores and ranks ---
-        df_all_metrics['norm_tweet_volume'] = normalize(df_all_metrics['tweet_volume'], higher_is_better=True)
-        df_all_metrics['norm_avg_tweet_sentiment'] = normalize(df_all_metrics['avg_tweet_sentiment'], higher_is_better=True, min_possible=-1.0, max_possible=1.0)
-        df_all_metrics['norm_avg_perceived_quality'] = normalize(df_all_metrics['avg_perceived_quality'], higher_is_better=True, min_possible=0.0, max_possible=5.0)
-        log_reviews = np.log1p(df_all_metrics['avg_num_reviews'])
-        df_all_metrics['norm_popularity'] = normalize(log_reviews, higher_is_better=True)
-        max_saturation_limit = 25
-        df_all_metrics['saturation_capped'] = df_all_metrics['market_saturation'].clip(upper=max_saturation_limit)
-        df_all_metrics['norm_market_saturation'] = normalize(df_all_metrics['saturation_capped'], higher_is_better=False)
-        
-        df_all_metrics['rank_hype'] = df_all_metrics['tweet_volume'].apply(lambda x: percentileofscore(df_all_metrics['tweet_volume'], x, kind='rank'))
-        df_all_metrics['rank_sentiment'] = df_all_metrics['avg_tweet_sentiment'].apply(lambda x: percentileofscore(df_all_metrics['avg_tweet_sentiment'], x, kind='rank'))
-        df_all_metrics['rank_quality'] = df_all_metrics['avg_perceived_quality'].apply(lambda x: percentileofscore(df_all_metrics['avg_perceived_quality'], x, kind='rank'))
-        df_all_metrics['rank_popularity'] = df_all_metrics['avg_num_reviews'].apply(lambda x: percentileofscore(df_all_metrics['avg_num_reviews'], x, kind='rank'))
-        df_all_metrics['rank_saturation'] = 100 - df_all_metrics['market_saturation'].apply(lambda x: percentileofscore(df_all_metrics['market_saturation'], x, kind='rank')) # Inverse
-        
-        df_all_metrics['suitability_score'] = df_all_metrics.apply(calculate_suitability_score, axis=1)
-        
-        brand_list = sorted(df_all_metrics['brand_name'].unique())
-        
-        print("Data loaded and pre-processed successfully.")
-        return True
-
-    except FileNotFoundError as e:
-        messagebox.showerror("Data Error", f"Required data file not found.\n{e}\nPlease run the notebook/scrapers first.")
-        return False
+        post_to_ui(set_busy, "Loading libraries...")
+        with span('app.import_modules'):
+            import_data_modules()
+        post_to_ui(build_radar_chart)
+        with span('app.load_data'):
+            loaded = score_snapshot.load_app_data(DATA_CSV_PATH, PRODUCTS_DB_PATH, WEIGHTS,
+                                                  progress=lambda message: post_to_ui(set_busy, message))
     except Exception as e:
-        messagebox.showerror("Fatal Error", f"Could not load or process data file.\nError: {e}")
-        return False
+        post_to_ui(on_load_failed, e)
+        return
+    post_to_ui(on_data_loaded, loaded)
+
+def build_radar_chart():
+    """Tk thread: the persistent radar figure and its canvas (matplotlib has been imported by now)."""
+    global radar_chart, radar_canvas
+    radar_placeholder.destroy()
+    radar_chart = RadarChart()
+    radar_canvas = FigureCanvasTkAgg(radar_chart.figure, master=chart_frame)
+    radar_canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+def publish_data(loaded):
+    """Tk thread: makes `loaded` the data every GUI function reads (one step, nothing sees a mix)."""
+    global app_data, df_all_metrics, df_all_products, product_index, brand_list, scoring, search_index
+    app_data = loaded
+    df_all_metrics = loaded.df_metrics
+    df_all_products = loaded.df_products
+    product_index = loaded.product_index
+    scoring = loaded.scoring
+    brand_list = loaded.brand_list
+    search_index = loaded.search_index
+
+def on_data_loaded(loaded):
+    """Tk thread: publishes the loaded data and enables the data-driven widgets."""
+    global seen_fingerprint
+    publish_data(loaded)
+    seen_fingerprint = loaded.fingerprint
+
+    brand_entry['values'] = brand_list
+    if brand_list: brand_entry.current(0)
+    if current_weights != WEIGHTS:
+        apply_weights() # The sliders were moved while loading
+    else:
+        refresh_top_brands()
+    for button in data_buttons:
+        button.state(['!disabled'])
+    set_idle(f"Loaded {len(brand_list)} brands.")
+    print("Data loaded and pre-processed successfully.")
+    root.after(WATCH_INTERVAL_MS, watch_data_files)
+
+def on_load_failed(error):
+    if isinstance(error, FileNotFoundError):
+        messagebox.showerror("Data Error", f"Required data file not found.\n{error}\nPlease run the notebook/scrapers first.")
+    elif data_loader is not None and isinstance(error, data_loader.DataLoadError):
+        messagebox.showerror("Error", str(error))
+    else:
+        messagebox.showerror("Fatal Error", f"Could not load or process data file.\nError: {error}")
+    print("Failed to load data. Exiting application.")
+    root.after_idle(root.destroy)
+
+# --- Hot Reload ---
+def watch_data_files():
+    """Tk thread, every WATCH_INTERVAL_MS: starts a background reload when the CSV or DB changed."""
+    global seen_fingerprint, reload_running
+    root.after(WATCH_INTERVAL_MS, watch_data_files)
+    if reload_running:
+        return
+    fingerprint = data_loader.data_fingerprint(DATA_CSV_PATH, PRODUCTS_DB_PATH)
+    if fingerprint == seen_fingerprint:
+        return
+    seen_fingerprint = fingerprint
+    reload_running = True
+    status_text.set("Data changed on disk, reloading in the background...")
+    threading.Thread(target=reload_worker, args=(app_data, scoring_engine.normalized_weights(current_weights)),
+                     name='data-reloader', daemon=True).start()
+
+def reload_worker(previous, weights):
+    try:
+        with span('app.reload_data') as s:
+            reloaded, changed = data_loader.reload_app_data(previous, DATA_CSV_PATH, PRODUCTS_DB_PATH, weights)
+            s.add(items=len(changed))
+        if reloaded is not None:
+            score_snapshot.save_reloaded(reloaded, DATA_CSV_PATH, PRODUCTS_DB_PATH) # Saved before the GUI can touch it
+    except Exception as e:
+        post_to_ui(on_reload_failed, e)
+        return
+    post_to_ui(on_data_reloaded, reloaded, changed)
+
+def on_data_reloaded(reloaded, changed):
+    """Tk thread: swaps in the reloaded data and refreshes whatever shows it."""
+    global reload_running, current_brand, score_version, current_bootstrap
+    reload_running = False
+    if reloaded is None:
+        status_text.set("Data files changed, but no brand's data did.")
+        return
+    if reloaded.scoring.mode != selected_scoring_mode():
+        reloaded = data_loader.rescore_app_data(reloaded, scoring.weights, selected_scoring_mode()) # Toggled mid-reload
+    publish_data(reloaded)
+    current_bootstrap = None # Resampled against the old data; the re-requested report brings a new one
+    score_version += 1 # Reports built from the old data are redone
+    brand_entry['values'] = brand_list
+    compare_brands[:] = [b for b in compare_brands if b in search_index.brand_names]
+    if leaderboard_view is not None:
+        leaderboard_view.set_model(LeaderboardModel.from_metrics(df_all_metrics))
+    if scoring_engine.normalized_weights(current_weights) != scoring.weights:
+        apply_weights() # The sliders moved while the reload was running
+    else:
+        refresh_top_brands()
+    if current_brand is not None:
+        if current_brand in search_index.brand_names:
+            request_report(current_brand)
+        else:
+            cancel_pending_report()
+            current_brand = None
+            report_text.set("The brand on screen is no longer in the data.")
+            top_products_text.set("")
+            update_radar()
+            show_similar([])
+            draw_sparkline(None)
+    status_text.set(f"Reloaded data: {len(changed)} brand(s) changed.")
+    print(f"Data reloaded: {len(changed)} brand(s) changed.")
+
+def on_reload_failed(error):
+    """Keeps the current data; the next change on disk triggers another attempt."""
+    global reload_running
+    reload_running = False
+    status_text.set(f"Reload failed, still showing the previous data ({error}).")
+    print(f"Reload failed: {error}")
 
 # --- GUI Functions ---
 
+def show_products_page():
+    if product_index is None:
+        top_products_text.set("Could not load product data.")
+        return
+    top_products_text.set(report_builder.build_products_text(product_index, current_brand, products_page))
+    update_products_nav()
+
+def update_products_nav():
+    num_pages = product_index.num_pages(current_brand, PRODUCTS_PAGE_SIZE)
+    products_page_label.config(text=f"Page {products_page + 1}/{num_pages} ({product_index.count(current_brand)} products)")
+    prev_products_button.state(['!disabled'] if products_page > 0 else ['disabled'])
+    next_products_button.state(['!disabled'] if products_page < num_pages - 1 else ['disabled'])
+
+def change_products_page(step):
+    global products_page
+    if current_brand is None or product_index is None:
+        return
+    products_page = max(0, min(products_page + step, product_index.num_pages(current_brand, PRODUCTS_PAGE_SIZE) - 1))
+    show_products_page()
+
+def resolve_brand_name(query):
+    """Brand named by `query`: a name or alias, ignoring case, punctuation and Arabic spelling variants."""
+    if search_index is None:
+        return None
+    return search_index.resolve(query)
+
 def generate_report():
-    """Fetches brand from GLOBAL df, updates GUI text and chart."""
-    global plot_canvas_widget, df_all_metrics, df_all_products
+    """Validates the brand on the Tk thread; the report itself is built on a worker thread."""
+    global current_brand
 
     brand_name_query = brand_entry.get()
     if not brand_name_query:
@@ -115,177 +276,457 @@ def generate_report():
         return
 
     # --- FIX: Find match (case-insensitive) ---
-    found = False
-    for b_name in brand_list:
-        if b_name.lower() == brand_name_query.lower():
-            brand_name_query = b_name 
-            found = True
-            break
-            
-    if not found:
-        messagebox.showerror("Not Found", f"Brand '{brand_name_query}' not found. Please select from the list or check spelling.")
+    found = resolve_brand_name(brand_name_query)
+    if found is None:
+        suggestions = search_index.search(brand_name_query, 3) if search_index is not None else []
+        hint = f"\nDid you mean: {', '.join(suggestions)}?" if suggestions else ""
+        messagebox.showerror("Not Found", f"Brand '{brand_name_query}' not found. Please select from the list or check spelling.{hint}")
         report_text.set("Report will appear here.\nTop products will appear here.")
-        if plot_canvas_widget:
-            plot_canvas_widget.get_tk_widget().destroy(); plot_canvas_widget = None
+        cancel_pending_report()
+        current_brand = None
+        update_radar()
+        show_similar([])
         return
-    
-    brand_data = df_all_metrics[df_all_metrics['brand_name'] == brand_name_query].iloc[0]
-    actual_brand_name = brand_data['brand_name']
-
-    # --- Generate Text Report (v3 - Enhanced) ---
-    recommendation = generate_recommendation(brand_data['suitability_score'])
-    report = f"""
--------------------------------------------
-BRAND REPORT: {actual_brand_name}
--------------------------------------------
-Overall Score & Recommendation:
-  - SUITABILITY SCORE: {brand_data['suitability_score']:.1f} / 100
-  - RECOMMENDATION:      {recommendation}
--------------------------------------------
-Metrics Breakdown (Value | Norm Score | Rank):
-  - Hype (Tweets):    {brand_data['tweet_volume']:>7,.0f} | {brand_data['norm_tweet_volume']:>3.0f}/100 | {brand_data['rank_hype']:>3.0f}th pctile
-  - Sentiment (Tweet): {brand_data['avg_tweet_sentiment']:>7.2f} | {brand_data['norm_avg_tweet_sentiment']:>3.0f}/100 | {brand_data['rank_sentiment']:>3.0f}th pctile
-  - Quality (Amz Rat): {brand_data['avg_perceived_quality']:>7.1f} | {brand_data['norm_avg_perceived_quality']:>3.0f}/100 | {brand_data['rank_quality']:>3.0f}th pctile
-  - Popularity (Amz Rev):{brand_data['avg_num_reviews']:>7.1f} | {brand_data['norm_popularity']:>3.0f}/100 | {brand_data['rank_popularity']:>3.0f}th pctile
-  - Saturation (Amz Prod):{brand_data['market_saturation']:>7.0f} | {brand_data['norm_market_saturation']:>3.0f}/100 | {brand_data['rank_saturation']:>3.0f}th pctile
--------------------------------------------
-    """
+
+    request_report(found) # current_brand changes once the report is on screen
+
+def cancel_pending_report():
+    """Drops the in-flight report: not started -> never runs; already running -> its result is ignored."""
+    global report_request_id
+    report_request_id += 1
+    if pending_report is not None:
+        pending_report.cancel()
+
+def request_report(brand_name):
+    global pending_report
+    cancel_pending_report()
+    set_busy(f"Generating report for {brand_name}...")
+    pending_report = report_executor.submit(compute_report, report_request_id, score_version,
+                                            brand_name, list(compare_brands), same_category_only.get())
+
+def compute_report(request_id, version, brand_name, overlay_brands, same_category):
+    """Worker thread: builds the report text, first products page and radar data for one brand."""
+    if request_id != report_request_id:
+        return # Superseded while queued
+    try:
+        data = app_data # One snapshot for the whole report (the Tk thread may publish new data meanwhile)
+        with span('app.compute_report', brand=brand_name):
+            df_metrics = data.df_metrics
+            brand_data = df_metrics[df_metrics['brand_name'] == brand_name].iloc[0]
+            with span('app.bootstrap', brand=brand_name):
+                bootstrap = score_bootstrap.bootstrap_app_data(data, PRODUCTS_DB_PATH, [brand_name])
+            intervals = bootstrap.brand_intervals(brand_name, data.scoring.weights)
+            report = report_builder.build_report_text(brand_data, intervals) # (v3 - Enhanced)
+            products_report = report_builder.build_products_text(data.product_index, brand_name)
+            radar_rows = radar_brand_rows(brand_name, overlay_brands, df_metrics)
+            avg_metrics = df_metrics[RADAR_COLUMNS].mean()
+            similar = find_similar(similarity_index_for(data), brand_name, same_category)
+            history = score_history.default_history().brand_series(brand_name)
+    except Exception as e:
+        post_to_ui(on_report_failed, request_id, brand_name, e)
+        return
+    post_to_ui(show_report, request_id, version, brand_name, report, products_report, radar_rows, avg_metrics, similar, history,
+               bootstrap)
+
+def on_report_failed(request_id, brand_name, error):
+    if request_id != report_request_id:
+        return
+    set_idle()
+    messagebox.showerror("Report Error", f"Could not build the report for '{brand_name}'.\nError: {error}")
+
+def show_report(request_id, version, brand_name, report, products_report, radar_rows, avg_metrics, similar, history,
+                bootstrap):
+    """Tk thread: puts a finished report on screen, unless a newer request or re-score made it stale."""
+    global current_brand, products_page, current_bootstrap
+    if request_id != report_request_id:
+        return
+    if version != score_version:
+        request_report(brand_name) # The weights changed while it was being built
+        return
+    current_brand = brand_name
+    current_bootstrap = bootstrap
+    products_page = 0
     report_text.set(report)
+    top_products_text.set(products_report)
+    update_products_nav()
+    # --- Update the Radar Chart (persistent figure: only the line/fill data changes) ---
+    radar_chart.show(radar_rows, avg_metrics)
+    radar_canvas.draw_idle()
+    show_similar(similar)
+    draw_sparkline(history)
+    set_idle()
 
-    # --- Generate Top Products List ---
-    if df_all_products is not None:
-        brand_products = df_all_products[df_all_products['brand_name'] == actual_brand_name].copy()
-        brand_products.sort_values(by=['avg_rating', 'num_reviews'], ascending=[False, False], inplace=True)
-        top_products = brand_products.head(5) 
-
-        products_report = "Top 5 Amazon.sa Products (by Rating):\n" + "-"*35 + "\n"
-        if not top_products.empty:
-            for _, product in top_products.iterrows():
-                price_str = f"{product['price']:.2f} SAR" if pd.notna(product['price']) else "N/A"
-                product_name_short = product['product_name'][:45] + '...' if len(product['product_name']) > 45 else product['product_name']
-                products_report += f"- {product_name_short}\n"
-                products_report += f"    Rating: {product['avg_rating']:.1f} ({product['num_reviews']} rev) | Price: {price_str}\n"
-        else:
-            products_report += "(No products found for this brand)\n"
-        top_products_text.set(products_report)
+def radar_brand_rows(brand_name=None, overlay_brands=None, df_metrics=None):
+    """The report's brand first, then the comparison brands."""
+    brand_name = current_brand if brand_name is None else brand_name
+    overlay_brands = compare_brands if overlay_brands is None else overlay_brands
+    df_metrics = df_all_metrics if df_metrics is None else df_metrics
+    names = [brand_name] + [b for b in overlay_brands if b != brand_name]
+    return [df_metrics[df_metrics['brand_name'] == name].iloc[0] for name in names[:MAX_RADAR_BRANDS]]
+
+def update_radar():
+    if current_brand is None:
+        radar_chart.clear()
     else:
-        top_products_text.set("Could not load product data.")
+        radar_chart.show(radar_brand_rows(), df_all_metrics[RADAR_COLUMNS].mean())
+    radar_canvas.draw_idle()
+
+def add_to_comparison():
+    """Overlays the brand in the entry box on the current report's radar."""
+    brand_name = resolve_brand_name(brand_entry.get())
+    if brand_name is None:
+        messagebox.showerror("Not Found", f"Brand '{brand_entry.get()}' not found. Please select from the list or check spelling.")
+        return
+    if current_brand is None:
+        generate_report()
+        return
+    if brand_name != current_brand and brand_name not in compare_brands:
+        if len(compare_brands) >= MAX_RADAR_BRANDS - 1:
+            messagebox.showwarning("Comparison Full", f"Up to {MAX_RADAR_BRANDS - 1} brands can be compared at once. Clear the comparison first.")
+            return
+        compare_brands.append(brand_name)
+    update_radar()
+
+def clear_comparison():
+    compare_brands.clear()
+    update_radar()
+
+# --- Score History Sparkline ---
+SPARKLINE_WIDTH = 300
+SPARKLINE_HEIGHT = 36
+
+def draw_sparkline(history):
+    """Draws the brand's recorded suitability scores (one point per build, oldest on the left)."""
+    sparkline_canvas.delete('all')
+    if history is None or len(history) == 0:
+        sparkline_label.config(text="Score history: no builds recorded yet")
+        return
+    values = history.to_numpy(dtype=float)
+    low, high = float(values.min()), float(values.max())
+    value_range = (high - low) or 1.0
+    pad = 3
+    step = (SPARKLINE_WIDTH - 2 * pad) / max(len(values) - 1, 1)
+    points = []
+    for i, value in enumerate(values):
+        points += [pad + i * step, SPARKLINE_HEIGHT - pad - (value - low) / value_range * (SPARKLINE_HEIGHT - 2 * pad)]
+    if len(values) > 1:
+        sparkline_canvas.create_line(*points, fill='blue', width=1.5)
+    sparkline_canvas.create_oval(points[-2] - 2, points[-1] - 2, points[-2] + 2, points[-1] + 2, fill='blue', outline='')
+    first, last = history.index[0], history.index[-1]
+    sparkline_label.config(text=f"Score history: {values[0]:.1f} -> {values[-1]:.1f} "
+                                f"(range {low:.1f}-{high:.1f}, {len(values)} builds, {first:%Y-%m-%d} to {last:%Y-%m-%d})")
+
+# --- Similar Brands ---
+def similarity_index_for(data):
+    """Report worker: the SimilarityIndex for `data`, built (and scipy.spatial imported) on first use."""
+    global similarity_cache
+    cached_norms, index = similarity_cache
+    if cached_norms is not data.scoring.norms:
+        from similar_brands import SimilarityIndex
+        index = SimilarityIndex.from_scoring(data.scoring, data.categories)
+        similarity_cache = (data.scoring.norms, index)
+    return index
+
+def find_similar(index, brand_name, same_category):
+    if same_category:
+        return index.same_category(brand_name, SIMILAR_SHOWN)
+    return index.similar(brand_name, SIMILAR_SHOWN)
+
+def show_similar(similar):
+    shown_similar[:] = [brand_name for brand_name, _, _ in similar]
+    similar_list.delete(0, tk.END)
+    for brand_name, _, similarity in similar:
+        similar_list.insert(tk.END, f"{brand_name[:30]:<30} {similarity:>5.1f}% similar")
+
+def refresh_similar():
+    """Checkbox callback: re-queries the (already built) index for the brand on screen."""
+    cached_norms, index = similarity_cache
+    if current_brand is None or cached_norms is not scoring.norms:
+        return
+    show_similar(find_similar(index, current_brand, same_category_only.get()))
+
+def on_similar_select(event):
+    selection = similar_list.curselection()
+    if not selection:
+        return
+    show_brand(shown_similar[selection[0]])
 
-    # --- Generate and Embed Radar Chart ---
-    if plot_canvas_widget:
-        plot_canvas_widget.get_tk_widget().destroy()
-
-    avg_metrics = { 
-        'norm_tweet_volume': df_all_metrics['norm_tweet_volume'].mean(),
-        'norm_avg_tweet_sentiment': df_all_metrics['norm_avg_tweet_sentiment'].mean(),
-        'norm_avg_perceived_quality': df_all_metrics['norm_avg_perceived_quality'].mean(),
-        'norm_popularity': df_all_metrics['norm_popularity'].mean(),
-        'norm_market_saturation': df_all_metrics['norm_market_saturation'].mean()
-    }
-    fig, ax = create_radar_figure(brand_data, avg_metrics, actual_brand_name)
-    plot_canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-    plot_canvas_widget = plot_canvas
-    plot_canvas_widget.draw()
-    plot_canvas_widget.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-def create_radar_figure(brand_data_row, avg_data, brand_name):
-    # (Keep this function exactly the same as before - v3)
-    metrics = ['Hype', 'Sentiment', 'Quality', 'Popularity', 'Low Saturation']
-    values_brand = [
-        brand_data_row['norm_tweet_volume'], brand_data_row['norm_avg_tweet_sentiment'],
-        brand_data_row['norm_avg_perceived_quality'], brand_data_row['norm_popularity'],
-        brand_data_row['norm_market_saturation']
-    ]
-    values_brand += values_brand[:1]
-    values_avg = [
-        avg_data['norm_tweet_volume'], avg_data['norm_avg_tweet_sentiment'],
-        avg_data['norm_avg_perceived_quality'], avg_data['norm_popularity'],
-        avg_data['norm_market_saturation']
-    ]
-    values_avg += values_avg[:1]
-    angles = [n / float(len(metrics)) * 2 * pi for n in range(len(metrics))]
-    angles += angles[:1]
-    fig, ax = plt.subplots(figsize=(5, 5), subplot_kw=dict(polar=True))
-    ax.set_xticks(angles[:-1]); ax.set_xticklabels(metrics, color='grey', size=8)
-    ax.set_yticks(np.arange(0, 101, 25)); ax.set_yticklabels(["0", "25", "50", "75", "100"], color="grey", size=7)
-    ax.set_ylim(0, 100)
-    ax.plot(angles, values_avg, linewidth=1, linestyle='solid', label='Average Brand', color='grey', alpha=0.6)
-    ax.fill(angles, values_avg, 'grey', alpha=0.2)
-    ax.plot(angles, values_brand, linewidth=2, linestyle='solid', label=brand_name, color='blue')
-    ax.fill(angles, values_brand, 'blue', alpha=0.4)
-    ax.set_title(f'{brand_name} vs. Average', size=10, y=1.1)
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.2), ncol=2, fontsize=8)
-    return fig, ax
+def overlay_similar():
+    """Puts the nearest brands on the radar next to the current one."""
+    if current_brand is None:
+        return
+    compare_brands[:] = shown_similar[:MAX_RADAR_BRANDS - 1]
+    update_radar()
 
 # --- NEW FUNCTION for Autocomplete ---
 def on_keyrelease(event):
-    """Called when a key is released in the Combobox."""
-    global brand_list
-    
-    value = event.widget.get().lower() # Get current typed value
-    
-    if not value:
+    """Called when a key is released in the Combobox: schedules a search once typing pauses."""
+    global pending_search
+    if event.keysym in NAVIGATION_KEYS:
+        return # Moving through the dropdown must not replace its values
+    if pending_search is not None:
+        root.after_cancel(pending_search)
+    pending_search = root.after(SEARCH_DEBOUNCE_MS, update_brand_suggestions)
+
+def update_brand_suggestions():
+    """Fills the dropdown with prefix matches on names/aliases (English or Arabic), then one-typo matches."""
+    global pending_search
+    pending_search = None
+    if search_index is None:
+        return
+    value = brand_entry.get()
+    if not value.strip():
         # If box is empty, show all brands
-        event.widget['values'] = brand_list
+        brand_entry['values'] = brand_list
     else:
-        # Filter the master brand_list
-        filtered_list = [b for b in brand_list if b.lower().startswith(value)]
-        event.widget['values'] = filtered_list
+        brand_entry['values'] = search_index.search(value, MAX_SUGGESTIONS)
+
+# --- Live Weight Tuning ---
+WEIGHT_LABELS = {
+    'hype': 'Hype', 'sentiment': 'Sentiment', 'quality': 'Quality', 'popularity': 'Popularity',
+    'saturation': 'Low Saturation', 'momentum': 'Momentum', 'trend': 'Trend'
+}
+TOP_BRANDS_SHOWN = 15
+shown_top_brands = [] # Brand names in the order they appear in the top brands list
+
+def on_weight_change(key, value):
+    """Slider callback: records the new weight and schedules one re-score for the next idle moment."""
+    global pending_rescore
+    current_weights[key] = float(value)
+    weight_value_labels[key].config(text=f"{float(value):.2f}")
+    if pending_rescore is None:
+        pending_rescore = root.after_idle(apply_weights)
+
+def apply_weights():
+    """Re-scores every brand from the precomputed norm matrix and refreshes what is on screen."""
+    global pending_rescore, score_version
+    pending_rescore = None
+    if scoring is None:
+        return # Still loading; on_data_loaded applies the slider positions
+    score_version += 1
+    # New frame and engine, swapped in whole: report and reload workers keep reading the data they started with
+    publish_data(data_loader.reweight_app_data(app_data, scoring_engine.normalized_weights(current_weights)))
+    refresh_top_brands()
+    if leaderboard_view is not None:
+        leaderboard_view.model.set_column('suitability_score', scoring.scores)
+        leaderboard_view.refresh()
+    if current_brand is not None:
+        brand_data = df_all_metrics[df_all_metrics['brand_name'] == current_brand].iloc[0]
+        intervals = current_bootstrap.brand_intervals(current_brand, scoring.weights) if current_bootstrap is not None else None
+        report_text.set(report_builder.build_report_text(brand_data, intervals))
+        radar_chart.set_scores(radar_brand_rows())
+        radar_canvas.draw_idle()
+
+def selected_scoring_mode():
+    return 'category' if score_within_category.get() else 'universe'
+
+def change_scoring_mode():
+    """Re-normalises and re-ranks every brand against all brands or within its category (vectorised, on the Tk thread)."""
+    global score_version, current_bootstrap
+    if app_data is None or selected_scoring_mode() == scoring.mode:
+        return
+    publish_data(data_loader.rescore_app_data(app_data, scoring_engine.normalized_weights(current_weights), selected_scoring_mode()))
+    current_bootstrap = None
+    score_version += 1 # Reports built with the other mode's norms are redone
+    refresh_top_brands()
+    if leaderboard_view is not None:
+        leaderboard_view.set_model(LeaderboardModel.from_metrics(df_all_metrics))
+    if current_brand is not None:
+        request_report(current_brand)
+    status_text.set("Scoring within each brand's category." if scoring.mode == 'category' else "Scoring against all brands.")
+
+def reset_weights():
+    for key, value in WEIGHTS.items():
+        weight_scales[key].set(value)
+        on_weight_change(key, value)
+
+def run_sensitivity_analysis():
+    """Samples weight vectors around the slider weights on a worker thread (see weight_sensitivity.py)."""
+    if scoring is None:
+        return
+    set_busy("Running weight sensitivity analysis...")
+    threading.Thread(target=sensitivity_worker, name='sensitivity', daemon=True,
+                     args=(scoring, scoring_engine.normalized_weights(current_weights), current_brand)).start()
+
+def sensitivity_worker(engine, weights, brand_name):
+    import weight_sensitivity
+    try:
+        track = [list(engine.brand_names).index(brand_name)] if brand_name is not None else []
+        result = weight_sensitivity.run_sensitivity(engine.norms, engine.brand_names, weights, track=track)
+        text = weight_sensitivity.format_sensitivity_report(result, TOP_BRANDS_SHOWN)
+        if track:
+            text = weight_sensitivity.format_brand_sensitivity(result, track[0]) + "\n\n" + text
+    except Exception as e:
+        post_to_ui(on_sensitivity_failed, e)
+        return
+    post_to_ui(show_sensitivity, text)
+
+def show_sensitivity(text):
+    set_idle()
+    window = tk.Toplevel(root)
+    window.title("Weight Sensitivity")
+    text_widget = tk.Text(window, width=96, height=26, font=("Courier", 9), wrap=tk.NONE)
+    text_widget.insert(tk.END, text)
+    text_widget.config(state='disabled')
+    text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+def on_sensitivity_failed(error):
+    set_idle()
+    messagebox.showerror("Sensitivity Error", f"Could not run the sensitivity analysis.\nError: {error}")
+
+def refresh_top_brands():
+    """Top brands by the current score (ties keep alphabetical order)."""
+    order = np.argsort(-scoring.scores, kind='stable')[:TOP_BRANDS_SHOWN]
+    shown_top_brands[:] = scoring.brand_names[order]
+    top_brands_list.delete(0, tk.END)
+    for position, idx in enumerate(order, start=1):
+        top_brands_list.insert(tk.END, f"{position:>2}. {scoring.brand_names[idx][:28]:<28} {scoring.scores[idx]:>5.1f}")
+
+def on_top_brand_select(event):
+    selection = top_brands_list.curselection()
+    if not selection:
+        return
+    show_brand(shown_top_brands[selection[0]])
+
+# --- Leaderboard Window ---
+def show_brand(brand_name):
+    brand_entry.set(brand_name)
+    generate_report()
+
+def open_leaderboard():
+    """Opens (or raises) the all-brands leaderboard window."""
+    global leaderboard_window, leaderboard_view
+    if leaderboard_window is not None:
+        leaderboard_window.lift()
+        return
+    leaderboard_window = tk.Toplevel(root)
+    leaderboard_window.title("Brand Leaderboard")
+    leaderboard_window.protocol("WM_DELETE_WINDOW", close_leaderboard)
+    leaderboard_view = LeaderboardView(leaderboard_window, LeaderboardModel.from_metrics(df_all_metrics),
+                                       on_select=show_brand, padding="10")
+    leaderboard_view.pack(fill=tk.BOTH, expand=True)
+
+def close_leaderboard():
+    global leaderboard_window, leaderboard_view
+    leaderboard_window.destroy()
+    leaderboard_window = None; leaderboard_view = None
 
 # --- Setup GUI ---
 root = tk.Tk()
 root.title("Brand Licensing Suitability Tool") 
-root.geometry("950x700") 
+root.geometry("950x820") 
 
 style = ttk.Style(); style.theme_use('clam')
 
-# --- Load data *before* creating input widgets ---
-print("Loading and processing data, please wait...")
-if not load_all_data():
-    print("Failed to load data. Exiting application.")
-    root.destroy() 
-else:
-    print("Data load complete. Launching GUI.")
-    
-    # --- Input Frame ---
-    input_frame = ttk.Frame(root, padding="10"); input_frame.pack(side=tk.TOP, fill=tk.X)
-    ttk.Label(input_frame, text="Select or Type Brand:").pack(side=tk.LEFT, padx=5) 
-    
-    # --- FIX: Combobox with event binding ---
-    brand_entry = ttk.Combobox(input_frame, width=40, values=brand_list) # State is 'normal' by default
-    brand_entry.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
-    
-    # Bind the <KeyRelease> event to our new function
-    brand_entry.bind('<KeyRelease>', on_keyrelease) 
-    
-    if brand_list: brand_entry.current(0) 
-    
-    generate_button = ttk.Button(input_frame, text="Generate Report", command=generate_report)
-    generate_button.pack(side=tk.LEFT, padx=5)
-
-    # --- Output Frame (Split Vertically) ---
-    output_frame = ttk.Frame(root, padding="10"); output_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-    # --- Left Column (Text Reports) ---
-    left_column = ttk.Frame(output_frame); left_column.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
-
-    report_frame = ttk.LabelFrame(left_column, text="Report Summary", padding="10")
-    report_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 10))
-    report_text = tk.StringVar()
-    report_text.set("Select a brand from the list above and click 'Generate Report'.")
-    report_label = ttk.Label(report_frame, textvariable=report_text, wraplength=450, justify=tk.LEFT, font=("Courier", 9)) 
-    report_label.pack(anchor="nw")
-
-    top_products_frame = ttk.LabelFrame(left_column, text="Top Amazon Products", padding="10")
-    top_products_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-    top_products_text = tk.StringVar()
-    top_products_text.set("Top products will appear here.")
-    top_products_label = ttk.Label(top_products_frame, textvariable=top_products_text, wraplength=450, justify=tk.LEFT, font=("Courier", 8)) 
-    top_products_label.pack(anchor="nw")
-
-    # --- Right Column (Chart) ---
-    chart_frame = ttk.LabelFrame(output_frame, text="Radar Profile", padding="10")
-    chart_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-    # --- Run GUI ---
-    root.mainloop()
\ No newline at end of file
+# --- Status Bar (the window appears at once; data loads on a worker thread, see start_loading) ---
+status_frame = ttk.Frame(root, padding=(10, 2)); status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+status_text = tk.StringVar()
+ttk.Label(status_frame, textvariable=status_text).pack(side=tk.LEFT)
+progress_bar = ttk.Progressbar(status_frame, mode='indeterminate', length=150)
+progress_bar.pack(side=tk.RIGHT)
+
+# --- Input Frame ---
+input_frame = ttk.Frame(root, padding="10"); input_frame.pack(side=tk.TOP, fill=tk.X)
+ttk.Label(input_frame, text="Select or Type Brand:").pack(side=tk.LEFT, padx=5) 
+
+# --- FIX: Combobox with event binding ---
+brand_entry = ttk.Combobox(input_frame, width=40, values=brand_list) # State is 'normal' by default; values arrive with the data
+brand_entry.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
+
+# Bind the <KeyRelease> event to our new function
+brand_entry.bind('<KeyRelease>', on_keyrelease) 
+
+generate_button = ttk.Button(input_frame, text="Generate Report", command=generate_report, state='disabled')
+generate_button.pack(side=tk.LEFT, padx=5)
+leaderboard_button = ttk.Button(input_frame, text="Leaderboard", command=open_leaderboard, state='disabled')
+leaderboard_button.pack(side=tk.LEFT, padx=5)
+
+# --- Weights Frame (sliders re-score all brands instantly) ---
+weights_frame = ttk.LabelFrame(root, text="Scoring Weights (rescaled to sum to 1)", padding="5")
+weights_frame.pack(side=tk.TOP, fill=tk.X, padx=10)
+weight_scales = {}
+weight_value_labels = {}
+for col, (key, label) in enumerate(WEIGHT_LABELS.items()):
+    ttk.Label(weights_frame, text=label).grid(row=0, column=col, padx=5)
+    weight_scales[key] = ttk.Scale(weights_frame, from_=0.0, to=1.0, value=current_weights[key], orient=tk.HORIZONTAL,
+                                   length=100, command=lambda value, key=key: on_weight_change(key, value))
+    weight_scales[key].grid(row=1, column=col, padx=5)
+    weight_value_labels[key] = ttk.Label(weights_frame, text=f"{current_weights[key]:.2f}")
+    weight_value_labels[key].grid(row=2, column=col)
+ttk.Button(weights_frame, text="Reset", command=reset_weights).grid(row=1, column=len(WEIGHT_LABELS), padx=5)
+sensitivity_button = ttk.Button(weights_frame, text="Sensitivity...", command=run_sensitivity_analysis, state='disabled')
+sensitivity_button.grid(row=1, column=len(WEIGHT_LABELS) + 1, padx=5)
+score_within_category = tk.BooleanVar(value=False)
+category_mode_check = ttk.Checkbutton(weights_frame, text="Score within category", variable=score_within_category,
+                                      command=change_scoring_mode, state='disabled')
+category_mode_check.grid(row=1, column=len(WEIGHT_LABELS) + 2, padx=5)
+
+# --- Output Frame (Split Vertically) ---
+output_frame = ttk.Frame(root, padding="10"); output_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+# --- Left Column (Text Reports) ---
+left_column = ttk.Frame(output_frame); left_column.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
+
+report_frame = ttk.LabelFrame(left_column, text="Report Summary", padding="10")
+report_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 10))
+report_text = tk.StringVar()
+report_text.set("Select a brand from the list above and click 'Generate Report'.")
+report_label = ttk.Label(report_frame, textvariable=report_text, wraplength=450, justify=tk.LEFT, font=("Courier", 9)) 
+report_label.pack(anchor="nw")
+sparkline_canvas = tk.Canvas(report_frame, width=SPARKLINE_WIDTH, height=SPARKLINE_HEIGHT, highlightthickness=0)
+sparkline_canvas.pack(anchor="nw", pady=(5, 0))
+sparkline_label = ttk.Label(report_frame, text="", font=("Courier", 8))
+sparkline_label.pack(anchor="nw")
+
+top_products_frame = ttk.LabelFrame(left_column, text="Top Amazon Products", padding="10")
+top_products_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+top_products_text = tk.StringVar()
+top_products_text.set("Top products will appear here.")
+top_products_label = ttk.Label(top_products_frame, textvariable=top_products_text, wraplength=450, justify=tk.LEFT, font=("Courier", 8)) 
+top_products_label.pack(anchor="nw")
+products_nav = ttk.Frame(top_products_frame); products_nav.pack(side=tk.BOTTOM, fill=tk.X)
+prev_products_button = ttk.Button(products_nav, text="< Prev", width=8, command=lambda: change_products_page(-1), state='disabled')
+prev_products_button.pack(side=tk.LEFT)
+products_page_label = ttk.Label(products_nav, text="")
+products_page_label.pack(side=tk.LEFT, expand=True)
+next_products_button = ttk.Button(products_nav, text="Next >", width=8, command=lambda: change_products_page(1), state='disabled')
+next_products_button.pack(side=tk.RIGHT)
+
+top_brands_frame = ttk.LabelFrame(left_column, text="Top Brands (current weights)", padding="10")
+top_brands_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=(10, 0))
+top_brands_list = tk.Listbox(top_brands_frame, height=8, font=("Courier", 8), activestyle='none')
+top_brands_list.pack(fill=tk.BOTH, expand=True)
+top_brands_list.bind('<<ListboxSelect>>', on_top_brand_select)
+
+similar_frame = ttk.LabelFrame(left_column, text="Similar Brands (nearest metric profiles)", padding="10")
+similar_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=(10, 0))
+same_category_only = tk.BooleanVar(value=False)
+ttk.Checkbutton(similar_frame, text="Same category only", variable=same_category_only,
+                command=refresh_similar).pack(side=tk.TOP, anchor="w")
+similar_list = tk.Listbox(similar_frame, height=SIMILAR_SHOWN, font=("Courier", 8), activestyle='none')
+similar_list.pack(fill=tk.BOTH, expand=True)
+similar_list.bind('<<ListboxSelect>>', on_similar_select)
+
+# --- Right Column (Chart) ---
+chart_frame = ttk.LabelFrame(output_frame, text="Radar Profile", padding="10")
+chart_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+compare_buttons = ttk.Frame(chart_frame); compare_buttons.pack(side=tk.BOTTOM, fill=tk.X)
+add_compare_button = ttk.Button(compare_buttons, text="Add to Comparison", command=add_to_comparison, state='disabled')
+add_compare_button.pack(side=tk.LEFT, padx=5)
+clear_compare_button = ttk.Button(compare_buttons, text="Clear Comparison", command=clear_comparison, state='disabled')
+clear_compare_button.pack(side=tk.LEFT, padx=5)
+similar_compare_button = ttk.Button(compare_buttons, text="Compare Similar", command=overlay_similar, state='disabled')
+similar_compare_button.pack(side=tk.LEFT, padx=5)
+radar_placeholder = ttk.Label(chart_frame, text="Loading chart...", anchor=tk.CENTER) # Replaced by build_radar_chart
+radar_placeholder.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+# Enabled by on_data_loaded
+data_buttons = [generate_button, leaderboard_button, add_compare_button, clear_compare_button, similar_compare_button,
+                sensitivity_button, category_mode_check]
+
+# --- Run GUI ---
+root.after(UI_POLL_MS, poll_ui_queue)
+start_loading()
+with profiled('app.consultant_tool'): # KSA_PROFILE / KSA_TRACE, see analytics/instrumentation.py
+    root.mainloop()
+report_executor.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""Loads and scores everything the consultant tool needs (no GUI code, safe to run off the Tk thread).
+
+The metrics and product frames are kept in the compact layout of
+analytics/frame_layout.py (categorical brand names, Arrow-backed product text,
+downcast numbers); the memory saved is printed at load time.
+
+reload_app_data() refreshes a previous load after the CSV or DB changed: the
+per-brand aggregates are re-queried (cheap, done in SQLite), and only the
+products of brands whose product signature changed are read again.
+"""
+import os
+import sqlite3
+
+import pandas as pd
+
+import brand_catalog
+import scoring_engine
+from analytics import brand_metrics, hype_velocity
+from analytics.frame_layout import compact_and_report
+from analytics.instrumentation import span
+from brand_search import BrandSearchIndex
+from product_index import ProductIndex
+from scoring_engine import WEIGHTS
+
+# --- Configuration ---
+DATA_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'brand_metrics_final_v2.csv')
+PRODUCTS_DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
+
+VELOCITY_COLUMNS = ['tweets_per_day_7d', 'wow_momentum', 'trend_slope']
+SQL_IN_CHUNK = 500 # Brand names per IN (...) query, well under SQLite's bound-variable limit
+PRODUCT_TEXT_COLUMNS = ['product_name', 'url'] # Free text: Arrow strings, never categorical
+
+
+class DataLoadError(Exception):
+    """The inputs exist but cannot be used (e.g. the metrics CSV is empty)."""
+
+
+class AppData:
+    """Scored brand metrics plus the product and brand-search indexes, as loaded at startup."""
+
+    def __init__(self, df_metrics, df_products, product_index, scoring, search_index,
+                 aliases=None, product_signatures=None, fingerprint=None, categories=None):
+        self.df_metrics = df_metrics
+        self.df_products = df_products
+        self.product_index = product_index
+        self.scoring = scoring
+        self.search_index = search_index
+        self.brand_list = search_index.brand_names
+        self.aliases = aliases or {} # Scraper query aliases, reused by reloads
+        self.product_signatures = product_signatures or {} # {brand: signature}, see product_signatures()
+        self.fingerprint = fingerprint # data_fingerprint() taken before this load read the files
+        self.categories = categories or {} # {brand: category} for brands that have one
+
+
+def data_fingerprint(csv_path=DATA_CSV_PATH, db_path=PRODUCTS_DB_PATH):
+    """(size, mtime) of the metrics CSV and the DB (plus its WAL); changes whenever either is rewritten."""
+    fingerprint = []
+    for path in [csv_path, db_path, db_path + '-wal']:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            fingerprint.append(None)
+    return tuple(fingerprint)
+
+
+def load_metrics(conn, df_sentiment):
+    """Base metrics aggregated in SQLite, plus sentiment and the time-windowed hype inputs."""
+    df_metrics = brand_metrics.attach_sentiment(brand_metrics.fetch_brand_metrics(conn), df_sentiment)
+    # All 0 if the velocity stage has not been run yet
+    df_velocity = hype_velocity.load_hype_velocity(conn)[['brand_name'] + VELOCITY_COLUMNS]
+    df_metrics = df_metrics.merge(df_velocity, on='brand_name', how='left')
+    for col in VELOCITY_COLUMNS:
+        df_metrics[col] = pd.to_numeric(df_metrics[col], errors='coerce').fillna(0.0)
+    return compact_and_report(df_metrics, "Brand metrics")
+
+
+def load_products(conn, brand_names=None):
+    """Amazon.sa products with their brand name and cleaned rating/review/price columns
+    (only the given brands' products if `brand_names` is passed)."""
+    query = """
+        SELECT p.*, b.brand_name
+        FROM products p JOIN brands b ON p.brand_id = b.id
+        WHERE p.platform = 'Amazon.sa'
+    """
+    if brand_names is None:
+        df_products = pd.read_sql_query(query, conn)
+    else:
+        brand_names = list(brand_names)
+        chunks = [brand_names[i:i + SQL_IN_CHUNK] for i in range(0, len(brand_names), SQL_IN_CHUNK)]
+        frames = [pd.read_sql_query(query + f" AND b.brand_name IN ({','.join('?' * len(chunk))})", conn, params=chunk)
+                  for chunk in chunks]
+        df_products = pd.concat(frames, ignore_index=True) if frames else pd.read_sql_query(query + " AND 0", conn)
+    df_products['avg_rating'] = pd.to_numeric(df_products['avg_rating'], errors='coerce').fillna(0)
+    df_products['num_reviews'] = pd.to_numeric(df_products['num_reviews'], errors='coerce').fillna(0).astype(int)
+    df_products['price'] = pd.to_numeric(df_products['price'], errors='coerce')
+    return df_products
+
+
+def load_categories(conn, fallback=None):
+    """{brand_name: category} from the brands table. Where it has none, or only the e-commerce scrapers'
+    'General' placeholder, the `fallback` dict's category is used (brands without either are left out)."""
+    categories = dict(fallback or {})
+    rows = conn.execute("SELECT brand_name, category FROM brands WHERE TRIM(COALESCE(category, '')) != ''").fetchall()
+    for brand_name, category in rows:
+        if category.strip().lower() not in brand_catalog.GENERIC_CATEGORIES:
+            categories[brand_name] = category.strip()
+    return categories
+
+
+def build_scoring(df_metrics, weights, categories, scoring_mode):
+    """ScoringEngine for `scoring_mode` (see scoring_engine.SCORING_MODES)."""
+    if scoring_mode not in scoring_engine.SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {scoring_mode}")
+    return scoring_engine.ScoringEngine(df_metrics, weights, categories if scoring_mode == 'category' else None)
+
+
+def product_signatures(conn):
+    """{brand_name: (count, max id, rating/review/price/name totals)} over Amazon.sa products.
+    Cheap to query; inserts, deletes and edits of a brand's products change its totals."""
+    rows = conn.execute("""
+        SELECT b.brand_name, COUNT(*), MAX(p.id), TOTAL(p.avg_rating), TOTAL(p.num_reviews),
+               TOTAL(p.price), TOTAL(LENGTH(p.product_name)), TOTAL(LENGTH(p.url))
+        FROM products p JOIN brands b ON p.brand_id = b.id
+        WHERE p.platform = 'Amazon.sa'
+        GROUP BY b.brand_name
+    """).fetchall()
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def changed_brands(df_old, df_new, columns):
+    """Brands added, removed, or with any differing value in `columns` (NaN equals NaN).
+    Every brand counts as changed if a column is missing from the old frame."""
+    if any(column not in df_old.columns for column in columns):
+        return set(df_old['brand_name']) | set(df_new['brand_name'])
+    old = df_old.set_index('brand_name')[columns]
+    new = df_new.set_index('brand_name')[columns]
+    common = old.index.intersection(new.index)
+    old, new = old.loc[common], new.loc[common]
+    differs = ((old != new) & ~(old.isna() & new.isna())).any(axis=1)
+    return set(common[differs.to_numpy()]) | set(df_old['brand_name']).symmetric_difference(df_new['brand_name'])
+
+
+def load_app_data(csv_path=DATA_CSV_PATH, db_path=PRODUCTS_DB_PATH, weights=WEIGHTS, progress=None,
+                  scoring_mode='universe'):
+    """Reads the CSV and the DB, builds the product index and scores every brand.
+    `progress(message)` is called before each step. Raises FileNotFoundError / DataLoadError."""
+    progress = progress or (lambda message: None)
+    fingerprint = data_fingerprint(csv_path, db_path) # Taken first, so a write during the load is seen by the next check
+
+    # Sentiment comes from the notebook's CSV (needs NLP on tweet text)...
+    progress("Reading sentiment metrics...")
+    with span('load.read_csv') as s:
+        df_sentiment = pd.read_csv(csv_path)
+        s.add(items=len(df_sentiment), bytes=os.path.getsize(csv_path))
+    if df_sentiment.empty:
+        raise DataLoadError(f"Metrics file is empty: {csv_path}")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        # ...the base metrics are aggregated inside SQLite (one row per brand)
+        progress("Aggregating brand metrics...")
+        with span('load.metrics') as s:
+            df_metrics = load_metrics(conn, df_sentiment)
+            s.add(items=len(df_metrics))
+        progress("Loading products...")
+        with span('load.products') as s:
+            df_products = load_products(conn)
+            s.add(items=len(df_products))
+        with span('load.signatures_categories'):
+            signatures = product_signatures(conn)
+            categories = load_categories(conn, brand_catalog.load_brand_categories())
+    finally:
+        conn.close()
+
+    progress("Indexing products...")
+    with span('load.index_products', items=len(df_products)):
+        df_products = compact_and_report(df_products, "Products", PRODUCT_TEXT_COLUMNS)
+        product_index = ProductIndex(df_products) # Sorted and sliced per brand once, not per report
+
+    progress("Scoring brands...")
+    with span('load.score', items=len(df_metrics), mode=scoring_mode):
+        scoring = build_scoring(df_metrics, weights, categories, scoring_mode)
+        df_metrics = scoring.attach(df_metrics)
+
+    progress("Indexing brand names...")
+    # Names plus the English/Arabic search terms from the scrapers' query dicts
+    aliases = brand_catalog.load_brand_aliases()
+    search_index = BrandSearchIndex(df_metrics['brand_name'].unique(), aliases)
+    return AppData(df_metrics, df_products, product_index, scoring, search_index, aliases, signatures, fingerprint, categories)
+
+
+def reload_app_data(previous, csv_path=DATA_CSV_PATH, db_path=PRODUCTS_DB_PATH, weights=WEIGHTS, progress=None):
+    """Refreshes `previous` (an AppData) from the current files, keeping its scoring mode. Returns
+    (AppData, changed brand names), or (None, empty set) if no brand's metrics or products changed.
+    `previous` is left untouched."""
+    progress = progress or (lambda message: None)
+    fingerprint = data_fingerprint(csv_path, db_path)
+
+    progress("Reading sentiment metrics...")
+    with span('load.read_csv') as s:
+        df_sentiment = pd.read_csv(csv_path)
+        s.add(items=len(df_sentiment), bytes=os.path.getsize(csv_path))
+    if df_sentiment.empty:
+        raise DataLoadError(f"Metrics file is empty: {csv_path}")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        progress("Aggregating brand metrics...")
+        df_metrics = load_metrics(conn, df_sentiment)
+        progress("Checking products...")
+        signatures = product_signatures(conn)
+        old_signatures = previous.product_signatures
+        product_changes = {brand for brand in set(signatures) | set(old_signatures)
+                           if signatures.get(brand) != old_signatures.get(brand)}
+        if product_changes:
+            progress(f"Loading products for {len(product_changes)} brands...")
+            df_changed = load_products(conn, sorted(product_changes))
+        categories = load_categories(conn, brand_catalog.load_brand_categories())
+    finally:
+        conn.close()
+
+    changed = changed_brands(previous.df_metrics, df_metrics, list(df_metrics.columns.drop('brand_name'))) | product_changes
+    changed |= {brand for brand in set(categories) | set(previous.categories)
+                if categories.get(brand) != previous.categories.get(brand)}
+    if not changed:
+        return None, set()
+
+    if product_changes:
+        progress("Indexing products...")
+        df_kept = previous.df_products[~previous.df_products['brand_name'].isin(product_changes)]
+        # Recompacted: concatenating categoricals with different categories falls back to strings
+        df_products = compact_and_report(pd.concat([df_kept, df_changed], ignore_index=True), "Products",
+                                         PRODUCT_TEXT_COLUMNS)
+        product_index = ProductIndex(df_products)
+    else:
+        df_products, product_index = previous.df_products, previous.product_index
+
+    # Normalisation and ranks are relative to every brand, so the whole (vectorised) matrix is rebuilt
+    progress("Scoring brands...")
+    scoring = build_scoring(df_metrics, weights, categories, previous.scoring.mode)
+    df_metrics = scoring.attach(df_metrics)
+
+    if set(df_metrics['brand_name']) == set(previous.brand_list):
+        search_index = previous.search_index
+    else:
+        progress("Indexing brand names...")
+        search_index = BrandSearchIndex(df_metrics['brand_name'].unique(), previous.aliases)
+    app_data = AppData(df_metrics, df_products, product_index, scoring, search_index,
+                       previous.aliases, signatures, fingerprint, categories)
+    return app_data, changed
+
+
+def reweight_app_data(app_data, weights):
+    """Copy of app_data with its scores recomputed for new weights (everything else is shared)."""
+    scoring = app_data.scoring.reweighted(weights)
+    return AppData(app_data.df_metrics.assign(suitability_score=scoring.scores), app_data.df_products,
+                   app_data.product_index, scoring, app_data.search_index, app_data.aliases,
+                   app_data.product_signatures, app_data.fingerprint, app_data.categories)
+
+
+def rescore_app_data(app_data, weights, scoring_mode):
+    """Copy of app_data scored in another mode (products, indexes and categories are shared)."""
+    scoring = build_scoring(app_data.df_metrics, weights, app_data.categories, scoring_mode)
+    return AppData(scoring.attach(app_data.df_metrics), app_data.df_products, app_data.product_index, scoring,
+                   app_data.search_index, app_data.aliases, app_data.product_signatures, app_data.fingerprint,
+                   app_data.categories)
@@ -0,0 +1,212 @@
+"""Sortable, filterable leaderboard of every brand for the consultant tool.
+
+LeaderboardModel keeps each column as a NumPy array and only orders as many
+rows as are needed for the visible window (argpartition + a small sort).
+LeaderboardView is a ttk.Treeview with a fixed pool of row items whose values
+are swapped as the user scrolls, so the widget never holds more rows than fit
+on screen, however many brands there are.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+# (column key in df_all_metrics, heading, width, format)
+LEADERBOARD_COLUMNS = [
+    ('suitability_score', 'Score', 60, '{:.1f}'),
+    ('tweet_volume', 'Hype', 70, '{:,.0f}'),
+    ('avg_tweet_sentiment', 'Sentiment', 75, '{:.2f}'),
+    ('avg_perceived_quality', 'Quality', 60, '{:.1f}'),
+    ('avg_num_reviews', 'Reviews', 70, '{:,.1f}'),
+    ('market_saturation', 'Products', 70, '{:.0f}'),
+    ('wow_momentum', 'Momentum', 75, '{:+.0%}'),
+    ('trend_slope', 'Trend', 60, '{:+.2f}'),
+]
+VISIBLE_ROWS = 20
+
+
+class LeaderboardModel:
+    """Brand names plus numeric columns; serves sorted, filtered windows of rows."""
+
+    def __init__(self, brand_names, columns):
+        self.brand_names = np.asarray(brand_names, dtype=object)
+        self.columns = {key: np.asarray(values, dtype=float) for key, values in columns.items()}
+        self._names_lower = pd.Series(self.brand_names).str.lower()
+        # Alphabetical position of each brand, used to break ties in a stable, readable way
+        self._name_order = np.argsort(np.argsort(self.brand_names.astype(str), kind='stable'), kind='stable')
+        self.sort_key = 'suitability_score'
+        self.descending = True
+        self.filter_text = ''
+        self._candidates = np.arange(len(self.brand_names))
+        self._sorted_prefix = np.empty(0, dtype=int) # Cached head of the current ordering
+
+    @classmethod
+    def from_metrics(cls, df_metrics):
+        return cls(df_metrics['brand_name'], {key: df_metrics[key] for key, _, _, _ in LEADERBOARD_COLUMNS})
+
+    def __len__(self):
+        return len(self._candidates)
+
+    def set_column(self, key, values):
+        """Replaces one column (e.g. new scores after a weight change)."""
+        self.columns[key] = np.asarray(values, dtype=float)
+        if key == self.sort_key:
+            self._sorted_prefix = self._sorted_prefix[:0]
+
+    def set_sort(self, key, descending=None):
+        """Sorts by `key`; clicking the current key again flips the direction."""
+        if descending is None:
+            descending = not self.descending if key == self.sort_key else True
+        self.sort_key, self.descending = key, descending
+        self._sorted_prefix = self._sorted_prefix[:0]
+
+    def set_filter(self, text):
+        """Keeps brands whose name contains `text` (case-insensitive)."""
+        self.filter_text = text.strip().lower()
+        if self.filter_text:
+            mask = self._names_lower.str.contains(self.filter_text, regex=False).to_numpy()
+            self._candidates = np.flatnonzero(mask)
+        else:
+            self._candidates = np.arange(len(self.brand_names))
+        self._sorted_prefix = self._sorted_prefix[:0]
+
+    def _sort_keys(self):
+        values = self.columns[self.sort_key][self._candidates]
+        values = np.where(np.isnan(values), -np.inf, values) # Missing values sink to the bottom
+        return -values if self.descending else np.where(np.isinf(values), np.inf, values)
+
+    def _ordered_prefix(self, k):
+        """Row indices of the first k rows in sort order (top-N selection, not a full sort)."""
+        k = min(k, len(self._candidates))
+        if len(self._sorted_prefix) >= k:
+            return self._sorted_prefix[:k]
+        keys = self._sort_keys()
+        if k < len(keys):
+            # Grow the cached prefix geometrically so scrolling down does not re-partition every row
+            k = min(max(k, 2 * len(self._sorted_prefix)), len(keys))
+        if k < len(keys):
+            # Everything tied with the k-th key is kept too, so ties are ordered by name consistently
+            kth_key = keys[np.argpartition(keys, k - 1)[k - 1]]
+            selected = np.flatnonzero(keys <= kth_key)
+        else:
+            selected = np.arange(len(keys))
+        order = np.lexsort((self._name_order[self._candidates[selected]], keys[selected]))
+        self._sorted_prefix = self._candidates[selected[order]]
+        return self._sorted_prefix
+
+    def rows(self, offset, count):
+        """[(position, brand_name, {column: value}), ...] for rows offset .. offset+count-1."""
+        indices = self._ordered_prefix(offset + count)[offset:offset + count]
+        return [(offset + i + 1, self.brand_names[idx], {key: values[idx] for key, values in self.columns.items()})
+                for i, idx in enumerate(indices)]
+
+
+class LeaderboardView(ttk.Frame):
+    """Virtualised Treeview over a LeaderboardModel. `on_select(brand_name)` is called on row selection."""
+
+    def __init__(self, master, model, on_select=None, visible_rows=VISIBLE_ROWS, **kwargs):
+        super().__init__(master, **kwargs)
+        self.model = model
+        self.on_select = on_select
+        self.visible_rows = visible_rows
+        self.offset = 0
+
+        filter_frame = ttk.Frame(self); filter_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add('write', lambda *args: self._on_filter())
+        ttk.Entry(filter_frame, textvariable=self.filter_var, width=30).pack(side=tk.LEFT, padx=5)
+        self.count_label = ttk.Label(filter_frame, text="")
+        self.count_label.pack(side=tk.RIGHT)
+
+        body = ttk.Frame(self); body.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        column_ids = ['position', 'brand_name'] + [key for key, _, _, _ in LEADERBOARD_COLUMNS]
+        self.tree = ttk.Treeview(body, columns=column_ids, show='headings', height=visible_rows, selectmode='browse')
+        self.tree.heading('position', text='#'); self.tree.column('position', width=45, anchor=tk.E, stretch=False)
+        self.tree.heading('brand_name', text='Brand'); self.tree.column('brand_name', width=180)
+        for key, heading, width, _ in LEADERBOARD_COLUMNS:
+            self.tree.heading(key, text=heading, command=lambda key=key: self.sort_by(key))
+            self.tree.column(key, width=width, anchor=tk.E, stretch=False)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        # Fixed pool of row items: scrolling only swaps their values
+        self.row_ids = [self.tree.insert('', tk.END, values=()) for _ in range(visible_rows)]
+        self.row_brands = [None] * visible_rows
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self._on_mousewheel)
+        self.tree.bind('<Prior>', lambda event: self.scroll_to(self.offset - self.visible_rows) or 'break')
+        self.tree.bind('<Next>', lambda event: self.scroll_to(self.offset + self.visible_rows) or 'break')
+        self.refresh()
+
+    # --- Rendering ---
+    def refresh(self):
+        """Re-renders the visible window (call after the model's data, sort or filter changes)."""
+        self.offset = max(0, min(self.offset, len(self.model) - self.visible_rows))
+        self.tree.selection_remove(self.tree.selection()) # Row items are reused, so a selection would go stale
+        rows = self.model.rows(self.offset, self.visible_rows)
+        for i, row_id in enumerate(self.row_ids):
+            if i < len(rows):
+                position, brand_name, values = rows[i]
+                formatted = [fmt.format(values[key]) if not np.isnan(values[key]) else '-' for key, _, _, fmt in LEADERBOARD_COLUMNS]
+                self.tree.item(row_id, values=[position, brand_name] + formatted)
+                self.row_brands[i] = brand_name
+            else:
+                self.tree.item(row_id, values=())
+                self.row_brands[i] = None
+        total = len(self.model)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.count_label.config(text=f"{total:,} brands")
+        for key, heading, _, _ in LEADERBOARD_COLUMNS:
+            arrow = (' ▼' if self.model.descending else ' ▲') if key == self.model.sort_key else ''
+            self.tree.heading(key, text=heading + arrow)
+
+    def set_model(self, model):
+        """Swaps in a model for reloaded data, keeping the current sort, filter and scroll position."""
+        model.set_sort(self.model.sort_key, self.model.descending)
+        model.set_filter(self.model.filter_text)
+        self.model = model
+        self.refresh()
+
+    def scroll_to(self, offset):
+        self.offset = int(offset)
+        self.refresh()
+
+    def sort_by(self, key):
+        self.model.set_sort(key)
+        self.offset = 0
+        self.refresh()
+
+    # --- Event Handlers ---
+    def _on_filter(self):
+        self.model.set_filter(self.filter_var.get())
+        self.offset = 0
+        self.refresh()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(float(amount) * len(self.model))
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return 'break'
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection or self.on_select is None:
+            return
+        brand_name = self.row_brands[self.row_ids.index(selection[0])]
+        if brand_name is not None:
+            self.on_select(brand_name)
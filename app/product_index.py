@@ -0,0 +1,47 @@
+"""Per-brand index over the product table, built once at load time.
+
+Products are sorted once by (brand_name, avg_rating desc, num_reviews desc)
+and each brand's [start, end) row range is recorded, so a brand's best
+products are a positional slice instead of a filter + sort over every product.
+"""
+import numpy as np
+
+PAGE_SIZE = 5
+
+
+class ProductIndex:
+    """Brand -> contiguous slice of a pre-sorted product frame."""
+
+    def __init__(self, df_products):
+        df_sorted = df_products.sort_values(by=['brand_name', 'avg_rating', 'num_reviews'],
+                                            ascending=[True, False, False], kind='stable')
+        self.df = df_sorted.reset_index(drop=True)
+        names = self.df['brand_name'].to_numpy()
+        if len(names):
+            starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+            ends = np.r_[starts[1:], len(names)]
+            self.offsets = {names[start]: (int(start), int(end)) for start, end in zip(starts, ends)}
+        else:
+            self.offsets = {}
+
+    def count(self, brand_name):
+        start, end = self.offsets.get(brand_name, (0, 0))
+        return end - start
+
+    def products(self, brand_name):
+        """All of a brand's products, best rated first (a view, not a copy)."""
+        start, end = self.offsets.get(brand_name, (0, 0))
+        return self.df.iloc[start:end]
+
+    def top(self, brand_name, n=PAGE_SIZE):
+        start, end = self.offsets.get(brand_name, (0, 0))
+        return self.df.iloc[start:min(start + n, end)]
+
+    def num_pages(self, brand_name, page_size=PAGE_SIZE):
+        return max(1, -(-self.count(brand_name) // page_size))
+
+    def page(self, brand_name, page, page_size=PAGE_SIZE):
+        """Products on a 0-based page of the brand's ranked list (empty past the end)."""
+        start, end = self.offsets.get(brand_name, (0, 0))
+        page_start = start + page * page_size
+        return self.df.iloc[min(page_start, end):min(page_start + page_size, end)]
@@ -0,0 +1,103 @@
+"""Persistent radar (spider) chart of a brand's normalised metrics vs. the average brand.
+
+The figure, axes, average profile and a fixed set of brand line/fill artists
+are created once; showing another brand only swaps their data. The figure is a
+plain matplotlib.figure.Figure (not pyplot), so nothing accumulates in pyplot's
+figure registry however many reports are generated. Attach any canvas to
+`RadarChart.figure` (FigureCanvasTkAgg in the GUI, Agg for headless exports).
+"""
+import numpy as np
+from matplotlib.figure import Figure
+
+# (axis label, normalised column in df_all_metrics)
+RADAR_AXES = [
+    ('Hype', 'norm_tweet_volume'),
+    ('Sentiment', 'norm_avg_tweet_sentiment'),
+    ('Quality', 'norm_avg_perceived_quality'),
+    ('Popularity', 'norm_popularity'),
+    ('Low Saturation', 'norm_market_saturation'),
+]
+RADAR_COLUMNS = [column for _, column in RADAR_AXES]
+BRAND_COLORS = ['blue', 'darkorange', 'green', 'purple'] # First is the main brand, the rest are overlays
+MAX_BRANDS = len(BRAND_COLORS)
+
+
+def radar_title(brand_name, score):
+    return f'{brand_name} vs. Average (Score {score:.1f})'
+
+
+class RadarChart:
+    """Radar axes built once; `show()` updates line/fill data for up to MAX_BRANDS brands."""
+
+    def __init__(self, figsize=(5, 5)):
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot(polar=True)
+        angles = [n / float(len(RADAR_AXES)) * 2 * np.pi for n in range(len(RADAR_AXES))]
+        self.angles = np.array(angles + angles[:1])
+
+        ax = self.ax
+        ax.set_xticks(self.angles[:-1]); ax.set_xticklabels([label for label, _ in RADAR_AXES], color='grey', size=8)
+        ax.set_yticks(np.arange(0, 101, 25)); ax.set_yticklabels(["0", "25", "50", "75", "100"], color="grey", size=7)
+        ax.set_ylim(0, 100)
+
+        zeros = np.zeros(len(self.angles))
+        self.avg_line, = ax.plot(self.angles, zeros, linewidth=1, linestyle='solid', label='Average Brand', color='grey', alpha=0.6)
+        self.avg_fill, = ax.fill(self.angles, zeros, 'grey', alpha=0.2)
+        self.brand_lines = []
+        self.brand_fills = []
+        for i, color in enumerate(BRAND_COLORS):
+            line, = ax.plot(self.angles, zeros, linewidth=2 if i == 0 else 1.5, linestyle='solid', color=color)
+            fill, = ax.fill(self.angles, zeros, color, alpha=0.4 if i == 0 else 0.15)
+            self.brand_lines.append(line); self.brand_fills.append(fill)
+        self.legend = None
+        self.clear()
+
+    def _closed(self, values):
+        values = [float(v) for v in values]
+        return np.array(values + values[:1])
+
+    def _set_profile(self, line, fill, values):
+        closed = self._closed(values)
+        line.set_data(self.angles, closed)
+        fill.set_xy(np.column_stack([self.angles, closed]))
+
+    def clear(self):
+        """Hides every profile (empty axes)."""
+        for artist in [self.avg_line, self.avg_fill] + self.brand_lines + self.brand_fills:
+            artist.set_visible(False)
+        self.ax.set_title('')
+        if self.legend is not None:
+            self.legend.remove()
+            self.legend = None
+
+    def show(self, brand_rows, avg_metrics):
+        """Draws the average profile and one profile per row (first = main brand, rest = overlays).
+        Each row needs brand_name, suitability_score and the RADAR_COLUMNS."""
+        brand_rows = list(brand_rows)[:MAX_BRANDS]
+        self._set_profile(self.avg_line, self.avg_fill, [avg_metrics[column] for column in RADAR_COLUMNS])
+        self.avg_line.set_visible(True); self.avg_fill.set_visible(True)
+        for i, (line, fill) in enumerate(zip(self.brand_lines, self.brand_fills)):
+            visible = i < len(brand_rows)
+            if visible:
+                self._set_profile(line, fill, [brand_rows[i][column] for column in RADAR_COLUMNS])
+            line.set_visible(visible); fill.set_visible(visible)
+        self.set_scores(brand_rows)
+
+    def set_scores(self, brand_rows):
+        """Refreshes the title/legend (scores change with the weights; the profiles do not)."""
+        brand_rows = list(brand_rows)[:MAX_BRANDS]
+        if not brand_rows:
+            return
+        if len(brand_rows) == 1:
+            self.ax.set_title(radar_title(brand_rows[0]['brand_name'], brand_rows[0]['suitability_score']), size=10, y=1.1)
+        else:
+            self.ax.set_title('Brand Comparison vs. Average', size=10, y=1.1)
+        for line, row in zip(self.brand_lines, brand_rows):
+            line.set_label(f"{row['brand_name']} ({row['suitability_score']:.1f})" if len(brand_rows) > 1 else row['brand_name'])
+        handles = [self.avg_line] + self.brand_lines[:len(brand_rows)]
+        if self.legend is not None:
+            self.legend.remove()
+        # Anchored to the figure bottom; the axes shrink to make room for extra legend rows
+        legend_rows = -(-len(handles) // 2)
+        self.figure.subplots_adjust(bottom=0.06 + 0.045 * legend_rows, top=0.86)
+        self.legend = self.figure.legend(handles=handles, loc='lower center', ncol=2, fontsize=8, frameon=True)
@@ -0,0 +1,76 @@
+"""Plain-text brand reports shared by the GUI and the headless exporters."""
+import pandas as pd
+
+from scoring_engine import generate_recommendation
+
+PRODUCTS_PAGE_SIZE = 5
+# Metrics that get a bootstrap interval (see score_bootstrap.py): (column, label, number format, unit)
+INTERVAL_ROWS = [
+    ('avg_tweet_sentiment', "Sentiment", "{:.2f}", "tweets"),
+    ('avg_perceived_quality', "Quality", "{:.2f}", "products"),
+    ('avg_num_reviews', "Popularity", "{:.1f}", "products"),
+]
+
+
+def build_report_text(brand_data, intervals=None):
+    """Text report for one scored brand row (see scoring_engine.ScoringEngine.attach),
+    plus the bootstrap intervals from score_bootstrap.BootstrapResult.brand_intervals() if given."""
+    actual_brand_name = brand_data['brand_name']
+    recommendation = generate_recommendation(brand_data['suitability_score'])
+    scoring_group = brand_data.get('scoring_group') # Set in category mode: norms and ranks are within the category
+    scope = f"\n  - SCORED WITHIN:       {scoring_group}" if isinstance(scoring_group, str) else ""
+    report = f"""
+-------------------------------------------
+BRAND REPORT: {actual_brand_name}
+-------------------------------------------
+Overall Score & Recommendation:
+  - SUITABILITY SCORE: {brand_data['suitability_score']:.1f} / 100
+  - RECOMMENDATION:      {recommendation}{scope}
+-------------------------------------------
+Metrics Breakdown (Value | Norm Score | Rank):
+  - Hype (Tweets):    {brand_data['tweet_volume']:>7,.0f} | {brand_data['norm_tweet_volume']:>3.0f}/100 | {brand_data['rank_hype']:>3.0f}th pctile
+  - Sentiment (Tweet): {brand_data['avg_tweet_sentiment']:>7.2f} | {brand_data['norm_avg_tweet_sentiment']:>3.0f}/100 | {brand_data['rank_sentiment']:>3.0f}th pctile
+  - Quality (Amz Rat): {brand_data['avg_perceived_quality']:>7.1f} | {brand_data['norm_avg_perceived_quality']:>3.0f}/100 | {brand_data['rank_quality']:>3.0f}th pctile
+  - Popularity (Amz Rev):{brand_data['avg_num_reviews']:>7.1f} | {brand_data['norm_popularity']:>3.0f}/100 | {brand_data['rank_popularity']:>3.0f}th pctile
+  - Saturation (Amz Prod):{brand_data['market_saturation']:>7.0f} | {brand_data['norm_market_saturation']:>3.0f}/100 | {brand_data['rank_saturation']:>3.0f}th pctile
+  - Momentum (WoW Twt): {brand_data['wow_momentum']:>+7.0%} | {brand_data['norm_hype_momentum']:>3.0f}/100 | {brand_data['rank_momentum']:>3.0f}th pctile
+  - Trend (Slope/wk):  {brand_data['trend_slope']:>+7.2f} | {brand_data['norm_trend_slope']:>3.0f}/100 | {brand_data['rank_trend']:>3.0f}th pctile
+  - Velocity: {brand_data['tweets_per_day_7d']:.1f} tweets/day (last 7 days)
+-------------------------------------------
+    """
+    if intervals:
+        report = report.rstrip(' ') + format_intervals_text(intervals)
+    return report
+
+def format_intervals_text(intervals, confidence=0.95):
+    """Report section for one brand's bootstrap intervals."""
+    low, high = intervals['suitability_score']
+    text = f"Uncertainty ({confidence:.0%} bootstrap CI):\n  - Suitability Score: {low:.1f} - {high:.1f}\n"
+    for column, label, number, unit in INTERVAL_ROWS:
+        if column in intervals:
+            low, high, size = intervals[column]
+            text += f"  - {label + ':':<19}{number.format(low)} - {number.format(high)} (n={size} {unit})\n"
+        else:
+            text += f"  - {label + ':':<19}n/a (no {unit} to resample)\n"
+    return text + "-"*43 + "\n"
+
+def build_products_text(product_index, brand_name, page=0, page_size=PRODUCTS_PAGE_SIZE):
+    """One page of a brand's Amazon.sa products, best rated first (sliced from the product index)."""
+    return format_products_text(product_index.page(brand_name, page, page_size), page, page_size)
+
+def format_products_text(page_products, page=0, page_size=PRODUCTS_PAGE_SIZE):
+    """Text for one page of products already sorted best rated first."""
+    if page == 0:
+        products_report = f"Top {page_size} Amazon.sa Products (by Rating):\n" + "-"*35 + "\n"
+    else:
+        first = page * page_size + 1
+        products_report = f"Amazon.sa Products {first}-{first + len(page_products) - 1} (by Rating):\n" + "-"*35 + "\n"
+    if not page_products.empty:
+        for product in page_products.itertuples(index=False):
+            price_str = f"{product.price:.2f} SAR" if pd.notna(product.price) else "N/A"
+            product_name_short = product.product_name[:45] + '...' if len(product.product_name) > 45 else product.product_name
+            products_report += f"- {product_name_short}\n"
+            products_report += f"    Rating: {product.avg_rating:.1f} ({product.num_reviews} rev) | Price: {price_str}\n"
+    else:
+        products_report += "(No products found for this brand)\n"
+    return products_report
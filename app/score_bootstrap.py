@@ -0,0 +1,238 @@
+"""Bootstrap confidence intervals for the sampled brand metrics and the suitability score.
+
+Quality and popularity are means over a brand's Amazon.sa products and sentiment
+is a mean over its tweets, so brands with a handful of either are noisy. Each
+brand's rows are resampled with replacement without a Python loop per resample:
+rows are sorted by brand (one start offset and count per brand), a (resamples x
+rows) matrix of indices start + floor(U * count) is drawn, and the per-brand
+means come from one np.add.reduceat over the gathered values. The resampled
+metrics are normalised against the bounds the ScoringEngine used for the point
+estimate (the whole universe, or the brand's category) and scored with the
+current weights, which gives the score interval.
+
+Tweet sentiment is resampled from the per-tweet scores that
+analytics/streaming_metrics.py stores in the tweet_sentiment table; without that
+table only the product metrics (and their share of the score) get intervals.
+
+Also runs headless: python app/score_bootstrap.py --resamples 2000 --brand "Sleysla"
+"""
+import argparse
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pandas as pd
+
+from scoring_engine import COMPONENT_KEYS, INPUT_TRANSFORMS, weight_vector
+
+N_RESAMPLES = 1000
+CONFIDENCE = 0.95
+SEED = 0 # Fixed, so a brand's intervals (and batch export hashes) do not change between runs
+CHUNK_CELLS = 5_000_000 # resamples x rows per chunk (a few float64/int64 arrays of this size)
+
+# (weight key, metric column, source rows, per-row value column, unit) for the metrics that are sample means
+BOOTSTRAP_METRICS = [
+    ('sentiment', 'avg_tweet_sentiment', 'tweets', 'sentiment_score', 'tweets'),
+    ('quality', 'avg_perceived_quality', 'products', 'avg_rating', 'products'),
+    ('popularity', 'avg_num_reviews', 'products', 'num_reviews', 'products'),
+]
+
+
+# --- Resampling ---
+def group_rows(brand_names, row_brands, values):
+    """Sorts the rows by brand -> (values, starts, counts), one start/count per entry of `brand_names`
+    (count 0 for brands without rows; rows of other brands are dropped)."""
+    codes = pd.Index(brand_names).get_indexer(row_brands)
+    values = np.asarray(values, dtype=float)
+    keep = codes >= 0
+    codes, values = codes[keep], values[keep]
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes, minlength=len(brand_names))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+    return values[order], starts, counts
+
+
+def resample_means(values, starts, counts, n_resamples=N_RESAMPLES, rng=None):
+    """(brands x n_resamples) means of each brand's rows resampled with replacement
+    (NaN for brands without rows). Loops over chunks of resamples only."""
+    rng = np.random.default_rng(SEED) if rng is None else rng
+    means = np.full((len(counts), n_resamples), np.nan)
+    n_rows = values.size
+    has_rows = counts > 0
+    if n_rows == 0:
+        return means
+    row_starts = np.repeat(starts, counts) # Each row's brand offset and row count
+    row_counts = np.repeat(counts, counts)
+    segment_starts = starts[has_rows] # Strictly increasing, so reduceat sums exactly one brand per segment
+    chunk = max(1, CHUNK_CELLS // n_rows)
+    for first in range(0, n_resamples, chunk):
+        size = min(chunk, n_resamples - first)
+        index = row_starts + (rng.random((size, n_rows)) * row_counts).astype(np.int64)
+        sums = np.add.reduceat(values[index], segment_starts, axis=1)
+        means[has_rows, first:first + size] = (sums / counts[has_rows]).T
+    return means
+
+
+# --- Normalisation (same bounds as the ScoringEngine) ---
+def normalize_fixed(values, transform, low, high):
+    """0-100 against each row's fixed bounds (clipped: a resampled mean can fall outside the range it
+    was normalised over). Rows whose bounds are equal score 50, like scoring_engine.normalize()."""
+    low, high = low[:, None], high[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        norms = np.clip((transform(values) - low) / (high - low) * 100, 0.0, 100.0)
+    norms = np.where(high == low, 50.0, norms)
+    return np.where(np.isnan(norms), 50.0, norms)
+
+
+# --- Results ---
+class BootstrapResult:
+    """Resampled metrics for a set of brands (arrays aligned with `brand_names`)."""
+
+    def __init__(self, brand_names, metric_samples, sample_sizes, base_norms, resampled_norms, n_resamples,
+                 confidence=CONFIDENCE):
+        self.brand_names = list(brand_names)
+        self.metric_samples = metric_samples # {metric column: (brands x resamples)}
+        self.sample_sizes = sample_sizes # {metric column: rows per brand}
+        self.base_norms = base_norms # (brands x components), the ScoringEngine's norm rows
+        self.resampled_norms = resampled_norms # {component index: (brands x resamples)}
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.row_of = {brand_name: row for row, brand_name in enumerate(self.brand_names)}
+
+    def percentiles(self, samples):
+        tail = (1 - self.confidence) / 2 * 100
+        return np.percentile(samples, [tail, 100 - tail], axis=-1)
+
+    def score_samples(self, weights):
+        """(brands x resamples) suitability scores: the point score with each resampled component swapped in."""
+        vector = weight_vector(weights)
+        scores = (self.base_norms @ vector)[:, None] + np.zeros((1, self.n_resamples))
+        for component, norms in self.resampled_norms.items():
+            scores += vector[component] * (norms - self.base_norms[:, [component]])
+        return np.round(scores, 1)
+
+    def brand_intervals(self, brand_name, weights):
+        """{'suitability_score': (low, high), metric column: (low, high, sample size), ...} for one brand
+        (metrics without source rows are left out), or None for a brand that was not resampled."""
+        row = self.row_of.get(brand_name)
+        if row is None:
+            return None
+        low, high = self.percentiles(self.score_samples(weights)[row])
+        intervals = {'suitability_score': (float(low), float(high))}
+        for metric_col, samples in self.metric_samples.items():
+            size = int(self.sample_sizes[metric_col][row])
+            if size > 0:
+                low, high = self.percentiles(samples[row])
+                intervals[metric_col] = (float(low), float(high), size)
+        return intervals
+
+    def score_intervals(self, weights):
+        """(low, high) arrays of the score interval for every brand."""
+        return self.percentiles(self.score_samples(weights))
+
+
+def bootstrap_brands(scoring, df_metrics, df_products, df_tweet_sentiment=None, brand_names=None,
+                     n_resamples=N_RESAMPLES, confidence=CONFIDENCE, seed=SEED):
+    """Resamples the products (and stored tweet scores, if any) of `brand_names` (default: every brand).
+    `scoring` is the ScoringEngine built from `df_metrics`; its bounds normalise the resampled means."""
+    all_brands = pd.Index(scoring.brand_names)
+    brand_names = list(all_brands if brand_names is None else brand_names)
+    rows = all_brands.get_indexer(brand_names)
+    if (rows < 0).any():
+        raise KeyError(f"Unknown brands: {[name for name, row in zip(brand_names, rows) if row < 0]}")
+    point_metrics = df_metrics.set_index('brand_name').loc[brand_names]
+    sources = {'products': df_products, 'tweets': df_tweet_sentiment}
+    rng = np.random.default_rng(seed)
+
+    metric_samples, sample_sizes, resampled_norms = {}, {}, {}
+    for key, metric_col, source, value_col, _ in BOOTSTRAP_METRICS:
+        df_source = sources[source]
+        if df_source is None:
+            continue
+        df_source = df_source[df_source['brand_name'].isin(brand_names)]
+        values, starts, counts = group_rows(brand_names, df_source['brand_name'], df_source[value_col].fillna(0))
+        samples = resample_means(values, starts, counts, n_resamples, rng)
+        # Brands without rows keep their point estimate (e.g. the 0 rating of a brand with no products)
+        point = point_metrics[metric_col].to_numpy(dtype=float)[:, None]
+        samples = np.where(np.isnan(samples), point, samples)
+        metric_samples[metric_col] = samples
+        sample_sizes[metric_col] = counts
+        component = COMPONENT_KEYS.index(key)
+        resampled_norms[component] = normalize_fixed(samples, INPUT_TRANSFORMS[key],
+                                                     scoring.low[rows, component], scoring.high[rows, component])
+    return BootstrapResult(brand_names, metric_samples, sample_sizes, scoring.norms[rows], resampled_norms,
+                           n_resamples, confidence)
+
+
+def load_tweet_sentiment(db_path, brand_names=None):
+    """Per-tweet sentiment scores from the DB, or None if the streaming stage has not stored them."""
+    from analytics.streaming_metrics import load_tweet_sentiment as query_tweet_sentiment
+    conn = sqlite3.connect(db_path)
+    try:
+        return query_tweet_sentiment(conn, brand_names)
+    finally:
+        conn.close()
+
+
+def bootstrap_app_data(app_data, db_path, brand_names=None, n_resamples=N_RESAMPLES, seed=SEED):
+    """bootstrap_brands() over a loaded AppData, reading the stored tweet scores from `db_path`."""
+    df_tweet_sentiment = load_tweet_sentiment(db_path, brand_names)
+    return bootstrap_brands(app_data.scoring, app_data.df_metrics, app_data.df_products, df_tweet_sentiment,
+                            brand_names, n_resamples, seed=seed)
+
+
+# --- Text Output ---
+def format_widest_intervals(result, weights, top=20):
+    """Brands whose score interval is widest first (the least reliable scores)."""
+    low, high = result.score_intervals(weights)
+    order = np.argsort(-(high - low), kind='stable')[:top]
+    lines = [f"{'Brand':<28}{'Score CI':>16}{'Width':>8}{'Products':>10}{'Tweets':>8}"]
+    for row in order:
+        products = result.sample_sizes.get('avg_perceived_quality')
+        tweets = result.sample_sizes.get('avg_tweet_sentiment')
+        lines.append(f"{str(result.brand_names[row])[:27]:<28}{low[row]:>7.1f} - {high[row]:>5.1f}{high[row] - low[row]:>8.1f}"
+                     f"{products[row] if products is not None else 0:>10}{tweets[row] if tweets is not None else '-':>8}")
+    return "\n".join(lines)
+
+
+# --- MAIN EXECUTION ---
+def main(argv=None):
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..')) # Project root, for the shared 'analytics' package
+    import data_loader
+    import score_snapshot
+    from report_builder import format_intervals_text
+    from scoring_engine import WEIGHTS, normalized_weights
+
+    parser = argparse.ArgumentParser(description="Bootstrap confidence intervals for brand metrics and scores.")
+    parser.add_argument('--resamples', type=int, default=N_RESAMPLES)
+    parser.add_argument('--brand', help="Print one brand's intervals")
+    parser.add_argument('--top', type=int, default=20, help="Brands with the widest score intervals to list")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--csv', default=data_loader.DATA_CSV_PATH)
+    parser.add_argument('--db', default=data_loader.PRODUCTS_DB_PATH)
+    args = parser.parse_args(argv)
+
+    app_data = score_snapshot.load_app_data(args.csv, args.db, WEIGHTS)
+    weights = normalized_weights(WEIGHTS)
+    brand_names = None
+    if args.brand:
+        brand_name = app_data.search_index.resolve(args.brand)
+        if brand_name is None:
+            print(f"Unknown brand '{args.brand}'.")
+            return 1
+        brand_names = [brand_name]
+
+    result = bootstrap_app_data(app_data, args.db, brand_names, args.resamples, args.seed)
+    if 'avg_tweet_sentiment' not in result.metric_samples:
+        print("NOTE: No stored tweet sentiment scores; run analytics/streaming_metrics.py for sentiment intervals.")
+    if args.brand:
+        print(f"\n--- {brand_names[0]} ({args.resamples} resamples) ---")
+        print(format_intervals_text(result.brand_intervals(brand_names[0], weights)))
+    else:
+        print(f"\n--- Widest score intervals ({args.resamples} resamples, {len(result.brand_names)} brands) ---")
+        print(format_widest_intervals(result, weights, args.top))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""Append-only history of every metrics/score build, for score series and past leaderboards.
+
+Layout under data/score_history/ (columnar, one partition per build month):
+    manifest.json       format version, brand dictionary (name -> id) and one entry per build
+    2026-10.npz         the month's builds stacked: build_index, brand_id and one float32
+                        column per recorded metric (suitability_score + the raw components)
+
+Appending a build rewrites only its month's partition (a few dozen builds).
+Queries load each partition once and keep it in memory until the file
+changes, so a brand's series over years of daily builds is one boolean mask per
+month, and a past leaderboard reads a single partition.
+"""
+import copy
+import json
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from scoring_engine import COMPONENTS, WEIGHTS, normalized_weights, score_matrix
+
+# --- Configuration ---
+HISTORY_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'score_history')
+FORMAT_VERSION = 1
+HISTORY_COLUMNS = ['suitability_score'] + [metric_col for _, metric_col, _, _ in COMPONENTS]
+BUILD_ID_FORMAT = '%Y%m%dT%H%M%S'
+
+
+def as_float(values):
+    """float32 column -> float64 rounded to float32's 7 significant digits (277.8 stays 277.8, not 277.799988)."""
+    values = values.astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    scale = 10.0 ** (6 - np.where(np.isfinite(magnitude), magnitude, 0))
+    return np.round(values * scale) / scale
+
+
+class ScoreHistory:
+    """Reads and appends builds. Safe to share between threads (one writer lock, cached reads)."""
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._partitions = {} # month -> (mtime_ns, {column: array})
+        self._manifest = None
+        self._manifest_mtime = None
+
+    # --- Storage ---
+    def _manifest_path(self):
+        return os.path.join(self.root, 'manifest.json')
+
+    def _partition_path(self, month):
+        return os.path.join(self.root, f'{month}.npz')
+
+    def manifest(self):
+        """{'version', 'brands': [names, position = id], 'builds': [{build_id, month, ...}, ...]} (cached)."""
+        path = self._manifest_path()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {'version': FORMAT_VERSION, 'brands': [], 'builds': []}
+        if mtime != self._manifest_mtime:
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported score history version {manifest.get('version')} in {path}")
+            self._manifest, self._manifest_mtime = manifest, mtime
+        return self._manifest
+
+    def _partition(self, month):
+        path = self._partition_path(month)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        cached = self._partitions.get(month)
+        if cached is None or cached[0] != mtime:
+            with np.load(path) as npz:
+                cached = (mtime, {name: npz[name] for name in npz.files})
+            self._partitions[month] = cached
+        return cached[1]
+
+    def _write_partition(self, month, columns):
+        path = self._partition_path(month)
+        with open(path + '.tmp', 'wb') as f:
+            np.savez_compressed(f, **columns)
+        os.replace(path + '.tmp', path)
+
+    def _write_manifest(self, manifest):
+        path = self._manifest_path()
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path) # The manifest is written last: a build is visible only once complete
+
+    # --- Writing ---
+    def record_build(self, df_metrics, norms, fingerprint=None, weights=WEIGHTS, built_at=None):
+        """Appends one build: every brand's score under the default `weights` plus its raw metrics.
+        Skipped (returns None) if the newest build has the same data fingerprint. Returns the build id."""
+        built_at = built_at or datetime.now()
+        fingerprint = json.dumps(fingerprint) if fingerprint is not None else None
+        with self._lock:
+            manifest = copy.deepcopy(self.manifest())
+            if fingerprint is not None and manifest['builds'] and manifest['builds'][-1].get('fingerprint') == fingerprint:
+                return None
+            brand_ids = {name: i for i, name in enumerate(manifest['brands'])}
+            for name in df_metrics['brand_name']:
+                if name not in brand_ids:
+                    brand_ids[name] = len(manifest['brands'])
+                    manifest['brands'].append(name)
+
+            build_id = built_at.strftime(BUILD_ID_FORMAT)
+            if manifest['builds'] and manifest['builds'][-1]['build_id'] >= build_id:
+                build_id = manifest['builds'][-1]['build_id'] + '.1' # Two builds in one second
+            month = built_at.strftime('%Y-%m')
+            weights = normalized_weights(weights)
+            new = {
+                'build_index': np.full(len(df_metrics), len(manifest['builds']), dtype=np.int32),
+                'brand_id': np.array([brand_ids[name] for name in df_metrics['brand_name']], dtype=np.int32),
+                'suitability_score': score_matrix(np.asarray(norms), weights).astype(np.float32),
+            }
+            for column in HISTORY_COLUMNS[1:]:
+                values = df_metrics[column] if column in df_metrics.columns else 0.0
+                new[column] = pd.to_numeric(pd.Series(values, index=df_metrics.index), errors='coerce').to_numpy(dtype=np.float32)
+
+            os.makedirs(self.root, exist_ok=True)
+            existing = self._partition(month)
+            columns = {name: np.concatenate([existing[name], new[name]]) if existing is not None else new[name]
+                       for name in new}
+            self._write_partition(month, columns)
+            manifest['builds'].append({'build_id': build_id, 'month': month, 'built_at': built_at.isoformat(timespec='seconds'),
+                                       'brands': len(df_metrics), 'weights': weights, 'fingerprint': fingerprint})
+            self._write_manifest(manifest)
+            return build_id
+
+    # --- Queries ---
+    def builds(self):
+        """DataFrame of recorded builds (build_id, month, built_at, brands), oldest first."""
+        builds = self.manifest()['builds']
+        df = pd.DataFrame(builds, columns=['build_id', 'month', 'built_at', 'brands'])
+        df['built_at'] = pd.to_datetime(df['built_at'])
+        return df
+
+    def brand_series(self, brand_name, column='suitability_score', start=None, end=None):
+        """pandas Series of `column` for one brand, indexed by build time (empty if never recorded)."""
+        manifest = self.manifest()
+        empty = pd.Series([], dtype=float, index=pd.DatetimeIndex([], name='built_at'), name=column)
+        try:
+            brand_id = manifest['brands'].index(brand_name)
+        except ValueError:
+            return empty
+        builds = manifest['builds']
+        months = sorted({build['month'] for build in builds
+                         if (start is None or build['month'] >= pd.Timestamp(start).strftime('%Y-%m'))
+                         and (end is None or build['month'] <= pd.Timestamp(end).strftime('%Y-%m'))})
+        times, values = [], []
+        for month in months:
+            partition = self._partition(month)
+            if partition is None:
+                continue
+            rows = np.flatnonzero(partition['brand_id'] == brand_id)
+            times.extend(builds[i]['built_at'] for i in partition['build_index'][rows])
+            values.append(partition[column][rows])
+        if not times:
+            return empty
+        series = pd.Series(as_float(np.concatenate(values)), index=pd.DatetimeIndex(pd.to_datetime(times), name='built_at'), name=column)
+        if start is not None:
+            series = series[series.index >= pd.Timestamp(start)]
+        if end is not None:
+            series = series[series.index <= pd.Timestamp(end)]
+        return series
+
+    def resolve_build(self, as_of=None):
+        """Index of the build with id `as_of`, or of the newest build at or before the time `as_of` (None = latest)."""
+        builds = self.manifest()['builds']
+        if not builds:
+            return None
+        if as_of is None:
+            return len(builds) - 1
+        for i, build in enumerate(builds):
+            if build['build_id'] == as_of:
+                return i
+        when = pd.Timestamp(as_of)
+        candidates = [i for i, build in enumerate(builds) if pd.Timestamp(build['built_at']) <= when]
+        return candidates[-1] if candidates else None
+
+    def leaderboard_as_of(self, as_of=None):
+        """Every brand's recorded columns for one past build, best score first (empty frame if none)."""
+        index = self.resolve_build(as_of)
+        if index is None:
+            return pd.DataFrame(columns=['brand_name'] + HISTORY_COLUMNS)
+        manifest = self.manifest()
+        partition = self._partition(manifest['builds'][index]['month'])
+        rows = np.flatnonzero(partition['build_index'] == index)
+        df = pd.DataFrame({column: as_float(partition[column][rows]) for column in HISTORY_COLUMNS})
+        df.insert(0, 'brand_name', [manifest['brands'][i] for i in partition['brand_id'][rows]])
+        df = df.sort_values(['suitability_score', 'brand_name'], ascending=[False, True], kind='stable')
+        df.attrs['build_id'] = manifest['builds'][index]['build_id']
+        return df.reset_index(drop=True)
+
+
+_default_history = None
+
+def default_history():
+    """Process-wide ScoreHistory over HISTORY_DIR (its partition cache is shared by every caller)."""
+    global _default_history
+    if _default_history is None:
+        _default_history = ScoreHistory()
+    return _default_history
+
+
+def record_app_data(app_data, history=None):
+    """Records a freshly built AppData (scores recomputed with the default WEIGHTS, so builds are comparable)."""
+    history = history or default_history()
+    try:
+        return history.record_build(app_data.df_metrics, app_data.scoring.norms, app_data.fingerprint)
+    except (OSError, ValueError) as e:
+        print(f"   Could not record score history: {e}")
+        return None
@@ -0,0 +1,111 @@
+"""Precomputed AppData snapshot, so a launch does not redo the SQL aggregation, normalisation and ranking.
+
+data/app_snapshot.pkl holds a small header (snapshot version + fingerprint of the
+CSV, the DB and the scraper scripts the aliases come from) followed by the pickled
+AppData: scored metrics, norm/rank matrices, the sorted product index and the
+brand search index. The header is read first, so a stale snapshot costs one
+small unpickle before falling back to a full load (which then rewrites it).
+"""
+import glob
+import os
+import pickle
+
+import data_loader
+import score_history
+from brand_catalog import SCRAPER_DIR
+from scoring_engine import WEIGHTS
+
+# --- Configuration ---
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'app_snapshot.pkl')
+SNAPSHOT_VERSION = 3 # Bump when AppData or anything pickled inside it changes shape
+
+
+def snapshot_key(csv_path, db_path, fingerprint=None, scraper_dir=SCRAPER_DIR):
+    """Everything a snapshot's contents depend on (`fingerprint` defaults to the files' current one)."""
+    scripts = []
+    for path in sorted(glob.glob(os.path.join(scraper_dir, '*.py'))):
+        stat = os.stat(path)
+        scripts.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+    if fingerprint is None:
+        fingerprint = data_loader.data_fingerprint(csv_path, db_path)
+    return (SNAPSHOT_VERSION, fingerprint, tuple(scripts))
+
+
+def read_snapshot(key, path=SNAPSHOT_PATH):
+    """The AppData saved under `key`, or None (missing, stale or unreadable)."""
+    try:
+        with open(path, 'rb') as f:
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e: # Truncated file, or pickled by incompatible library versions
+        print(f"   Ignoring unreadable snapshot {os.path.basename(path)}: {e}")
+        return None
+
+
+def write_snapshot(app_data, key, path=SNAPSHOT_PATH):
+    """Saves app_data under `key` (written to a temp file, then renamed over the old snapshot)."""
+    compact = compact_copy(app_data)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(compact, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f"   Could not save snapshot: {e}")
+
+
+def compact_copy(app_data):
+    """Copy of app_data whose df_products is the product index's frame (same rows, sorted),
+    so the pickle stores the products once."""
+    compact = data_loader.AppData.__new__(data_loader.AppData)
+    compact.__dict__.update(app_data.__dict__)
+    compact.df_products = app_data.product_index.df
+    return compact
+
+
+def history_for(csv_path, db_path, history=None):
+    """The ScoreHistory a build of these files is recorded in: `history` if given, else the default one,
+    but only for the default data files (builds of benchmark data or scratch copies are not recorded)."""
+    if history is not None:
+        return history
+    default_paths = (os.path.abspath(data_loader.DATA_CSV_PATH), os.path.abspath(data_loader.PRODUCTS_DB_PATH))
+    if (os.path.abspath(csv_path), os.path.abspath(db_path)) == default_paths:
+        return score_history.default_history()
+    return None
+
+
+def save_reloaded(app_data, csv_path=data_loader.DATA_CSV_PATH, db_path=data_loader.PRODUCTS_DB_PATH,
+                  snapshot_path=SNAPSHOT_PATH, history=None):
+    """Snapshots the result of data_loader.reload_app_data() so the next launch starts from it
+    (and records it as a new build in the score history, see history_for()). Category-mode data is
+    neither: launches and the history are universe-scored, so the next launch rebuilds instead."""
+    if app_data.scoring.mode != 'universe':
+        return
+    write_snapshot(app_data, snapshot_key(csv_path, db_path, app_data.fingerprint), snapshot_path)
+    history = history_for(csv_path, db_path, history)
+    if history is not None:
+        score_history.record_app_data(app_data, history)
+
+
+def load_app_data(csv_path=data_loader.DATA_CSV_PATH, db_path=data_loader.PRODUCTS_DB_PATH, weights=WEIGHTS,
+                  progress=None, snapshot_path=SNAPSHOT_PATH, history=None):
+    """data_loader.load_app_data(), served from the snapshot when the sources have not changed.
+    A full build is recorded in the score history chosen by history_for()."""
+    progress = progress or (lambda message: None)
+    key = snapshot_key(csv_path, db_path)
+    progress("Reading snapshot...")
+    app_data = read_snapshot(key, snapshot_path)
+    if app_data is None:
+        app_data = data_loader.load_app_data(csv_path, db_path, weights, progress)
+        progress("Saving snapshot...")
+        write_snapshot(app_data, key, snapshot_path)
+        history = history_for(csv_path, db_path, history)
+        if history is not None:
+            score_history.record_app_data(app_data, history) # A full build is a new point in every brand's score history
+    elif app_data.scoring.weights != dict(weights):
+        app_data.df_metrics['suitability_score'] = app_data.scoring.rescore(weights) # Norms and ranks are weight-independent
+    return app_data
@@ -0,0 +1,476 @@
+"""Local HTTP service over the consultant tool's data: reports, leaderboard, products and radar charts.
+
+Run from the project root:
+    python app/scoring_api.py --port 8050
+
+Endpoints (GET, JSON unless noted; `brand` accepts any name or alias):
+    /health
+    /brands?q=hil&limit=20                      brand search (prefix, then one-typo matches)
+    /report?brand=Al-Hilal&weights=hype:0.5,quality:0.5
+    /leaderboard?sort=suitability_score&order=desc&filter=al&offset=0&limit=50&weights=...
+    /products?brand=Al-Hilal&page=0&page_size=5
+    /similar?brand=Al-Hilal&k=5&same_category=1         nearest brands by normalised metrics
+    /radar.png?brand=Al-Hilal&compare=Nike,Adidas          (image/png)
+    /history?brand=Al-Hilal&start=2026-01-01&end=2026-06-30 score series over recorded builds
+    /history/leaderboard?as_of=2026-03-01&limit=50          leaderboard of a past build (id or date)
+
+Data is loaded once with the same data_loader/scoring_engine code as the Tk tool
+and shared read-only by the request threads. Responses are kept in an LRU cache
+keyed by the data fingerprint (size and mtime of the metrics CSV and the DB);
+when either file changes the changed brands are reloaded and the cache is dropped.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import matplotlib
+matplotlib.use('Agg') # Headless rendering for /radar.png
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..')) # Project root, for the shared 'analytics' package
+import data_loader
+import report_builder
+import score_history
+import scoring_engine
+from leaderboard import LeaderboardModel, LEADERBOARD_COLUMNS
+from radar_chart import RadarChart, RADAR_COLUMNS, MAX_BRANDS as MAX_RADAR_BRANDS
+from scoring_engine import WEIGHTS, generate_recommendation
+from similar_brands import SimilarityIndex
+
+# --- Configuration ---
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8050
+CACHE_SIZE = 1024 # Responses kept in memory
+FINGERPRINT_CHECK_SECONDS = 2.0 # How often a request may stat the data files
+MAX_LEADERBOARD_ROWS = 500
+MAX_PRODUCTS_PAGE_SIZE = 50
+MAX_SIMILAR = 100
+SORT_KEYS = [key for key, _, _, _ in LEADERBOARD_COLUMNS]
+
+
+class ApiError(Exception):
+    """A request that cannot be answered; becomes a JSON error response with `status`."""
+
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+# --- Response Cache ---
+class ResponseCache:
+    """Thread-safe LRU of (status, content_type, body) keyed by request."""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# --- Loaded Data ---
+class DataSnapshot:
+    """One load of the app data plus lookups built from it. Never mutated after construction
+    (except the leaderboard model, which is guarded by its own lock)."""
+
+    def __init__(self, app_data):
+        self.app_data = app_data
+        self.fingerprint = app_data.fingerprint
+        self.df_metrics = app_data.df_metrics
+        self.row_of = {brand_name: i for i, brand_name in enumerate(self.df_metrics['brand_name'])}
+        self.avg_metrics = self.df_metrics[RADAR_COLUMNS].mean()
+        self.leaderboard = LeaderboardModel.from_metrics(self.df_metrics)
+        self.leaderboard_lock = threading.Lock()
+        self.similarity_index = SimilarityIndex.from_scoring(app_data.scoring, app_data.categories) # Read-only, shared
+        self.loaded_at = time.time()
+
+    def brand_row(self, brand_name, scores=None):
+        """The brand's metrics row; with `scores`, its suitability_score is replaced by the re-weighted one."""
+        i = self.row_of[brand_name]
+        row = self.df_metrics.iloc[i]
+        if scores is not None:
+            row = row.copy()
+            row['suitability_score'] = scores[i]
+        return row
+
+
+class ScoringService:
+    """Owns the current DataSnapshot, the response cache and the radar renderer."""
+
+    def __init__(self, csv_path=data_loader.DATA_CSV_PATH, db_path=data_loader.PRODUCTS_DB_PATH, cache_size=CACHE_SIZE):
+        self.csv_path = csv_path
+        self.db_path = db_path
+        self.cache = ResponseCache(cache_size)
+        self._reload_lock = threading.Lock()
+        self._last_check = 0.0
+        self.snapshot = self._load()
+        self._seen_fingerprint = self.snapshot.fingerprint
+        self.radar_chart = RadarChart()
+        FigureCanvasAgg(self.radar_chart.figure)
+        self._radar_lock = threading.Lock() # One figure, one renderer at a time
+
+    def _load(self):
+        app_data = data_loader.load_app_data(self.csv_path, self.db_path, WEIGHTS,
+                                             progress=lambda message: print(f"   {message}"))
+        print(f"--- Loaded {len(app_data.brand_list)} brands ---")
+        return DataSnapshot(app_data)
+
+    def current(self):
+        """The snapshot to answer from, reloading first if the data files changed."""
+        now = time.monotonic()
+        if now - self._last_check < FINGERPRINT_CHECK_SECONDS:
+            return self.snapshot
+        self._last_check = now
+        fingerprint = data_loader.data_fingerprint(self.csv_path, self.db_path)
+        if fingerprint == self._seen_fingerprint:
+            return self.snapshot
+        with self._reload_lock:
+            if fingerprint != self._seen_fingerprint: # Another thread may have reloaded already
+                print("--- Data files changed, reloading ---")
+                try:
+                    app_data, changed = data_loader.reload_app_data(self.snapshot.app_data, self.csv_path, self.db_path, WEIGHTS)
+                except Exception as e:
+                    # Files may be mid-write; keep serving the old data and try again on a later request
+                    print(f"   Reload failed, keeping the previous data: {e}")
+                    return self.snapshot
+                self._seen_fingerprint = fingerprint
+                if app_data is None:
+                    print("   No brand's data changed; cached responses stay valid.")
+                else:
+                    print(f"--- Reloaded: {len(changed)} brand(s) changed ---")
+                    self.snapshot = DataSnapshot(app_data) # Single assignment: requests in flight keep their old snapshot
+                    self.cache.clear()
+        return self.snapshot
+
+    def handle(self, path, params):
+        """(status, content_type, body) for a GET request, from the cache when possible."""
+        snapshot = self.current()
+        key = (snapshot.fingerprint, path, tuple(sorted(params.items())))
+        if path in UNCACHED_ROUTES: # Their data changes with every recorded build, not with the fingerprint
+            return UNCACHED_ROUTES[path](self, snapshot, params)
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+        route = ROUTES.get(path)
+        if route is None:
+            raise ApiError(404, f"Unknown endpoint: {path}", endpoints=sorted(list(ROUTES) + list(UNCACHED_ROUTES)))
+        response = route(self, snapshot, params)
+        self.cache.put(key, response)
+        return response
+
+
+# --- Request Parameters ---
+def resolve_brand(snapshot, params, name='brand'):
+    query = params.get(name, '').strip()
+    if not query:
+        raise ApiError(400, f"Missing '{name}' parameter")
+    brand_name = snapshot.app_data.search_index.resolve(query)
+    if brand_name is None:
+        raise ApiError(404, f"Brand '{query}' not found",
+                       suggestions=snapshot.app_data.search_index.search(query, limit=5))
+    return brand_name
+
+
+def int_param(params, name, default, minimum=0, maximum=None):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be an integer")
+    if maximum is None and value < minimum:
+        raise ApiError(400, f"'{name}' must be at least {minimum}")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ApiError(400, f"'{name}' must be between {minimum} and {maximum}")
+    return value
+
+
+def parse_weights(params):
+    """'hype:0.5,quality:0.5' -> normalised weights (unlisted components keep their default), or None."""
+    text = params.get('weights', '').strip()
+    if not text:
+        return None
+    weights = dict(WEIGHTS)
+    for item in text.split(','):
+        key, _, value = item.partition(':')
+        key = key.strip()
+        if key not in weights:
+            raise ApiError(400, f"Unknown weight '{key}'", components=list(WEIGHTS))
+        try:
+            weight = float(value)
+        except ValueError:
+            raise ApiError(400, f"Weight '{key}' must be a number")
+        if not math.isfinite(weight):
+            raise ApiError(400, f"Weight '{key}' must be a finite number")
+        weights[key] = max(0.0, weight)
+    if not math.isfinite(sum(weights.values())):
+        raise ApiError(400, "Weights are too large")
+    return scoring_engine.normalized_weights(weights)
+
+
+def weighted_scores(snapshot, params):
+    """Scores under the request's weights (one matrix-vector product), or None for the defaults."""
+    weights = parse_weights(params)
+    if weights is None:
+        return None
+    return scoring_engine.score_matrix(snapshot.app_data.scoring.norms, weights)
+
+
+def plain(value):
+    """NumPy scalars -> Python values, NaN -> None (JSON has no NaN)."""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def json_response(payload, status=200):
+    return status, 'application/json; charset=utf-8', json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+# --- Endpoints ---
+def get_health(service, snapshot, params):
+    return json_response({
+        'status': 'ok', 'brands': len(snapshot.row_of), 'loaded_at': snapshot.loaded_at,
+        'cache': {'entries': len(service.cache), 'hits': service.cache.hits, 'misses': service.cache.misses},
+    })
+
+
+def get_brands(service, snapshot, params):
+    limit = int_param(params, 'limit', 20, minimum=1, maximum=MAX_LEADERBOARD_ROWS)
+    return json_response({'brands': snapshot.app_data.search_index.search(params.get('q', ''), limit)})
+
+
+def get_report(service, snapshot, params):
+    brand_name = resolve_brand(snapshot, params)
+    brand_data = snapshot.brand_row(brand_name, weighted_scores(snapshot, params))
+    score = plain(brand_data['suitability_score'])
+    return json_response({
+        'brand_name': brand_name,
+        'suitability_score': score,
+        'recommendation': generate_recommendation(score),
+        'metrics': {column: plain(brand_data[column]) for column in SORT_KEYS},
+        'report': report_builder.build_report_text(brand_data),
+    })
+
+
+def get_leaderboard(service, snapshot, params):
+    sort_key = params.get('sort', 'suitability_score')
+    if sort_key not in SORT_KEYS:
+        raise ApiError(400, f"Unknown sort column '{sort_key}'", columns=SORT_KEYS)
+    descending = params.get('order', 'desc') != 'asc'
+    offset = int_param(params, 'offset', 0)
+    limit = int_param(params, 'limit', 50, minimum=1, maximum=MAX_LEADERBOARD_ROWS)
+    scores = weighted_scores(snapshot, params)
+    model = snapshot.leaderboard
+    with snapshot.leaderboard_lock:
+        if scores is not None:
+            model.set_column('suitability_score', scores)
+        try:
+            model.set_sort(sort_key, descending)
+            model.set_filter(params.get('filter', ''))
+            total = len(model)
+            rows = model.rows(offset, limit)
+        finally:
+            if scores is not None:
+                model.set_column('suitability_score', snapshot.app_data.scoring.scores)
+    return json_response({
+        'total': total, 'offset': offset, 'sort': sort_key, 'order': 'desc' if descending else 'asc',
+        'rows': [dict(position=position, brand_name=brand_name, **{key: plain(value) for key, value in values.items()})
+                 for position, brand_name, values in rows],
+    })
+
+
+def get_products(service, snapshot, params):
+    brand_name = resolve_brand(snapshot, params)
+    page_size = int_param(params, 'page_size', report_builder.PRODUCTS_PAGE_SIZE, minimum=1, maximum=MAX_PRODUCTS_PAGE_SIZE)
+    page = int_param(params, 'page', 0)
+    product_index = snapshot.app_data.product_index
+    df_page = product_index.page(brand_name, page, page_size)
+    products = [{column: plain(value) for column, value in product.items()}
+                for product in df_page[['product_name', 'price', 'avg_rating', 'num_reviews', 'url']].to_dict('records')]
+    return json_response({
+        'brand_name': brand_name, 'page': page, 'page_size': page_size,
+        'num_pages': product_index.num_pages(brand_name, page_size),
+        'total': product_index.count(brand_name), 'products': products,
+    })
+
+
+def get_similar(service, snapshot, params):
+    brand_name = resolve_brand(snapshot, params)
+    k = int_param(params, 'k', 5, minimum=1, maximum=MAX_SIMILAR)
+    index = snapshot.similarity_index
+    category = params.get('category') or None
+    if category is None and params.get('same_category') in ('1', 'true'):
+        category = snapshot.app_data.categories.get(brand_name)
+    similar = index.similar(brand_name, k, category)
+    return json_response({
+        'brand_name': brand_name, 'category': category,
+        'similar': [{'brand_name': other, 'distance': round(distance, 3), 'similarity': round(similarity, 1)}
+                    for other, distance, similarity in similar],
+    })
+
+
+def get_radar_png(service, snapshot, params):
+    brand_names = [resolve_brand(snapshot, params)]
+    for query in filter(None, (name.strip() for name in params.get('compare', '').split(','))):
+        brand_name = resolve_brand(snapshot, {'brand': query})
+        if brand_name not in brand_names:
+            brand_names.append(brand_name)
+    rows = [snapshot.brand_row(brand_name) for brand_name in brand_names[:MAX_RADAR_BRANDS]]
+    buffer = io.BytesIO()
+    with service._radar_lock:
+        service.radar_chart.show(rows, snapshot.avg_metrics)
+        service.radar_chart.figure.savefig(buffer, format='png', dpi=100)
+    return 200, 'image/png', buffer.getvalue()
+
+
+def get_history(service, snapshot, params):
+    brand_name = resolve_brand(snapshot, params)
+    column = params.get('column', 'suitability_score')
+    if column not in score_history.HISTORY_COLUMNS:
+        raise ApiError(400, f"Unknown history column '{column}'", columns=score_history.HISTORY_COLUMNS)
+    try:
+        series = score_history.default_history().brand_series(brand_name, column, params.get('start'), params.get('end'))
+    except ValueError as e: # Unparseable start/end
+        raise ApiError(400, str(e))
+    return json_response({
+        'brand_name': brand_name, 'column': column,
+        'points': [{'built_at': when.isoformat(), 'value': plain(value)} for when, value in series.items()],
+    })
+
+
+def get_history_leaderboard(service, snapshot, params):
+    limit = int_param(params, 'limit', 50, minimum=1, maximum=MAX_LEADERBOARD_ROWS)
+    try:
+        df = score_history.default_history().leaderboard_as_of(params.get('as_of') or None)
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    if df.empty:
+        raise ApiError(404, "No recorded build at or before that time")
+    rows = df.head(limit).to_dict('records')
+    return json_response({
+        'build_id': df.attrs.get('build_id'), 'total': len(df),
+        'rows': [dict(position=i, **{key: plain(value) for key, value in row.items()}) for i, row in enumerate(rows, start=1)],
+    })
+
+
+ROUTES = {
+    '/health': get_health,
+    '/brands': get_brands,
+    '/report': get_report,
+    '/leaderboard': get_leaderboard,
+    '/products': get_products,
+    '/similar': get_similar,
+    '/radar.png': get_radar_png,
+}
+UNCACHED_ROUTES = {
+    '/history': get_history,
+    '/history/leaderboard': get_history_leaderboard,
+}
+
+
+# --- HTTP Server ---
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # Keep-alive: clients reuse one connection for many queries
+    server_version = 'KSAScoringAPI/1.0'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        try:
+            if url.path == '/health':
+                status, content_type, body = get_health(self.server.service, self.server.service.current(), params)
+            else:
+                status, content_type, body = self.server.service.handle(url.path, params)
+        except ApiError as e:
+            status, content_type, body = json_response(dict(error=str(e), **e.details), e.status)
+        except Exception as e:
+            print(f"   Error handling {self.path}: {e}")
+            status, content_type, body = json_response({'error': 'Internal server error'}, 500)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    """One thread per connection; a deep accept backlog so bursts of clients are not refused and retried."""
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    server = ScoringHTTPServer((host, port), ScoringRequestHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+# --- MAIN EXECUTION ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve brand reports and scores over HTTP.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE)
+    parser.add_argument('--csv', default=data_loader.DATA_CSV_PATH)
+    parser.add_argument('--db', default=data_loader.PRODUCTS_DB_PATH)
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    print("Loading and processing data, please wait...")
+    try:
+        service = ScoringService(args.csv, args.db, args.cache_size)
+    except (FileNotFoundError, data_loader.DataLoadError) as e:
+        print(f"ERROR: {e}\nPlease run the notebook/scrapers first.")
+        return 1
+
+    server = make_server(service, args.host, args.port, args.verbose)
+    print(f"--- Serving on http://{args.host}:{server.server_port} (Ctrl+C to stop) ---")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n--- Stopping ---")
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""Vectorised brand scoring shared by the consultant tool and the batch jobs.
+
+The normalised component metrics are held as one (brands x components) NumPy
+matrix, percentile ranks come from a single rankdata() per component, and the
+suitability score is one matrix-vector product against the weight vector.
+
+In category mode every brand is min-max scaled and ranked against the brands of
+its own category only (brands.category, see data_loader.load_categories), so a
+food brand's hype is not measured against the football clubs. The per-category
+bounds and ranks come from grouped transforms over the whole matrix at once.
+A category with fewer than MIN_CATEGORY_SIZE brands says nothing about its
+brands (one brand is always 50 and the top rank), so they are scored against
+all brands instead and the report says so.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+
+# --- Scoring Weights ---
+from scoring_weights import WEIGHTS # Kept in a dependency-free module so the GUI can build its sliders before numpy/pandas load
+MOMENTUM_RANGE = (-1.0, 3.0) # WoW change is clipped to -100%..+300% before normalizing
+MAX_SATURATION_LIMIT = 25
+SCORING_MODES = ('universe', 'category') # Normalise/rank against every brand, or within each brand's category
+UNCATEGORISED = "Other" # Category-mode group of the brands without a category
+MIN_CATEGORY_SIZE = 5 # Smaller categories are not compared within: their brands keep universe bounds and ranks
+UNIVERSE_GROUP = f"All brands (category has fewer than {MIN_CATEGORY_SIZE} brands)" # Their scoring_group
+
+# (weight key, raw metric column, normalised column, percentile rank column)
+COMPONENTS = [
+    ('hype', 'tweet_volume', 'norm_tweet_volume', 'rank_hype'),
+    ('sentiment', 'avg_tweet_sentiment', 'norm_avg_tweet_sentiment', 'rank_sentiment'),
+    ('quality', 'avg_perceived_quality', 'norm_avg_perceived_quality', 'rank_quality'),
+    ('popularity', 'avg_num_reviews', 'norm_popularity', 'rank_popularity'),
+    ('saturation', 'market_saturation', 'norm_market_saturation', 'rank_saturation'),
+    ('momentum', 'wow_momentum', 'norm_hype_momentum', 'rank_momentum'),
+    ('trend', 'trend_slope', 'norm_trend_slope', 'rank_trend'),
+]
+COMPONENT_KEYS = [key for key, _, _, _ in COMPONENTS]
+NORM_COLUMNS = [norm_col for _, _, norm_col, _ in COMPONENTS]
+RANK_COLUMNS = [rank_col for _, _, _, rank_col in COMPONENTS]
+
+
+# --- Normalization and Recommendation ---
+def normalize(series, higher_is_better=True, min_possible=None, max_possible=None):
+    min_val = series.min() if min_possible is None else min_possible
+    max_val = series.max() if max_possible is None else max_possible
+    if min_possible is not None or max_possible is not None:
+        series = series.clip(lower=min_possible, upper=max_possible)
+        min_val = series.min(); max_val = series.max()
+    if max_val == min_val: return pd.Series([50] * len(series), index=series.index)
+    if higher_is_better: norm = ((series - min_val) / (max_val - min_val)) * 100
+    else: norm = ((max_val - series) / (max_val - min_val)) * 100
+    return norm.fillna(50)
+
+def generate_recommendation(score):
+    if score >= 75: return "HIGH POTENTIAL"
+    elif score >= 50: return "MODERATE POTENTIAL"
+    elif score >= 25: return "LOW POTENTIAL"
+    else: return "VERY LOW POTENTIAL"
+
+def percentile_ranks(values):
+    """Same result as percentileofscore(values, v, kind='rank') for every v, in O(n log n)."""
+    from scipy.stats import rankdata # Imported on first use: scipy.stats is slow to import and snapshot loads never rank
+
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return values
+    return rankdata(values, method='average') * 100.0 / values.size
+
+def weight_vector(weights):
+    """WEIGHTS dict -> vector in COMPONENTS order (missing keys count as 0)."""
+    return np.array([weights.get(key, 0.0) for key in COMPONENT_KEYS], dtype=float)
+
+def normalized_weights(weights):
+    """Rescales weights to sum to 1 so the score stays on 0-100 (all-zero weights are returned as-is)."""
+    total = sum(weights.values())
+    if total <= 0:
+        return dict(weights)
+    return {key: value / total for key, value in weights.items()}
+
+def ensure_metric_columns(df_metrics):
+    """Optional inputs (velocity metrics) default to 0 when the source data does not have them."""
+    df_metrics = df_metrics.copy()
+    for _, metric_col, _, _ in COMPONENTS:
+        if metric_col not in df_metrics.columns:
+            df_metrics[metric_col] = 0.0
+    return df_metrics
+
+
+# --- Component Matrices ---
+# What each component min-max scales, by weight key: the raw metric clipped to its possible range or log-scaled
+INPUT_TRANSFORMS = {
+    'hype': lambda values: values,
+    'sentiment': lambda values: np.clip(values, -1.0, 1.0),
+    'quality': lambda values: np.clip(values, 0.0, 5.0),
+    'popularity': np.log1p,
+    'saturation': lambda values: np.minimum(values, MAX_SATURATION_LIMIT),
+    'momentum': lambda values: np.clip(values, *MOMENTUM_RANGE),
+    'trend': lambda values: values,
+}
+HIGHER_IS_BETTER = np.array([key != 'saturation' for key in COMPONENT_KEYS]) # Fewer products = less saturated = better
+
+def brand_groups(brand_names, categories, min_size=MIN_CATEGORY_SIZE):
+    """Category of every brand (UNCATEGORISED for brands without one), in brand_names order.
+    Brands of categories with fewer than `min_size` brands get UNIVERSE_GROUP instead."""
+    groups = np.array([categories.get(brand_name) or UNCATEGORISED for brand_name in brand_names], dtype=object)
+    sizes = pd.Series(groups).value_counts()
+    groups[np.isin(groups, sizes.index[sizes < min_size])] = UNIVERSE_GROUP
+    return groups
+
+def input_matrix(df_metrics):
+    """(brands x components) matrix of the transformed metrics that are min-max scaled."""
+    return np.column_stack([INPUT_TRANSFORMS[key](df_metrics[metric_col].to_numpy(dtype=float))
+                            for key, metric_col, _, _ in COMPONENTS])
+
+def bounds_matrices(inputs, groups=None):
+    """(low, high) matrices shaped like `inputs`: each column's min/max over all brands,
+    or over each brand's group (one grouped transform for every column at once)."""
+    if groups is None:
+        with np.errstate(all='ignore'):
+            low, high = np.nanmin(inputs, axis=0), np.nanmax(inputs, axis=0)
+        return np.broadcast_to(low, inputs.shape), np.broadcast_to(high, inputs.shape)
+    grouped = pd.DataFrame(inputs).groupby(groups, sort=False)
+    low = grouped.transform('min').to_numpy(dtype=float, copy=True)
+    high = grouped.transform('max').to_numpy(dtype=float, copy=True)
+    fallback = groups == UNIVERSE_GROUP
+    if fallback.any():
+        with np.errstate(all='ignore'):
+            low[fallback], high[fallback] = np.nanmin(inputs, axis=0), np.nanmax(inputs, axis=0)
+    return low, high
+
+def scale_matrix(inputs, low, high):
+    """0-100 component scores from the inputs and their bounds (same rules as normalize():
+    a constant column/group scores 50, and so does a missing value)."""
+    span = high - low
+    with np.errstate(invalid='ignore', divide='ignore'):
+        norms = np.where(HIGHER_IS_BETTER, inputs - low, high - inputs) / span * 100
+    norms = np.where(span == 0, 50.0, norms)
+    return np.where(np.isnan(norms), 50.0, norms)
+
+def normalized_matrix(df_metrics, groups=None):
+    """(brands x components) matrix of 0-100 component scores (min-max scaled within `groups` if given)."""
+    inputs = input_matrix(df_metrics)
+    return scale_matrix(inputs, *bounds_matrices(inputs, groups))
+
+def universe_ranks(df_metrics):
+    """(brands x components) percentile ranks among all brands, before the saturation inversion."""
+    return np.column_stack([percentile_ranks(df_metrics[metric_col]) for _, metric_col, _, _ in COMPONENTS])
+
+def rank_matrix(df_metrics, groups=None):
+    """(brands x components) matrix of percentile ranks, within `groups` if given (UNIVERSE_GROUP brands
+    are ranked among all brands; saturation is inverted: fewer products = better)."""
+    if groups is None:
+        ranks = universe_ranks(df_metrics)
+    else:
+        metric_cols = [metric_col for _, metric_col, _, _ in COMPONENTS]
+        values = df_metrics[metric_cols].astype(float).reset_index(drop=True)
+        ranks = values.groupby(groups, sort=False).rank(method='average', pct=True).to_numpy(dtype=float) * 100
+        fallback = groups == UNIVERSE_GROUP
+        if fallback.any():
+            ranks[fallback] = universe_ranks(df_metrics)[fallback]
+    saturation = COMPONENT_KEYS.index('saturation')
+    ranks[:, saturation] = 100 - ranks[:, saturation]
+    return ranks
+
+def score_matrix(norms, weights):
+    """Suitability score for every row of the normalised matrix: one matrix-vector product."""
+    return np.round(norms @ weight_vector(weights), 1)
+
+
+# --- Engine ---
+class ScoringEngine:
+    """Holds the normalised metrics and ranks for a brand universe; re-scores without recomputing them.
+    With `categories` ({brand: category}) every brand is normalised and ranked within its category."""
+
+    def __init__(self, df_metrics, weights=WEIGHTS, categories=None):
+        df_metrics = ensure_metric_columns(df_metrics)
+        self.brand_names = df_metrics['brand_name'].to_numpy()
+        self.mode = 'universe' if categories is None else 'category'
+        self.groups = None if categories is None else brand_groups(self.brand_names, categories)
+        inputs = input_matrix(df_metrics)
+        self.low, self.high = bounds_matrices(inputs, self.groups) # Kept for re-normalising resampled metrics
+        self.norms = scale_matrix(inputs, self.low, self.high)
+        self.ranks = rank_matrix(df_metrics, self.groups)
+        self.weights = dict(weights)
+        self.scores = score_matrix(self.norms, self.weights)
+
+    def rescore(self, weights):
+        """New weights -> new scores for every brand (norms and ranks are reused)."""
+        self.weights = dict(weights)
+        self.scores = score_matrix(self.norms, self.weights)
+        return self.scores
+
+    def reweighted(self, weights):
+        """Copy scored with new weights, leaving this engine as it is (the norm and rank matrices are shared)."""
+        engine = copy.copy(self)
+        engine.rescore(weights)
+        return engine
+
+    def attach(self, df_metrics):
+        """Returns df_metrics with the norm_*, rank_* and suitability_score columns filled in."""
+        df_metrics = ensure_metric_columns(df_metrics)
+        df_metrics['saturation_capped'] = df_metrics['market_saturation'].clip(upper=MAX_SATURATION_LIMIT)
+        df_metrics[NORM_COLUMNS] = self.norms
+        df_metrics[RANK_COLUMNS] = self.ranks
+        df_metrics['suitability_score'] = self.scores
+        if self.groups is None:
+            df_metrics = df_metrics.drop(columns=['scoring_group'], errors='ignore')
+        else:
+            df_metrics['scoring_group'] = self.groups # The brands each row was scored against
+        return df_metrics
+
+
+def score_frame(df_metrics, weights=WEIGHTS, categories=None):
+    """One-call scoring for batch jobs: metrics frame in, scored frame out."""
+    return ScoringEngine(df_metrics, weights, categories).attach(df_metrics)
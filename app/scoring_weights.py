@@ -0,0 +1,9 @@
+"""Default scoring weights (no third-party imports, so the GUI can read them at launch)."""
+
+# 'momentum' (week-over-week tweet growth) and 'trend' (Google Trends slope) are time-windowed
+# hype inputs from analytics/hype_velocity.py. They start at 0 so existing scores are unchanged.
+WEIGHTS = {
+    'hype': 0.30, 'sentiment': 0.20, 'quality': 0.25,
+    'popularity': 0.15, 'saturation': 0.10,
+    'momentum': 0.0, 'trend': 0.0
+}
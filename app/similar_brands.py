@@ -0,0 +1,71 @@
+"""Nearest-neighbour "similar brands" lookup over the normalised component scores.
+
+Each brand is a point in the 0-100 space of scoring_engine.NORM_COLUMNS. A
+cKDTree over all brands answers k-nearest queries in tens of microseconds even
+for 100k brands; category filtering uses one extra tree per category, built on
+first use.
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+
+from scoring_engine import NORM_COLUMNS
+
+DEFAULT_K = 5
+
+
+class SimilarityIndex:
+    """k-nearest brands by Euclidean distance between normalised metric vectors."""
+
+    def __init__(self, brand_names, vectors, categories=None):
+        self.brand_names = np.asarray(brand_names, dtype=object)
+        self.vectors = np.asarray(vectors, dtype=float)
+        self.categories = categories or {}
+        self.row_of = {brand_name: i for i, brand_name in enumerate(self.brand_names)}
+        self.tree = cKDTree(self.vectors)
+        self._category_trees = {} # category -> (row indices, cKDTree)
+        # Largest possible distance in the 0-100 cube, for a 0-100% similarity
+        self.max_distance = 100.0 * np.sqrt(self.vectors.shape[1]) if self.vectors.ndim == 2 else 100.0
+
+    @classmethod
+    def from_scoring(cls, scoring, categories=None):
+        """Index over a ScoringEngine's norm matrix (same rows as the scored metrics frame)."""
+        return cls(scoring.brand_names, scoring.norms, categories)
+
+    @classmethod
+    def from_metrics(cls, df_metrics, categories=None):
+        return cls(df_metrics['brand_name'], df_metrics[NORM_COLUMNS].to_numpy(dtype=float), categories)
+
+    def __len__(self):
+        return len(self.brand_names)
+
+    def _category_tree(self, category):
+        if category not in self._category_trees:
+            rows = np.array([self.row_of[b] for b, c in self.categories.items() if c == category and b in self.row_of], dtype=int)
+            self._category_trees[category] = (rows, cKDTree(self.vectors[rows]) if len(rows) else None)
+        return self._category_trees[category]
+
+    def similar(self, brand_name, k=DEFAULT_K, category=None):
+        """[(brand_name, distance, similarity %), ...] for the k brands nearest to `brand_name`
+        (itself excluded), optionally only those in `category`. Raises KeyError for unknown brands."""
+        row = self.row_of[brand_name]
+        if category is None:
+            rows, tree = None, self.tree
+        else:
+            rows, tree = self._category_tree(category)
+            if tree is None:
+                return []
+        n = tree.n
+        distances, indices = tree.query(self.vectors[row], k=min(k + 1, n)) # +1: the brand finds itself
+        distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+        results = []
+        for distance, idx in zip(distances, indices):
+            other = int(idx) if rows is None else int(rows[idx])
+            if other == row:
+                continue
+            similarity = max(0.0, 100.0 * (1.0 - float(distance) / self.max_distance))
+            results.append((self.brand_names[other], float(distance), similarity))
+        return results[:k]
+
+    def same_category(self, brand_name, k=DEFAULT_K):
+        """Nearest brands sharing `brand_name`'s category (all brands if it has none)."""
+        return self.similar(brand_name, k, self.categories.get(brand_name))
@@ -0,0 +1,196 @@
+"""Monte-Carlo sensitivity of scores, ranks and recommendation bands to the scoring weights.
+
+Weight vectors are drawn from a Dirichlet distribution centred on the current
+weights (alpha = concentration * weights), so every sample sums to 1 like the
+normalised slider weights. All samples are scored in one (brands x components)
+@ (components x samples) matrix product, processed in chunks to bound memory,
+and ranked by counting rather than sorting. Rank percentiles are read from
+per-brand rank histograms, so no (brands x samples) matrix is ever kept.
+
+Also runs headless: python app/weight_sensitivity.py --samples 5000 --brand "Al-Hilal"
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from scoring_engine import normalized_weights, weight_vector
+
+N_SAMPLES = 2000
+CONCENTRATION = 50.0 # Higher = samples stay closer to the current weights
+MIN_ALPHA = 0.05 # Zero-weight components still get sampled, with small weights
+CHUNK_CELLS = 20_000_000 # brands x samples per chunk (~160 MB of float64 scores), and brands x rank-histogram bins
+BAND_EDGES = [25, 50, 75] # generate_recommendation's thresholds
+SCORE_STEPS = 1000 # Scores are rounded to 0.1 on 0-100
+BAND_LABELS = ["VERY LOW POTENTIAL", "LOW POTENTIAL", "MODERATE POTENTIAL", "HIGH POTENTIAL"]
+
+
+def sample_weights(weights, n_samples=N_SAMPLES, concentration=CONCENTRATION, seed=None):
+    """(components x n_samples) matrix of weight vectors, each summing to 1."""
+    centre = weight_vector(normalized_weights(weights))
+    alpha = np.maximum(centre * concentration, MIN_ALPHA)
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(alpha, size=n_samples).T
+
+
+class SensitivityResult:
+    """Per-brand summaries over all weight samples (arrays aligned with `brand_names`)."""
+
+    def __init__(self, brand_names, base_scores, score_mean, score_std, rank_mean, rank_p05, rank_p95,
+                 band_probs, rank_counts, n_samples):
+        self.brand_names = brand_names
+        self.base_scores = base_scores
+        self.score_mean = score_mean
+        self.score_std = score_std
+        self.rank_mean = rank_mean
+        self.rank_p05 = rank_p05
+        self.rank_p95 = rank_p95
+        self.band_probs = band_probs # (brands x bands), BAND_LABELS order
+        self.rank_counts = rank_counts # {brand index: counts of ranks 1..len(brands)} for the tracked brands
+        self.n_samples = n_samples
+
+    def summary_rows(self, top=None):
+        """[(brand, base score, mean, std, mean rank, p05 rank, p95 rank, band probabilities), ...] by mean rank."""
+        order = np.argsort(self.rank_mean, kind='stable')[:top]
+        return [(self.brand_names[i], self.base_scores[i], self.score_mean[i], self.score_std[i], self.rank_mean[i],
+                 self.rank_p05[i], self.rank_p95[i], dict(zip(BAND_LABELS, self.band_probs[i])))
+                for i in order]
+
+    def rank_distribution(self, brand_index):
+        """{rank: probability} for a tracked brand."""
+        counts = self.rank_counts[brand_index]
+        return {rank + 1: count / self.n_samples for rank, count in enumerate(counts) if count}
+
+
+def rank_histogram_bins(n_brands):
+    """(bins, ranks per bin) for the per-brand rank histograms, sized to stay within CHUNK_CELLS cells:
+    one bin per rank up to ~4,400 brands, wider bins (coarser percentiles) beyond that."""
+    bins = max(1, min(n_brands, CHUNK_CELLS // max(n_brands, 1)))
+    return bins, -(-n_brands // bins)
+
+
+def histogram_percentiles(hist, width, q, n_samples):
+    """Per-row q-th percentiles (0-100) of the ranks counted in `hist` (rows x bins), interpolated
+    between order statistics like np.percentile. A bin stands for its middle rank when `width` > 1."""
+    cum = hist.cumsum(axis=1, dtype=np.int32)
+    position = q / 100 * (n_samples - 1)
+    lower, upper = (1 + (cum <= k).sum(axis=1) * width + (width - 1) / 2
+                    for k in (np.floor(position), np.ceil(position)))
+    return lower + (upper - lower) * (position - np.floor(position))
+
+
+def run_sensitivity(norms, brand_names, weights, n_samples=N_SAMPLES, concentration=CONCENTRATION,
+                    seed=None, track=None):
+    """Scores every brand under `n_samples` Dirichlet weight draws around `weights`.
+    `track` is an optional list of brand indices whose full rank histogram is kept.
+
+    Scores are rounded to 0.1 like the app's, i.e. one of 1001 integer levels, so ranks come
+    from a per-sample histogram of levels (linear time, no sort): rank = 1 + brands scoring
+    strictly higher, so tied brands share a rank."""
+    norms = np.asarray(norms, dtype=float)
+    n_brands = norms.shape[0]
+    samples = sample_weights(weights, n_samples, concentration, seed)
+    base_scores = np.round(norms @ weight_vector(normalized_weights(weights)), 1)
+    band_edges = np.array(BAND_EDGES) * SCORE_STEPS // 100
+
+    score_sum = np.zeros(n_brands); score_sq = np.zeros(n_brands)
+    rank_sum = np.zeros(n_brands)
+    band_counts = np.zeros((n_brands, len(BAND_LABELS)), dtype=np.int64)
+    track = list(track or [])
+    rank_counts = {i: np.zeros(n_brands, dtype=np.int64) for i in track}
+    hist_bins, hist_width = rank_histogram_bins(n_brands)
+    rank_hist = np.zeros((n_brands, hist_bins), dtype=np.int32) # Per-brand rank histograms for the percentiles
+    norms32 = norms.astype(np.float32)
+    chunk = max(1, CHUNK_CELLS // max(n_brands, 1))
+    for start in range(0, n_samples, chunk):
+        # (brands x chunk) scores as integer levels 0..1000 (score * 10)
+        levels = np.rint(norms32 @ samples[:, start:start + chunk].astype(np.float32) * (SCORE_STEPS / 100))
+        levels = np.clip(levels, 0, SCORE_STEPS).astype(np.int32)
+        n_chunk = levels.shape[1]
+        scores = levels / (SCORE_STEPS / 100)
+        score_sum += scores.sum(axis=1); score_sq += (scores ** 2).sum(axis=1)
+
+        cells = levels + np.arange(n_chunk, dtype=np.int32) * (SCORE_STEPS + 1) # One level block per sample
+        counts = np.bincount(cells.ravel(), minlength=n_chunk * (SCORE_STEPS + 1)).reshape(n_chunk, SCORE_STEPS + 1)
+        higher = counts[:, ::-1].cumsum(axis=1)[:, ::-1] - counts # Brands strictly above each level
+        ranks = (1 + higher.ravel()[cells]).astype(np.int32)
+        rank_sum += ranks.sum(axis=1)
+        rank_hist += np.bincount(((ranks - 1) // hist_width + np.arange(n_brands)[:, None] * hist_bins).ravel(),
+                                 minlength=n_brands * hist_bins).reshape(n_brands, hist_bins).astype(np.int32)
+
+        bands = np.searchsorted(band_edges, levels, side='right') # Same cut-offs as generate_recommendation
+        band_counts += np.bincount((bands + np.arange(n_brands)[:, None] * len(BAND_LABELS)).ravel(),
+                                   minlength=n_brands * len(BAND_LABELS)).reshape(n_brands, len(BAND_LABELS))
+        for i in track:
+            rank_counts[i] += np.bincount(ranks[i] - 1, minlength=n_brands)
+
+    score_mean = score_sum / n_samples
+    score_std = np.sqrt(np.maximum(score_sq / n_samples - score_mean ** 2, 0.0))
+    rank_p05, rank_p95 = (histogram_percentiles(rank_hist, hist_width, q, n_samples) for q in (5, 95))
+    return SensitivityResult(np.asarray(brand_names, dtype=object), base_scores, score_mean, score_std,
+                             rank_sum / n_samples, rank_p05, rank_p95, band_counts / n_samples, rank_counts, n_samples)
+
+
+def format_sensitivity_report(result, top=15):
+    """Text table for the consultant tool's sensitivity window."""
+    lines = [f"Weight sensitivity: {result.n_samples:,} Dirichlet samples around the current weights",
+             "-" * 92,
+             f"{'Brand':<24} {'Score':>5} {'Mean':>5} {'SD':>4} {'Rank':>5} {'90% range':>10}   P(High) P(Mod) P(Low) P(VLow)",
+             "-" * 92]
+    for brand, base, mean, std, rank, p05, p95, bands in result.summary_rows(top):
+        lines.append(f"{str(brand)[:24]:<24} {base:>5.1f} {mean:>5.1f} {std:>4.1f} {rank:>5.1f} {f'{p05:.0f}-{p95:.0f}':>10}   "
+                     f"{bands['HIGH POTENTIAL']:>7.0%} {bands['MODERATE POTENTIAL']:>6.0%} "
+                     f"{bands['LOW POTENTIAL']:>6.0%} {bands['VERY LOW POTENTIAL']:>7.0%}")
+    return "\n".join(lines)
+
+
+def format_brand_sensitivity(result, brand_index, top_ranks=5):
+    """Rank distribution and band probabilities for one (tracked) brand."""
+    name = result.brand_names[brand_index]
+    lines = [f"{name}: score {result.base_scores[brand_index]:.1f} "
+             f"(mean {result.score_mean[brand_index]:.1f} +/- {result.score_std[brand_index]:.1f}), "
+             f"rank {result.rank_mean[brand_index]:.1f} on average, "
+             f"{result.rank_p05[brand_index]:.0f}-{result.rank_p95[brand_index]:.0f} in 90% of samples"]
+    lines.append("  Bands: " + ", ".join(f"{label.title()} {prob:.0%}"
+                                         for label, prob in zip(BAND_LABELS[::-1], result.band_probs[brand_index][::-1])))
+    if brand_index in result.rank_counts:
+        likely = sorted(result.rank_distribution(brand_index).items(), key=lambda item: -item[1])[:top_ranks]
+        lines.append("  Most likely ranks: " + ", ".join(f"#{rank} ({prob:.1%})" for rank, prob in likely))
+    return "\n".join(lines)
+
+
+# --- MAIN EXECUTION ---
+def main(argv=None):
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..')) # Project root, for the shared 'analytics' package
+    import data_loader
+    import score_snapshot
+    from scoring_engine import WEIGHTS
+
+    parser = argparse.ArgumentParser(description="Monte-Carlo sensitivity of brand scores to the weights.")
+    parser.add_argument('--samples', type=int, default=N_SAMPLES)
+    parser.add_argument('--concentration', type=float, default=CONCENTRATION)
+    parser.add_argument('--brand', help="Brand name or alias to show the rank distribution for")
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--csv', default=data_loader.DATA_CSV_PATH)
+    parser.add_argument('--db', default=data_loader.PRODUCTS_DB_PATH)
+    args = parser.parse_args(argv)
+
+    app_data = score_snapshot.load_app_data(args.csv, args.db, WEIGHTS)
+    engine = app_data.scoring
+    track = []
+    if args.brand:
+        brand_name = app_data.search_index.resolve(args.brand)
+        if brand_name is None:
+            print(f"Unknown brand '{args.brand}'.")
+            return 1
+        track = [list(engine.brand_names).index(brand_name)]
+    result = run_sensitivity(engine.norms, engine.brand_names, WEIGHTS, args.samples, args.concentration, args.seed, track)
+    if track:
+        print(format_brand_sensitivity(result, track[0]) + "\n")
+    print(format_sensitivity_report(result, args.top))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
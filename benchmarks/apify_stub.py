@@ -0,0 +1,423 @@
+"""Offline stand-in for the Apify API, for load testing the scrapers without spending credits.
+
+    python benchmarks/apify_stub.py --port 8765 --run-seconds 2 --failure-rate 0.05 --limit-after 40
+    APIFY_API_URL=http://127.0.0.1:8765 KSA_DB_PATH=/tmp/scrape.db KSA_TRACE=/tmp/scrape.jsonl \
+        python scraper/2_scrape_ecommerce_V2.py
+
+(create /tmp/scrape.db first with scraper/init_db.py's create_database().)
+It serves the part of the v2 API that apify_client uses in the scrapers:
+  POST /v2/acts/<actor>/runs        actor(...).start() / .call(): starts a run
+  GET  /v2/actor-runs/<id>          run(...).get() and call()'s wait, honouring waitForFinish
+  GET  /v2/actor-runs/<id>/log      the run log call() streams
+  GET  /v2/datasets/<id>            dataset(...).get() (itemCount)
+  GET  /v2/datasets/<id>/items      list_items() / iterate_items(), with offset/limit/desc and pagination headers
+  GET  /v2/acts/<actor>             actor(...).get() (404 for actors it cannot serve)
+  GET  /stub/stats                  request, run and item counters (JSON)
+A run's items are generated when it starts: from --fixtures if it has the actor,
+else synthetic tweets, products, reviews or Google Trends series built with
+synthetic_data's generators and capped by the run input (maxItems,
+maxItemsPerStartUrl, ...). Runs are seeded by their number, so the same seed and
+the same sequence of calls serve the same data. Behaviour knobs:
+  --run-seconds     how long a run takes to finish (call() blocks for it)
+  --latency         delay added to every request
+  --failure-rate    share of requests answered 500 (or --failure-status, e.g. 429);
+                    apify_client retries these with backoff (the scrapers' apify.* spans count them as retries)
+  --run-failure-rate share of runs that end FAILED
+  --limit-after N   runs started before every further start fails with the
+                    "usage hard limit exceeded" error the scrapers stop on
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+import synthetic_data
+
+# --- Configuration ---
+HOST = '127.0.0.1'
+PORT = 8765
+SEED = 0
+MAX_WAIT_SECS = 60 # The real API holds a waitForFinish request for at most a minute
+NO_LIMIT = 999999999999 # X-Apify-Pagination-Limit when list_items() has no limit (as the API does)
+DEFAULT_ITEMS = 100 # Items per run when neither the run input nor --items caps them
+COST_PER_ITEM = 0.0007 # usageTotalUsd per item served (the review actor's $0.70 / 1000)
+
+TWITTER_ACTOR_ID = 'xtdata/twitter-x-scraper'
+AMAZON_ACTOR_ID = 'junglee/Amazon-crawler'
+REVIEWS_ACTOR_ID = 'web_wanderer/amazon-reviews-extractor'
+GOOGLE_TRENDS_ACTOR_ID = 'apify/google-trends-scraper'
+REVIEWS_PER_PAGE = 10 # The review actor's 'limit' counts pages of this many reviews
+
+
+# --- Synthetic Actor Output ---
+def first_term(run_input, default='Stub Brand'):
+    terms = run_input.get('searchTerms') or [default]
+    return str(terms[0]).split(' OR ')[0]
+
+
+def tweet_items(run_input, n_items, rng):
+    """xtdata/twitter-x-scraper items (the fields 1_scrape_hype_V2.py reads)."""
+    brand = first_term(run_input)
+    rows = synthetic_data.tweet_rows([brand], np.array([n_items]), rng.uniform(2.5, 4.8, size=1),
+                                     int(rng.integers(1, 10 ** 12)), rng)
+    return [{'url': f"https://x.com/{username}/status/{tweet_id}", 'id': tweet_id, 'created_at': date,
+             'author': {'screen_name': username}, 'full_text': text, 'lang': lang,
+             'reply_count': replies, 'retweet_count': retweets, 'favorite_count': likes, 'quote_count': quotes}
+            for _, tweet_id, date, username, text, lang, replies, retweets, likes, quotes in rows]
+
+
+def product_items(run_input, n_items, rng):
+    """junglee/Amazon-crawler items (the fields 2_scrape_ecommerce_V2.py reads)."""
+    urls = run_input.get('categoryOrProductUrls') or [{}]
+    query = parse_qs(urlparse(urls[0].get('url', '')).query)
+    brand = query.get('k', ['Stub Brand'])[0]
+    rows = synthetic_data.product_rows([1], [brand], np.array([n_items]), rng.uniform(2.5, 4.8, size=1),
+                                       int(rng.integers(1, 10 ** 9)), rng)
+    items = []
+    for _, _, name, price, rating, reviews, url in rows:
+        items.append({'title': name, 'asin': url.rsplit('/', 1)[-1], 'url': url,
+                      'price': None if price is None else {'value': price, 'currency': 'SAR'},
+                      'stars': rating, 'reviewsCount': reviews})
+    return items
+
+
+def review_items(run_input, n_items, rng):
+    """web_wanderer/amazon-reviews-extractor items (the fields 3_scrape_reviews_apify.py reads)."""
+    products = run_input.get('products') or [{}]
+    asin = products[0].get('asin', 'STUB')
+    rows = synthetic_data.review_rows([asin], [rng.uniform(2.5, 4.8)], rng, reviews_per_product=n_items)[:n_items]
+    return [{'asin': asin, 'rating': rating, 'reviewText': text} for _, rating, text in rows]
+
+
+def trend_items(run_input, n_items, rng):
+    """apify/google-trends-scraper items: one interestOverTime series per search term."""
+    terms = (run_input.get('searchTerms') or ['Stub Brand'])[:n_items]
+    rows = synthetic_data.trend_rows(terms, rng, trend_days=90)
+    items = {term: {'searchTerm': term, 'interestOverTime': []} for term in terms}
+    for term, day, value in rows:
+        timestamp = int(datetime.strptime(day, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+        items[term]['interestOverTime'].append({'timestamp': timestamp, 'value': [value]})
+    return list(items.values())
+
+
+# Actor -> (generator, item cap read from the run input)
+GENERATORS = {
+    TWITTER_ACTOR_ID: (tweet_items, lambda run_input: run_input.get('maxItems')),
+    AMAZON_ACTOR_ID: (product_items, lambda run_input: run_input.get('maxItemsPerStartUrl')),
+    REVIEWS_ACTOR_ID: (review_items, lambda run_input: run_input.get('limit', 1) * REVIEWS_PER_PAGE),
+    GOOGLE_TRENDS_ACTOR_ID: (trend_items, lambda run_input: len(run_input.get('searchTerms') or [])),
+}
+
+
+# --- Stub State ---
+class StubState:
+    """Runs, datasets and counters shared by the request handler threads."""
+
+    def __init__(self, run_seconds=0.0, latency=0.0, failure_rate=0.0, failure_status=500, run_failure_rate=0.0,
+                 limit_after=None, items=None, fixtures=None, cost_per_item=COST_PER_ITEM, seed=SEED):
+        self.run_seconds = run_seconds
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.run_failure_rate = run_failure_rate
+        self.limit_after = limit_after
+        self.items = items
+        self.fixtures = fixtures or {}
+        self.cost_per_item = cost_per_item
+        self.seed = seed
+        self.random = random.Random(seed) # Failure draws, in request order
+        self.lock = threading.Lock()
+        self.runs = {}
+        self.datasets = {}
+        self.stats = {'requests': 0, 'failures_injected': 0, 'runs_started': 0, 'runs_failed': 0,
+                      'limit_errors': 0, 'items_generated': 0, 'items_served': 0}
+
+    def can_serve(self, actor_id):
+        return actor_id in self.fixtures or actor_id in GENERATORS
+
+    def inject_failure(self):
+        """True if this request should fail (drawn under the lock, so the sequence is repeatable)."""
+        with self.lock:
+            self.stats['requests'] += 1
+            if self.failure_rate and self.random.random() < self.failure_rate:
+                self.stats['failures_injected'] += 1
+                return True
+        return False
+
+    def run_items(self, actor_id, run_input, run_number):
+        if actor_id in self.fixtures:
+            items = self.fixtures[actor_id]
+            return list(items if self.items is None else items[:self.items])
+        generate, input_cap = GENERATORS[actor_id]
+        caps = [int(cap) for cap in (input_cap(run_input), self.items) if cap]
+        n_items = min(caps) if caps else DEFAULT_ITEMS
+        return generate(run_input, n_items, np.random.default_rng([self.seed, run_number]))[:n_items]
+
+    def start_run(self, actor_id, run_input):
+        """Creates a run, or returns None once --limit-after runs have been started."""
+        with self.lock:
+            if self.limit_after is not None and self.stats['runs_started'] >= self.limit_after:
+                self.stats['limit_errors'] += 1
+                return None
+            self.stats['runs_started'] += 1
+            run_number = self.stats['runs_started']
+            fails = bool(self.run_failure_rate) and self.random.random() < self.run_failure_rate
+        items = [] if fails else self.run_items(actor_id, run_input, run_number)
+        run_id = uuid.uuid4().hex[:17]
+        dataset_id = uuid.uuid4().hex[:17]
+        now = time.time()
+        run = {'id': run_id, 'actId': actor_id, 'startedAt': iso_time(now), 'finishedAt': None,
+               'defaultDatasetId': dataset_id, 'defaultKeyValueStoreId': uuid.uuid4().hex[:17],
+               'usageTotalUsd': round(len(items) * self.cost_per_item, 6),
+               'stats': {'inputBodyLen': len(json.dumps(run_input))},
+               'finishes_at': now + self.run_seconds, 'final_status': 'FAILED' if fails else 'SUCCEEDED'}
+        with self.lock:
+            self.runs[run_id] = run
+            self.datasets[dataset_id] = items
+            self.stats['items_generated'] += len(items)
+            self.stats['runs_failed'] += fails
+        return self.run_data(run)
+
+    def run_data(self, run):
+        """The run as the API returns it, with the status it has now."""
+        finished = time.time() >= run['finishes_at']
+        data = {key: value for key, value in run.items() if key not in ('finishes_at', 'final_status')}
+        data['status'] = run['final_status'] if finished else 'RUNNING'
+        data['statusMessage'] = f"{data['status'].title()} (apify_stub)"
+        data['isStatusMessageTerminal'] = finished
+        if finished:
+            data['finishedAt'] = iso_time(run['finishes_at'])
+        return data
+
+    def run_log(self, run_id):
+        """The run's log text (call() streams it next to waiting for the run), or None for an unknown run."""
+        run = self.runs.get(run_id)
+        if run is None:
+            return None
+        data = self.run_data(run)
+        lines = [f"{data['startedAt']} ACTOR: Pulling stub run of {run['actId']}",
+                 f"{data['startedAt']} Serving {len(self.datasets[run['defaultDatasetId']])} items"]
+        if data['finishedAt']:
+            lines.append(f"{data['finishedAt']} Run {data['status']}")
+        return "\n".join(lines) + "\n"
+
+    def wait_for_run(self, run_id, wait_secs):
+        run = self.runs.get(run_id)
+        if run is None:
+            return None
+        remaining = run['finishes_at'] - time.time()
+        if remaining > 0 and wait_secs > 0:
+            time.sleep(min(remaining, wait_secs, MAX_WAIT_SECS))
+        return self.run_data(run)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats, runs=len(self.runs), datasets=len(self.datasets))
+
+
+def iso_time(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def load_fixtures(path):
+    """{actor_id: [items]} from a JSON file; a bare list of items is served for every actor."""
+    with open(path, encoding='utf-8') as f:
+        fixtures = json.load(f)
+    if isinstance(fixtures, list):
+        return {actor_id: fixtures for actor_id in GENERATORS}
+    return fixtures
+
+
+# --- HTTP Handler ---
+class ApifyStubHandler(BaseHTTPRequestHandler):
+    """Routes the v2 endpoints above to the server's StubState."""
+    protocol_version = 'HTTP/1.1'
+    quiet = False
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_text(self, status, text):
+        payload = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_error_json(self, status, error_type, message):
+        self.send_json(status, {'error': {'type': error_type, 'message': message}})
+
+    def read_body(self):
+        """Reads the whole request body. Every request does this before answering: the connection is
+        kept alive, so an unread body would be parsed as the start of the next request."""
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def parse_input(self, raw):
+        if self.headers.get('Content-Encoding') == 'gzip': # apify_client compresses run inputs
+            raw = gzip.decompress(raw)
+        return json.loads(raw) if raw else {}
+
+    def route(self, method):
+        body = self.read_body()
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if parts == ['stub', 'stats']:
+            return self.send_json(200, self.state.snapshot())
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        if self.state.inject_failure():
+            return self.send_error_json(self.state.failure_status, 'internal-server-error' if self.state.failure_status >= 500
+                                        else 'rate-limit-exceeded', "Injected failure (apify_stub --failure-rate)")
+        if len(parts) < 3 or parts[0] != 'v2':
+            return self.send_error_json(404, 'page-not-found', f"Unknown path {url.path}")
+        resource, resource_id, rest = parts[1], parts[2].replace('~', '/'), parts[3:]
+
+        if resource == 'acts' and rest == ['runs'] and method == 'POST':
+            return self.start_run(resource_id, params, body)
+        if resource == 'acts' and not rest and method == 'GET':
+            if not self.state.can_serve(resource_id):
+                return self.send_error_json(404, 'record-not-found', "Actor was not found")
+            return self.send_json(200, {'data': {'id': resource_id.replace('/', '~'), 'name': resource_id.split('/')[-1],
+                                                 'username': resource_id.split('/')[0]}})
+        if resource == 'actor-runs' and not rest and method == 'GET':
+            run = self.state.wait_for_run(resource_id, float(params.get('waitForFinish') or 0))
+            if run is None:
+                return self.send_error_json(404, 'record-not-found', "Actor run was not found")
+            return self.send_json(200, {'data': run})
+        if resource == 'actor-runs' and rest == ['log'] and method == 'GET':
+            log = self.state.run_log(resource_id)
+            if log is None:
+                return self.send_error_json(404, 'record-not-found', "Log was not found")
+            return self.send_text(200, log)
+        if resource == 'datasets' and method == 'GET':
+            items = self.state.datasets.get(resource_id)
+            if items is None:
+                return self.send_error_json(404, 'record-not-found', "Dataset was not found")
+            if not rest:
+                return self.send_json(200, {'data': {'id': resource_id, 'itemCount': len(items)}})
+            if rest == ['items']:
+                return self.list_items(items, params)
+        return self.send_error_json(404, 'page-not-found', f"Unsupported endpoint {method} {url.path}")
+
+    def start_run(self, actor_id, params, body):
+        if not self.state.can_serve(actor_id):
+            return self.send_error_json(404, 'record-not-found', "Actor was not found")
+        try:
+            run_input = self.parse_input(body)
+        except (ValueError, OSError) as e: # Bad JSON / bad gzip
+            return self.send_error_json(400, 'invalid-input', f"Input is not valid: {e}")
+        if not isinstance(run_input, dict):
+            return self.send_error_json(400, 'invalid-input', "Input is not valid: must be a JSON object")
+        run = self.state.start_run(actor_id, run_input)
+        if run is None:
+            return self.send_error_json(402, 'platform-feature-disabled',
+                                        "Monthly usage hard limit exceeded (apify_stub --limit-after)")
+        if params.get('waitForFinish'):
+            run = self.state.wait_for_run(run['id'], float(params['waitForFinish']))
+        return self.send_json(201, {'data': run})
+
+    def list_items(self, items, params):
+        offset = int(params.get('offset') or 0)
+        limit = int(params['limit']) if params.get('limit') else None
+        ordered = items[::-1] if params.get('desc') in ('1', 'true') else items
+        page = ordered[offset:] if limit is None else ordered[offset:offset + limit]
+        with self.state.lock:
+            self.state.stats['items_served'] += len(page)
+        # The client reads the desc header with bool(), so it is only sent when true
+        headers = {'X-Apify-Pagination-Total': len(items), 'X-Apify-Pagination-Offset': offset,
+                   'X-Apify-Pagination-Limit': NO_LIMIT if limit is None else limit,
+                   'X-Apify-Pagination-Count': len(page),
+                   'X-Apify-Pagination-Desc': 'true' if ordered is not items else ''}
+        return self.send_json(200, page, headers)
+
+    def do_GET(self):
+        self.route('GET')
+
+    def do_POST(self):
+        self.route('POST')
+
+
+def make_server(state, host=HOST, port=PORT, quiet=False):
+    """A ThreadingHTTPServer serving `state` (port 0 picks a free port; see server.server_address)."""
+    handler = type('Handler', (ApifyStubHandler,), {'quiet': quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def start_in_thread(state, host=HOST, port=0, quiet=True):
+    """Starts a stub server on a background thread. Returns (server, api_url); call server.shutdown() when done."""
+    server = make_server(state, host, port, quiet)
+    threading.Thread(target=server.serve_forever, name='apify-stub', daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+# --- MAIN EXECUTION ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Apify API (see the module docstring).")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--run-seconds', type=float, default=0.0, help="How long each actor run takes")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Share of requests that fail")
+    parser.add_argument('--failure-status', type=int, default=500, help="HTTP status of the injected failures (500, 429, ...)")
+    parser.add_argument('--run-failure-rate', type=float, default=0.0, help="Share of runs that end FAILED")
+    parser.add_argument('--limit-after', type=int, help="Runs allowed before 'usage hard limit exceeded'")
+    parser.add_argument('--items', type=int, help="Max items per run (default: the run input's cap, else 100)")
+    parser.add_argument('--fixtures', help="JSON file of {actor_id: [items]} (or one list for every actor)")
+    parser.add_argument('--cost-per-item', type=float, default=COST_PER_ITEM)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--quiet', action='store_true', help="Do not log each request")
+    args = parser.parse_args(argv)
+
+    state = StubState(run_seconds=args.run_seconds, latency=args.latency, failure_rate=args.failure_rate,
+                      failure_status=args.failure_status, run_failure_rate=args.run_failure_rate,
+                      limit_after=args.limit_after, items=args.items,
+                      fixtures=load_fixtures(args.fixtures) if args.fixtures else None,
+                      cost_per_item=args.cost_per_item, seed=args.seed)
+    server = make_server(state, args.host, args.port, args.quiet)
+    host, port = server.server_address[:2]
+    print(f"Apify stub listening on http://{host}:{port} (set APIFY_API_URL to this)")
+    print(f"   Actors: {', '.join(sorted(set(GENERATORS) | set(state.fixtures)))}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\nStub stats: {json.dumps(state.snapshot())}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""End-to-end pipeline benchmark on synthetic data.
+
+    python benchmarks/bench_pipeline.py --scale 10 [--reports 20] [--skip topics]
+
+Generates a synthetic DB (benchmarks/synthetic_data.py) in a temporary
+directory, or reuses one passed with --db, then times each stage the way
+the real pipeline runs it:
+  - ingest:    schema + scraper INSERTs of every synthetic row
+  - metrics:   per-brand SQL aggregation (analytics/brand_metrics.py)
+  - sentiment: streamed cleaning + VADER scoring, writes the metrics CSV
+               (analytics/streaming_metrics.py)
+  - hype:      tweet velocity and trend slope (analytics/hype_velocity.py)
+  - topics:    shared TF-IDF + per-brand LDA (analytics/topic_modeling.py)
+  - app load:  the consultant tool's cold data load (app/data_loader.py)
+  - scoring:   re-scoring every brand with the ScoringEngine (median of runs)
+  - reports:   headless HTML reports for the top brands (app/batch_export.py)
+
+Results are saved as JSON in benchmarks/results/ (named by time and git
+commit) and compared with the previous results file, so runs on different
+commits can be lined up. A failing stage is recorded and the rest still run.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+APP_DIR = os.path.join(PROJECT_ROOT, 'app')
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+sys.path.insert(0, APP_DIR)
+sys.path.append(PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+import batch_export
+import data_loader
+import synthetic_data
+from analytics import brand_metrics, hype_velocity, streaming_metrics, topic_modeling
+from analytics.preprocessing import clean_tweets
+from scoring_engine import WEIGHTS, ScoringEngine
+
+STAGES = ['ingest', 'metrics', 'sentiment', 'hype', 'topics', 'app load', 'scoring', 'reports']
+SCORING_RUNS = 5
+
+
+class StageSkipped(Exception):
+    """A stage cannot run in this environment (e.g. missing NLTK data); recorded, not a failure."""
+
+
+# --- Stages (each returns the number of rows it processed) ---
+def stage_ingest(ctx):
+    counts = synthetic_data.generate_database(ctx['db'], ctx['brands'], ctx['tweets_per_brand'],
+                                              ctx['products_per_brand'], ctx['reviews_per_product'],
+                                              ctx['trend_days'], ctx['seed'])
+    ctx['counts'] = counts
+    return sum(counts.values())
+
+
+def stage_metrics(ctx):
+    conn = sqlite3.connect(ctx['db'])
+    try:
+        return len(brand_metrics.fetch_brand_metrics(conn))
+    finally:
+        conn.close()
+
+
+def stage_sentiment(ctx):
+    conn = sqlite3.connect(ctx['db'])
+    try:
+        df_metrics, df_tweet_stats = streaming_metrics.stream_brand_metrics(conn, ctx['chunksize'], store_scores=True)
+    finally:
+        conn.close()
+    df_metrics.to_csv(ctx['csv'], index=False)
+    return int(df_tweet_stats['tweet_volume'].sum())
+
+
+def stage_hype(ctx):
+    conn = sqlite3.connect(ctx['db'])
+    try:
+        df_velocity = hype_velocity.compute_hype_velocity(conn)
+        hype_velocity.save_hype_velocity(conn, df_velocity)
+    finally:
+        conn.close()
+    return len(df_velocity)
+
+
+def stage_topics(ctx):
+    conn = sqlite3.connect(ctx['db'])
+    try:
+        try:
+            topic_modeling.build_stopwords([])
+        except LookupError:
+            raise StageSkipped("NLTK stopwords not downloaded (nltk.download('stopwords'))")
+        df_tweets = pd.read_sql_query("SELECT brand_name, tweet_date, tweet_content FROM tweets WHERE brand_name IS NOT NULL", conn)
+        df_tweets = clean_tweets(df_tweets)
+        topic_modeling.run_topic_stage(df_tweets, conn, n_jobs=ctx['n_jobs'])
+    finally:
+        conn.close()
+    return len(df_tweets)
+
+
+def stage_app_load(ctx):
+    ctx['app_data'] = data_loader.load_app_data(ctx['csv'], ctx['db'], WEIGHTS)
+    return len(ctx['app_data'].df_metrics) + len(ctx['app_data'].df_products)
+
+
+def stage_scoring(ctx):
+    """Median of SCORING_RUNS full re-scorings; the stage's reported time is that median."""
+    df_metrics = ctx['app_data'].df_metrics
+    times = []
+    for _ in range(SCORING_RUNS):
+        start = time.perf_counter()
+        ScoringEngine(df_metrics, WEIGHTS).attach(df_metrics)
+        times.append(time.perf_counter() - start)
+    ctx['stage_seconds'] = statistics.median(times)
+    return len(df_metrics)
+
+
+def stage_reports(ctx):
+    app_data = ctx['app_data']
+    brand_names = batch_export.select_brands(app_data, None, ctx['reports'])
+    with tempfile.TemporaryDirectory() as output_dir:
+        for job in batch_export.build_jobs(app_data, brand_names, ['html'], ctx['db']):
+            batch_export.render_brand(job, output_dir)
+    return len(brand_names)
+
+
+STAGE_FUNCTIONS = {'ingest': stage_ingest, 'metrics': stage_metrics, 'sentiment': stage_sentiment,
+                   'hype': stage_hype, 'topics': stage_topics, 'app load': stage_app_load,
+                   'scoring': stage_scoring, 'reports': stage_reports}
+
+
+def run_stage(name, ctx):
+    """{'status', 'seconds', 'rows', 'rows_per_second'} for one stage."""
+    print(f"\n=== {name} ===")
+    ctx.pop('stage_seconds', None)
+    start = time.perf_counter()
+    try:
+        rows = STAGE_FUNCTIONS[name](ctx)
+    except StageSkipped as e:
+        print(f"   SKIPPED: {e}")
+        return {'status': 'skipped', 'note': str(e)}
+    except Exception as e:
+        print(f"   FAILED: {e!r}")
+        return {'status': 'failed', 'note': repr(e)}
+    seconds = ctx.get('stage_seconds', time.perf_counter() - start)
+    return {'status': 'ok', 'seconds': round(seconds, 4), 'rows': int(rows),
+            'rows_per_second': round(rows / seconds, 1) if seconds > 0 else None}
+
+
+# --- Results ---
+def git_commit():
+    """(short hash, has uncommitted changes), or ('unknown', False) outside a git checkout."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip() != ''
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+def environment():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'numpy': np.__version__, 'pandas': pd.__version__, 'sklearn': sklearn.__version__}
+
+
+def save_results(results, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = datetime.fromisoformat(results['created_at']).strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(results_dir, f"{stamp}_{results['commit']}{'-dirty' if results['dirty'] else ''}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def previous_results(path, results_dir=RESULTS_DIR):
+    """The newest results file in `results_dir` other than `path` (names sort by time), or None."""
+    names = sorted(name for name in os.listdir(results_dir)
+                   if name.endswith('.json') and os.path.join(results_dir, name) != path)
+    return os.path.join(results_dir, names[-1]) if names else None
+
+
+def format_comparison(baseline, results):
+    """Per-stage seconds of `baseline` vs `results`, or rows/s if the runs used different data sizes.
+    Stages more than 10% slower get a '!'."""
+    same_size = baseline['config'] == results['config']
+    key, label = ('seconds', 's') if same_size else ('rows_per_second', 'rows/s')
+    lines = [f"{'Stage':<12}{f'Before ({label})':>16}{f'After ({label})':>16}{'Change':>10}"]
+    for name in STAGES:
+        before = baseline['stages'].get(name, {}).get(key)
+        after = results['stages'].get(name, {}).get(key)
+        change = '-'
+        if before and after is not None:
+            change = f"{(after - before) / before * 100:+.1f}%"
+            slower = after > before * 1.1 if same_size else after < before / 1.1
+            if slower:
+                change += ' !'
+        lines.append(f"{name:<12}{before if before is not None else '-':>16}{after if after is not None else '-':>16}{change:>10}")
+    if not same_size:
+        lines.append("NOTE: The runs used different settings, so throughput (rows/s) is compared.")
+    return "\n".join(lines)
+
+
+def format_results(results):
+    lines = [f"{'Stage':<12}{'Seconds':>10}{'Rows':>12}{'Rows/s':>14}  Status"]
+    for name in STAGES:
+        stage = results['stages'].get(name)
+        if stage is None:
+            continue
+        if stage['status'] == 'ok':
+            rate = stage['rows_per_second']
+            lines.append(f"{name:<12}{stage['seconds']:>10.3f}{stage['rows']:>12}{rate if rate is not None else '-':>14}  ok")
+        else:
+            lines.append(f"{name:<12}{'-':>10}{'-':>12}{'-':>14}  {stage['status']}: {stage['note']}")
+    return "\n".join(lines)
+
+
+# --- MAIN EXECUTION ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the ingest, metrics, NLP, scoring and report stages on synthetic data.")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiplies the number of brands (1 ~ the real scrape)")
+    parser.add_argument('--brands', type=int, default=synthetic_data.N_BRANDS, help="Brands at scale 1")
+    parser.add_argument('--tweets-per-brand', type=int, default=synthetic_data.TWEETS_PER_BRAND)
+    parser.add_argument('--products-per-brand', type=int, default=synthetic_data.PRODUCTS_PER_BRAND)
+    parser.add_argument('--reviews-per-product', type=int, default=synthetic_data.REVIEWS_PER_PRODUCT)
+    parser.add_argument('--trend-days', type=int, default=synthetic_data.TREND_DAYS)
+    parser.add_argument('--seed', type=int, default=synthetic_data.SEED)
+    parser.add_argument('--db', help="Reuse this DB (e.g. one kept with --keep-db) and skip ingest")
+    parser.add_argument('--keep-db', help="Write the generated DB here instead of a temporary directory")
+    parser.add_argument('--reports', type=int, default=20, help="Reports rendered in the reports stage")
+    parser.add_argument('--chunksize', type=int, default=streaming_metrics.CHUNK_SIZE)
+    parser.add_argument('--n-jobs', type=int, default=topic_modeling.N_JOBS, help="Worker processes for the topic stage")
+    parser.add_argument('--skip', nargs='+', choices=STAGES, default=[], help="Stages not to run")
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    parser.add_argument('--compare', help="Results file to compare with (default: the previous one in --results-dir)")
+    parser.add_argument('--no-save', action='store_true', help="Print the results without saving them")
+    args = parser.parse_args(argv)
+
+    skip = set(args.skip) | ({'ingest'} if args.db else set())
+    config = {'brands': max(1, round(args.brands * args.scale)), 'tweets_per_brand': args.tweets_per_brand,
+              'products_per_brand': args.products_per_brand, 'reviews_per_product': args.reviews_per_product,
+              'trend_days': args.trend_days, 'seed': args.seed, 'reports': args.reports,
+              'chunksize': args.chunksize, 'n_jobs': args.n_jobs}
+    commit, dirty = git_commit()
+    results = {'created_at': datetime.now().isoformat(timespec='seconds'), 'commit': commit, 'dirty': dirty,
+               'environment': environment(), 'config': config, 'db': args.db, 'stages': {}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or args.keep_db or os.path.join(tmp, 'synthetic.db')
+        ctx = dict(config, db=db_path, csv=os.path.join(tmp, 'brand_metrics.csv'))
+        if args.db:
+            # The metrics CSV is an output of the sentiment stage; without it the app load needs one
+            if 'sentiment' in skip:
+                conn = sqlite3.connect(args.db)
+                try:
+                    brand_metrics.attach_sentiment(brand_metrics.fetch_brand_metrics(conn), pd.DataFrame(
+                        columns=['brand_name', 'avg_tweet_sentiment'])).to_csv(ctx['csv'], index=False)
+                finally:
+                    conn.close()
+        for name in STAGES:
+            if name in skip:
+                continue
+            if name in ('scoring', 'reports') and 'app_data' not in ctx:
+                results['stages'][name] = {'status': 'skipped', 'note': "needs the app load stage"}
+                continue
+            results['stages'][name] = run_stage(name, ctx)
+        results['rows'] = ctx.get('counts')
+
+    print(f"\n--- Pipeline benchmark ({config['brands']} brands, commit {commit}{' + local changes' if dirty else ''}) ---")
+    print(format_results(results))
+    if args.no_save:
+        return 0
+    path = save_results(results, args.results_dir)
+    print(f"\n--- Saved results to {os.path.relpath(path, PROJECT_ROOT)} ---")
+    baseline_path = args.compare or previous_results(path, args.results_dir)
+    if baseline_path:
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n--- Compared with {os.path.basename(baseline_path)} (commit {baseline['commit']}) ---")
+        print(format_comparison(baseline, results))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
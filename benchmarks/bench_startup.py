@@ -0,0 +1,127 @@
+"""Startup-time benchmark for the consultant tool.
+
+    python benchmarks/bench_startup.py [--runs 5] [--csv ...] [--db ...]
+
+Each measurement runs in a fresh interpreter, so import costs are included:
+  - launch path: the imports the tool needs before its window can be built
+  - data load, cold: full SQL aggregation + scoring (no snapshot)
+  - data load, warm: read from the precomputed snapshot
+  - window shown / data ready: the real Tk app, run by GUI_CODE (which hooks Tk.mainloop to report both),
+    only when a display is available
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+APP_DIR = os.path.join(PROJECT_ROOT, 'app')
+TOOL_PATH = os.path.join(APP_DIR, 'consultant_tool_v3.py')
+
+LAUNCH_PATH_CODE = """
+import sys; sys.path.insert(0, {app_dir!r})
+import tkinter, tkinter.ttk, tkinter.messagebox, queue, threading, concurrent.futures
+from scoring_weights import WEIGHTS
+"""
+LOAD_CODE = """
+import sys; sys.path.insert(0, {app_dir!r}); sys.path.append({root!r})
+import score_history, score_snapshot
+score_snapshot.load_app_data({csv!r}, {db!r}, snapshot_path={snapshot!r},
+                             history=score_history.ScoreHistory({history!r}))
+"""
+
+# Runs the unmodified tool with Tk.mainloop wrapped: the window is drawn, then the tool's globals are
+# polled until on_data_loaded has published app_data, and the window is closed
+GUI_CODE = """
+import sys, tkinter
+sys.path.insert(0, {app_dir!r}); sys.argv = [{tool!r}]
+tool = {{'__name__': '__main__', '__file__': {tool!r}}}
+tk_mainloop = tkinter.Tk.mainloop
+
+def report_when_loaded(root):
+    if tool.get('app_data') is not None:
+        print("STARTUP data_loaded", flush=True)
+        root.destroy()
+    else:
+        root.after({poll_ms}, report_when_loaded, root)
+
+def mainloop(root, n=0):
+    root.update() # The window is mapped and drawn at this point
+    print("STARTUP window_shown", flush=True)
+    root.after_idle(report_when_loaded, root)
+    tk_mainloop(root, n)
+
+tkinter.Tk.mainloop = mainloop
+with open({tool!r}, encoding='utf-8') as f:
+    exec(compile(f.read(), {tool!r}, 'exec'), tool)
+"""
+GUI_POLL_MS = 10 # Resolution of 'data ready'
+
+
+def time_python(code, runs):
+    """Wall-clock seconds of `python -c code` (fresh interpreter each run)."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def time_gui(runs, env):
+    """(window shown, data ready) seconds after launch, from GUI_CODE's STARTUP lines."""
+    code = GUI_CODE.format(app_dir=APP_DIR, tool=TOOL_PATH, poll_ms=GUI_POLL_MS)
+    shown, ready = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE, text=True, env=env)
+        for line in proc.stdout:
+            if line.startswith('STARTUP window_shown'):
+                shown.append(time.perf_counter() - start)
+            elif line.startswith('STARTUP data_loaded'):
+                ready.append(time.perf_counter() - start)
+        proc.wait()
+    return shown, ready
+
+
+def report(label, times):
+    print(f"{label:<30} median {statistics.median(times) * 1000:8.1f} ms   min {min(times) * 1000:8.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how fast the consultant tool starts.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--csv', default=os.path.join(PROJECT_ROOT, 'data', 'brand_metrics_final_v2.csv'))
+    parser.add_argument('--db', default=os.path.join(PROJECT_ROOT, 'data', 'licensing_data.db'))
+    args = parser.parse_args(argv)
+
+    report("launch path imports", time_python(LAUNCH_PATH_CODE.format(app_dir=APP_DIR), args.runs))
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, 'app_snapshot.pkl')
+        history = os.path.join(tmp, 'score_history') # Benchmark builds stay out of data/score_history
+        code = LOAD_CODE.format(app_dir=APP_DIR, root=PROJECT_ROOT, csv=args.csv, db=args.db, snapshot=snapshot,
+                                history=history)
+        cold = []
+        for _ in range(args.runs):
+            if os.path.exists(snapshot):
+                os.remove(snapshot)
+            cold += time_python(code, 1)
+        report("data load, cold (no snapshot)", cold)
+        report("data load, warm (snapshot)", time_python(code, args.runs))
+
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        print("window shown / data ready       skipped (no display; try xvfb-run)")
+        return 0
+    # The real app reads its configured data paths and the default snapshot
+    shown, ready = time_gui(args.runs, os.environ)
+    if shown:
+        report("window shown", shown)
+    if ready:
+        report("data ready", ready)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
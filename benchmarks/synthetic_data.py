@@ -0,0 +1,234 @@
+"""Synthetic licensing_data.db generator for the benchmarks.
+
+    python benchmarks/synthetic_data.py --scale 10 --db /tmp/synthetic.db
+
+Writes brands, tweets, products, reviews and google_trends_data in the schema
+of scraper/init_db.py, using the scrapers' own INSERT statements. Scale 1 is
+roughly the size of the real scrape (40 brands, ~18k tweets, ~1k products);
+--scale multiplies the number of brands, so 100 gives thousands of brands and
+millions of tweets. Everything is drawn from a seeded generator:
+  - tweets per brand are heavy-tailed (a few brands get most of the hype),
+    mixed Arabic/English, dated in the scraper's 'Mon Oct 20 16:41:09 +0000 2025' format
+    with some unparseable dates, and carry sentiment words VADER reacts to
+  - each brand has a quality level that drives its product ratings and review ratings
+  - Google Trends interest has a per-brand level and slope
+Rows are generated and inserted a batch of brands at a time, so memory stays
+bounded at any scale.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+import init_db
+
+# --- Configuration ---
+SEED = 0
+N_BRANDS = 40 # Scale 1 ~ the real scrape
+TWEETS_PER_BRAND = 450
+PRODUCTS_PER_BRAND = 25
+REVIEWS_PER_PRODUCT = 5
+TREND_DAYS = 365
+ARABIC_SHARE = 0.6 # Share of tweets (and review texts) written in Arabic
+BAD_DATE_SHARE = 0.01 # Tweets whose date the cleaning step cannot parse
+MISSING_SHARE = 0.05 # Products without a rating / review count
+TWEETS_PER_BATCH = 200_000 # Brands are generated in batches of about this many tweets
+END_DATE = datetime(2025, 10, 31)
+
+CATEGORIES = ['Food & Beverage', 'Fashion', 'Electronics', 'Beauty', 'Sports', 'Toys', 'Home', 'Entertainment']
+SYLLABLES = ['al', 'na', 'ri', 'ko', 'sa', 'mi', 'zu', 'ha', 'lo', 'ja', 've', 'ta', 'qa', 'do', 'ne', 'ba']
+PRODUCT_NOUNS = ['Shirt', 'Cap', 'Mug', 'Backpack', 'Sneakers', 'Headphones', 'Bottle', 'Hoodie', 'Poster',
+                 'Phone Case', 'Perfume', 'Watch', 'Notebook', 'Figure', 'Scarf']
+
+WORDS_EN = ['new', 'store', 'collection', 'riyadh', 'jeddah', 'today', 'price', 'offer', 'season', 'match',
+            'launch', 'limited', 'edition', 'delivery', 'order', 'fans', 'weekend', 'event', 'design', 'quality',
+            'shop', 'online', 'saudi', 'team', 'video', 'brand', 'style', 'gift', 'week', 'sale']
+WORDS_AR = ['جديد', 'متجر', 'مجموعة', 'الرياض', 'جدة', 'سعر', 'عرض', 'موسم', 'مباراة', 'اطلاق',
+            'محدود', 'توصيل', 'طلب', 'جمهور', 'نهاية', 'فعالية', 'تصميم', 'جودة', 'تسوق', 'اونلاين',
+            'السعودية', 'فريق', 'فيديو', 'ماركة', 'ستايل', 'هدية', 'اسبوع', 'تخفيضات', 'منتج', 'الموسم']
+POSITIVE_EN = ['love', 'great', 'amazing', 'best', 'happy', 'excellent', 'awesome']
+NEGATIVE_EN = ['bad', 'terrible', 'worst', 'disappointed', 'awful', 'poor', 'hate']
+POSITIVE_AR = ['رائع', 'ممتاز', 'جميل', 'احب']
+NEGATIVE_AR = ['سيء', 'رديء', 'مخيب']
+
+
+# --- Names ---
+def brand_names(n_brands, rng):
+    """Unique, pronounceable brand names ('Koharu 17')."""
+    picks = rng.integers(0, len(SYLLABLES), size=(n_brands, 3))
+    return [''.join(SYLLABLES[i] for i in row).title() + f" {n}" for n, row in enumerate(picks)]
+
+
+def weighted_words(rng, size, words, zipf=1.2):
+    """`size` words drawn with a Zipf-like frequency profile (a few words dominate, like real text)."""
+    weights = 1.0 / np.arange(1, len(words) + 1) ** zipf
+    return np.asarray(words, dtype=object)[rng.choice(len(words), size=size, p=weights / weights.sum())]
+
+
+# --- Row Generators (one batch of brands at a time) ---
+def tweet_rows(brands, tweet_counts, qualities, first_id, rng):
+    """Tweets for one batch, as tuples in the column order of the scraper's INSERT."""
+    n = int(tweet_counts.sum())
+    brand_idx = np.repeat(np.arange(len(brands)), tweet_counts)
+    arabic = rng.random(n) < ARABIC_SHARE
+    n_words = rng.integers(4, 18, size=n)
+    words_en = weighted_words(rng, int(n_words.sum()), WORDS_EN)
+    words_ar = weighted_words(rng, int(n_words.sum()), WORDS_AR)
+    # Brands with better products get more positive tweets
+    positive = rng.random(n) < np.clip(qualities[brand_idx] / 5.0, 0.1, 0.9)
+    mood = rng.random(n) < 0.6
+    has_url = rng.random(n) < 0.3
+
+    seconds = rng.integers(0, TREND_DAYS * 86400, size=n)
+    dates = pd.to_datetime(END_DATE) - pd.to_timedelta(seconds, unit='s')
+    date_strings = dates.strftime('%a %b %d %H:%M:%S +0000 %Y').to_numpy(dtype=object)
+    date_strings[rng.random(n) < BAD_DATE_SHARE] = '2025-10-20T16:41:09Z'
+
+    usernames = rng.integers(0, max(1000, n // 5), size=n)
+    engagement = rng.geometric(0.2, size=(n, 4)) - 1
+    rows = []
+    offset = 0
+    for i in range(n):
+        words = (words_ar if arabic[i] else words_en)[offset:offset + n_words[i]].tolist()
+        offset += n_words[i]
+        brand_name = brands[brand_idx[i]]
+        if mood[i]:
+            pool = (POSITIVE_AR if positive[i] else NEGATIVE_AR) if arabic[i] else (POSITIVE_EN if positive[i] else NEGATIVE_EN)
+            words.insert(int(rng.integers(0, len(words) + 1)), pool[int(rng.integers(0, len(pool)))])
+        words.insert(0, brand_name)
+        if has_url[i]:
+            words.append(f"https://t.co/{first_id + i:x}")
+        rows.append((brand_name, str(first_id + i), date_strings[i], f"user{usernames[i]}", ' '.join(words),
+                     'ar' if arabic[i] else 'en', *engagement[i].tolist()))
+    return rows
+
+
+def product_rows(brand_ids, brands, product_counts, qualities, first_id, rng):
+    """Products for one batch: (brand_id, platform, product_name, price, avg_rating, num_reviews, url)."""
+    n = int(product_counts.sum())
+    brand_idx = np.repeat(np.arange(len(brands)), product_counts)
+    nouns = np.asarray(PRODUCT_NOUNS, dtype=object)[rng.integers(0, len(PRODUCT_NOUNS), size=n)]
+    prices = np.round(rng.lognormal(4.5, 0.8, size=n), 2)
+    ratings = np.round(np.clip(qualities[brand_idx] + rng.normal(0, 0.4, size=n), 1.0, 5.0), 1)
+    reviews = np.floor(rng.lognormal(3.0, 1.5, size=n)).astype(int)
+    no_rating = rng.random(n) < MISSING_SHARE
+    no_reviews = rng.random(n) < MISSING_SHARE
+    no_price = rng.random(n) < MISSING_SHARE
+    return [(brand_ids[brand_idx[i]], 'Amazon.sa', f"{brands[brand_idx[i]]} {nouns[i]} {rng.integers(100, 999)}",
+             None if no_price[i] else float(prices[i]), None if no_rating[i] else float(ratings[i]),
+             None if no_reviews[i] else int(reviews[i]), f"https://www.amazon.sa/dp/SYN{first_id + i:010d}")
+            for i in range(n)]
+
+
+def review_rows(product_ids, product_ratings, rng, reviews_per_product=REVIEWS_PER_PRODUCT):
+    """Reviews of the given products: (product_id, rating, review_text)."""
+    counts = rng.poisson(reviews_per_product, size=len(product_ids))
+    product_idx = np.repeat(np.arange(len(product_ids)), counts)
+    n = len(product_idx)
+    base = np.nan_to_num(np.asarray(product_ratings, dtype=float)[product_idx], nan=3.0)
+    ratings = np.clip(np.round(base + rng.normal(0, 1.0, size=n)), 1, 5)
+    arabic = rng.random(n) < ARABIC_SHARE
+    words_en = weighted_words(rng, n * 6, WORDS_EN)
+    words_ar = weighted_words(rng, n * 6, WORDS_AR)
+    rows = []
+    for i in range(n):
+        words = (words_ar if arabic[i] else words_en)[i * 6:(i + 1) * 6].tolist()
+        if arabic[i]:
+            words.append((POSITIVE_AR if ratings[i] >= 4 else NEGATIVE_AR)[0])
+        else:
+            words.append(POSITIVE_EN[0] if ratings[i] >= 4 else NEGATIVE_EN[0])
+        rows.append((product_ids[product_idx[i]], float(ratings[i]), ' '.join(words)))
+    return rows
+
+
+def trend_rows(brands, rng, trend_days=TREND_DAYS):
+    """Daily Google Trends interest (0-100) per brand: (brand_name, date, interest_score)."""
+    days = [(END_DATE - timedelta(days=d)).strftime('%Y-%m-%d') for d in range(trend_days - 1, -1, -1)]
+    levels = rng.uniform(5, 60, size=(len(brands), 1))
+    slopes = rng.normal(0, 0.05, size=(len(brands), 1))
+    interest = np.clip(np.round(levels + slopes * np.arange(trend_days) + rng.normal(0, 5, size=(len(brands), trend_days))), 0, 100)
+    return [(brand_name, day, int(value)) for brand_name, row in zip(brands, interest) for day, value in zip(days, row)]
+
+
+# --- Database ---
+def generate_database(db_path, n_brands=N_BRANDS, tweets_per_brand=TWEETS_PER_BRAND,
+                      products_per_brand=PRODUCTS_PER_BRAND, reviews_per_product=REVIEWS_PER_PRODUCT,
+                      trend_days=TREND_DAYS, seed=SEED):
+    """Creates a fresh DB at `db_path` (replacing any file there) and fills it. Returns {table: rows}."""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    init_db.create_database(db_path)
+    rng = np.random.default_rng(seed)
+    names = brand_names(n_brands, rng)
+    # Lognormal hype: the mean stays tweets_per_brand, the busiest brands get many times that
+    tweet_counts = np.maximum(1, np.round(rng.lognormal(0, 1.0, size=n_brands) / np.exp(0.5) * tweets_per_brand)).astype(int)
+    product_counts = rng.poisson(products_per_brand, size=n_brands)
+    qualities = rng.uniform(2.5, 4.8, size=n_brands)
+    categories = np.asarray(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), size=n_brands)]
+
+    counts = {'brands': n_brands, 'tweets': 0, 'products': 0, 'reviews': 0, 'google_trends_data': 0}
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("INSERT INTO brands (id, brand_name, category) VALUES (?, ?, ?)",
+                           [(i + 1, name, category) for i, (name, category) in enumerate(zip(names, categories))])
+        start = 0
+        while start < n_brands:
+            # Enough brands for about TWEETS_PER_BATCH tweets (at least one)
+            end = start + max(1, int(np.searchsorted(np.cumsum(tweet_counts[start:]), TWEETS_PER_BATCH)))
+            batch = names[start:end]
+            rows = tweet_rows(batch, tweet_counts[start:end], qualities[start:end], counts['tweets'] + 1, rng)
+            cursor.executemany("""INSERT OR IGNORE INTO tweets
+                   (brand_name, tweet_id, tweet_date, username, tweet_content, language,
+                    reply_count, retweet_count, like_count, quote_count)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+            counts['tweets'] += len(rows)
+
+            rows = product_rows(list(range(start + 1, end + 1)), batch, product_counts[start:end], qualities[start:end],
+                                counts['products'] + 1, rng)
+            cursor.executemany("""INSERT OR IGNORE INTO products
+                   (brand_id, platform, product_name, price, avg_rating, num_reviews, url)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""", rows)
+            product_ids = list(range(counts['products'] + 1, counts['products'] + len(rows) + 1))
+            counts['products'] += len(rows)
+
+            rows = review_rows(product_ids, [row[4] for row in rows], rng, reviews_per_product)
+            cursor.executemany("INSERT OR IGNORE INTO reviews (product_id, rating, review_text) VALUES (?, ?, ?)", rows)
+            counts['reviews'] += len(rows)
+
+            if trend_days:
+                rows = trend_rows(batch, rng, trend_days)
+                cursor.executemany("INSERT OR IGNORE INTO google_trends_data (brand_name, date, interest_score) VALUES (?, ?, ?)", rows)
+                counts['google_trends_data'] += len(rows)
+            conn.commit()
+            start = end
+    finally:
+        conn.close()
+    return counts
+
+
+# --- MAIN EXECUTION ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic licensing_data.db at a configurable scale.")
+    parser.add_argument('--db', required=True, help="Where to write the DB (replaced if it exists)")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiplies the number of brands")
+    parser.add_argument('--brands', type=int, default=N_BRANDS, help="Brands at scale 1")
+    parser.add_argument('--tweets-per-brand', type=int, default=TWEETS_PER_BRAND)
+    parser.add_argument('--products-per-brand', type=int, default=PRODUCTS_PER_BRAND)
+    parser.add_argument('--reviews-per-product', type=int, default=REVIEWS_PER_PRODUCT)
+    parser.add_argument('--trend-days', type=int, default=TREND_DAYS)
+    parser.add_argument('--seed', type=int, default=SEED)
+    args = parser.parse_args(argv)
+
+    counts = generate_database(args.db, max(1, round(args.brands * args.scale)), args.tweets_per_brand,
+                               args.products_per_brand, args.reviews_per_product, args.trend_days, args.seed)
+    print("\n--- Generated " + ", ".join(f"{rows} {table}" for table, rows in counts.items()) + " ---")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
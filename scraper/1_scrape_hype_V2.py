@@ -1,16 +1,21 @@
 import sqlite3
 import os
+import sys
 from apify_client import ApifyClient
 import pandas as pd
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..')) # Project root, for the shared 'analytics' package
+from analytics.instrumentation import client_retries, count, json_bytes, profiled, span
+
 # --- CONFIGURATION ---
 
 # 1. PASTE YOUR APIFY TOKEN HERE
 APIFY_TOKEN = os.getenv("APIFY_TOKEN")
+APIFY_API_URL = os.getenv("APIFY_API_URL") # Unset = api.apify.com; benchmarks/apify_stub.py for offline runs
 
 # 2. Define the path to our database
-DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
+DB_PATH = os.getenv("KSA_DB_PATH") or os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
 
 # 3. Define the Apify Actor ID
 TWITTER_ACTOR_ID = "xtdata/twitter-x-scraper" 
@@ -107,7 +112,7 @@ def scrape_brand_twitter_data(conn):
         print(f"   Could not clear old data (table may not exist yet, this is OK): {e}")
 
     try:
-        client = ApifyClient(APIFY_TOKEN)
+        client = ApifyClient(APIFY_TOKEN, api_url=APIFY_API_URL)
     except Exception as e:
         print(f"!! FATAL ERROR: Could not initialize ApifyClient. Is your token correct? Error: {e}")
         return
@@ -123,61 +128,73 @@ def scrape_brand_twitter_data(conn):
             
             # --- RUN THE ACTOR (ENGLISH) ---
             print(f"   Calling Apify Actor for EN tweets...")
-            run_en = client.actor(TWITTER_ACTOR_ID).call(run_input=actor_input_en)
+            with span('apify.actor_call', actor=TWITTER_ACTOR_ID, brand=brand_name, lang='en') as s, client_retries(s, client.stats):
+                run_en = client.actor(TWITTER_ACTOR_ID).call(run_input=actor_input_en)
+                s.add(cost=run_en.get('usageTotalUsd')).set(run_status=run_en.get('status'))
             print(f"   Actor run (EN) started. Fetching results...")
-            for item in client.dataset(run_en["defaultDatasetId"]).iterate_items():
-                tweet_id_str = item.get('url', '').split('/')[-1]
-                if not tweet_id_str: continue
-                
-                # --- APPLYING CORRECTED FIELD NAMES (from dataset_twitter-x-scraper...json) ---
-                rows_to_insert.append((
-                    brand_name,
-                    tweet_id_str,
-                    item.get('created_at'),       # FIX: Was 'createdAt'
-                    item.get('author', {}).get('screen_name', 'unknown'), # FIX: 'screen_name' is more reliable
-                    item.get('full_text'),        # FIX: Was 'text'
-                    item.get('lang', 'en'),       # FIX: Was 'language'
-                    item.get('reply_count', 0),   
-                    item.get('retweet_count', 0), 
-                    item.get('favorite_count', 0),# FIX: Was 'likeCount'
-                    item.get('quote_count', 0)    
-                ))
+            # Items are streamed page by page, so download and parse are timed together
+            with span('apify.dataset_iterate', brand=brand_name, lang='en') as s, client_retries(s, client.stats):
+                for item in client.dataset(run_en["defaultDatasetId"]).iterate_items():
+                    s.add(items=1, bytes=json_bytes(item))
+                    tweet_id_str = item.get('url', '').split('/')[-1]
+                    if not tweet_id_str: continue
+                    
+                    # --- APPLYING CORRECTED FIELD NAMES (from dataset_twitter-x-scraper...json) ---
+                    rows_to_insert.append((
+                        brand_name,
+                        tweet_id_str,
+                        item.get('created_at'),       # FIX: Was 'createdAt'
+                        item.get('author', {}).get('screen_name', 'unknown'), # FIX: 'screen_name' is more reliable
+                        item.get('full_text'),        # FIX: Was 'text'
+                        item.get('lang', 'en'),       # FIX: Was 'language'
+                        item.get('reply_count', 0),   
+                        item.get('retweet_count', 0), 
+                        item.get('favorite_count', 0),# FIX: Was 'likeCount'
+                        item.get('quote_count', 0)    
+                    ))
 
             # --- RUN THE ACTOR (ARABIC) ---
             print(f"   Calling Apify Actor for AR tweets...")
-            run_ar = client.actor(TWITTER_ACTOR_ID).call(run_input=actor_input_ar)
+            with span('apify.actor_call', actor=TWITTER_ACTOR_ID, brand=brand_name, lang='ar') as s, client_retries(s, client.stats):
+                run_ar = client.actor(TWITTER_ACTOR_ID).call(run_input=actor_input_ar)
+                s.add(cost=run_ar.get('usageTotalUsd')).set(run_status=run_ar.get('status'))
             print(f"   Actor run (AR) started. Fetching results...")
-            for item in client.dataset(run_ar["defaultDatasetId"]).iterate_items():
-                tweet_id_str = item.get('url', '').split('/')[-1]
-                if not tweet_id_str: continue
-
-                # --- APPLYING CORRECTED FIELD NAMES ---
-                rows_to_insert.append((
-                    brand_name,
-                    tweet_id_str,
-                    item.get('created_at'),
-                    item.get('author', {}).get('screen_name', 'unknown'),
-                    item.get('full_text'),
-                    item.get('lang', 'ar'),
-                    item.get('reply_count', 0),
-                    item.get('retweet_count', 0),
-                    item.get('favorite_count', 0),
-                    item.get('quote_count', 0)    
-                ))
+            with span('apify.dataset_iterate', brand=brand_name, lang='ar') as s, client_retries(s, client.stats):
+                for item in client.dataset(run_ar["defaultDatasetId"]).iterate_items():
+                    s.add(items=1, bytes=json_bytes(item))
+                    tweet_id_str = item.get('url', '').split('/')[-1]
+                    if not tweet_id_str: continue
+
+                    # --- APPLYING CORRECTED FIELD NAMES ---
+                    rows_to_insert.append((
+                        brand_name,
+                        tweet_id_str,
+                        item.get('created_at'),
+                        item.get('author', {}).get('screen_name', 'unknown'),
+                        item.get('full_text'),
+                        item.get('lang', 'ar'),
+                        item.get('reply_count', 0),
+                        item.get('retweet_count', 0),
+                        item.get('favorite_count', 0),
+                        item.get('quote_count', 0)    
+                    ))
 
             if not rows_to_insert:
                 print(f"   No tweets found for {brand_name}.")
                 continue
 
             # Insert all rows into our DB
-            cursor.executemany(
-                """INSERT OR IGNORE INTO tweets 
-                   (brand_name, tweet_id, tweet_date, username, tweet_content, language, 
-                    reply_count, retweet_count, like_count, quote_count) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                rows_to_insert
-            )
-            conn.commit()
+            with span('sqlite.insert', table='tweets', brand=brand_name) as s:
+                cursor.executemany(
+                    """INSERT OR IGNORE INTO tweets 
+                       (brand_name, tweet_id, tweet_date, username, tweet_content, language, 
+                        reply_count, retweet_count, like_count, quote_count) 
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    rows_to_insert
+                )
+                conn.commit()
+                s.add(items=len(rows_to_insert))
+            count('sqlite.commits')
             print(f"   Done. Saved {len(rows_to_insert)} new tweets for {brand_name}.")
 
         except Exception as e:
@@ -205,4 +222,5 @@ def main():
     print("\n--- Hype Scraping (v2 - CORRECTED FIELDS) Complete! ---")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profiled('scraper.hype'):
+        main()
\ No newline at end of file
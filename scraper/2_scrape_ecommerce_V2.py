@@ -1,18 +1,23 @@
 #this script is modified for amazon only we are ignoring the shit out of noon cuz there is no apify actor made yet or maintained for noon
 import sqlite3
 import os
+import sys
 from apify_client import ApifyClient
 import time
 import random
 import re # For extracting numbers
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..')) # Project root, for the shared 'analytics' package
+from analytics.instrumentation import client_retries, count, json_bytes, profiled, span
+
 # --- CONFIGURATION ---
 
 # 1. PASTE YOUR APIFY TOKEN HERE
 APIFY_TOKEN = os.getenv("APIFY_TOKEN")
+APIFY_API_URL = os.getenv("APIFY_API_URL") # Unset = api.apify.com; benchmarks/apify_stub.py for offline runs
 
 # 2. Define the path to our database
-DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
+DB_PATH = os.getenv("KSA_DB_PATH") or os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
 
 # 3. Define the Actor ID
 AMAZON_ACTOR_ID = "junglee/Amazon-crawler"      
@@ -113,7 +118,7 @@ def scrape_amazon_sa_apify(conn, brand_name):
         print(f"   Skipping Amazon scrape for '{brand_name}' due to missing brand_id.")
         return # Skip if brand couldn't be found/created
 
-    try: client = ApifyClient(APIFY_TOKEN)
+    try: client = ApifyClient(APIFY_TOKEN, api_url=APIFY_API_URL)
     except Exception as e: print(f"!! FATAL ERROR: Init ApifyClient: {e}"); return
 
     search_url = f"https://www.amazon.sa/s?k={brand_name.replace(' ', '+')}" 
@@ -128,49 +133,59 @@ def scrape_amazon_sa_apify(conn, brand_name):
     }
     
     try:
-        run = client.actor(AMAZON_ACTOR_ID).call(run_input=actor_input)
+        with span('apify.actor_call', actor=AMAZON_ACTOR_ID, brand=brand_name) as s, client_retries(s, client.stats):
+            run = client.actor(AMAZON_ACTOR_ID).call(run_input=actor_input)
+            run_details = client.run(run['id']).get()
+            if run_details:
+                s.add(cost=run_details.get('usageTotalUsd')).set(run_status=run_details.get('status'))
         print(f"     Actor run started (Amazon). Fetching results...")
         
         products_saved = 0
         cursor = conn.cursor()
         
-        run_details = client.run(run['id']).get()
         if run_details and run_details.get('status') == 'SUCCEEDED':
-            dataset_items = client.dataset(run["defaultDatasetId"]).list_items().items
+            with span('apify.dataset_download', brand=brand_name) as s, client_retries(s, client.stats):
+                dataset_items = client.dataset(run["defaultDatasetId"]).list_items().items
+                s.add(items=len(dataset_items), bytes=json_bytes(dataset_items))
             print(f"     Amazon Actor run SUCCEEDED. Found {len(dataset_items)} items in dataset.")
 
-            for item in dataset_items:
-                product_name = item.get('title') 
-                asin = item.get('asin')
-                product_url = item.get('url') 
-                if not product_url and asin:
-                    product_url = f"https://www.amazon.sa/dp/{asin}"
+            with span('scraper.parse_insert', table='products', brand=brand_name) as s:
+                for item in dataset_items:
+                    product_name = item.get('title') 
+                    asin = item.get('asin')
+                    product_url = item.get('url') 
+                    if not product_url and asin:
+                        product_url = f"https://www.amazon.sa/dp/{asin}"
                 
-                price_data = item.get('price')
-                price = None
-                if price_data and isinstance(price_data, dict):
-                    price = extract_number(price_data.get('value')) 
+                    price_data = item.get('price')
+                    price = None
+                    if price_data and isinstance(price_data, dict):
+                        price = extract_number(price_data.get('value')) 
                     
-                avg_rating = extract_rating(item.get('stars')) 
-                num_reviews = extract_number(item.get('reviewsCount')) 
-
-                if not product_name: continue
-                if not product_url: continue
-
-                price = price if price is not None else None
-                avg_rating = avg_rating if avg_rating is not None else None
-                num_reviews = num_reviews if num_reviews is not None else None
-
-                cursor.execute(
-                    """INSERT OR IGNORE INTO products 
-                       (brand_id, platform, product_name, price, avg_rating, num_reviews, url) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (brand_id, 'Amazon.sa', product_name, price, avg_rating, num_reviews, product_url)
-                )
-                if cursor.rowcount > 0:
-                    products_saved += 1
-            
-            conn.commit()
+                    avg_rating = extract_rating(item.get('stars')) 
+                    num_reviews = extract_number(item.get('reviewsCount')) 
+
+                    if not product_name: continue
+                    if not product_url: continue
+
+                    price = price if price is not None else None
+                    avg_rating = avg_rating if avg_rating is not None else None
+                    num_reviews = num_reviews if num_reviews is not None else None
+
+                    cursor.execute(
+                        """INSERT OR IGNORE INTO products 
+                           (brand_id, platform, product_name, price, avg_rating, num_reviews, url) 
+                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                        (brand_id, 'Amazon.sa', product_name, price, avg_rating, num_reviews, product_url)
+                    )
+                    if cursor.rowcount > 0:
+                        products_saved += 1
+                s.add(items=len(dataset_items))
+
+            with span('sqlite.commit', table='products', brand=brand_name) as s:
+                conn.commit()
+                s.add(items=products_saved)
+            count('sqlite.commits')
             if products_saved > 0:
                  print(f"     SUCCESS: Saved {products_saved} new Amazon products to DB.")
             elif len(dataset_items) > 0:
@@ -209,10 +224,12 @@ def main():
         
         sleep_time = random.randint(5, 10) # Wait between brands
         print(f"   Waiting {sleep_time} seconds before next brand...")
-        time.sleep(sleep_time)
+        with span('scraper.throttle_sleep', seconds=sleep_time):
+            time.sleep(sleep_time)
 
     conn.close()
     print("\n--- E-commerce Scraping (Amazon ONLY - Apify API) Complete! ---")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profiled('scraper.ecommerce'):
+        main()
\ No newline at end of file
@@ -1,18 +1,23 @@
 import sqlite3
 import os
+import sys
 from apify_client import ApifyClient
 import time
 import random
 import pandas as pd
 import re # Added re import back
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..')) # Project root, for the shared 'analytics' package
+from analytics.instrumentation import client_retries, count, json_bytes, profiled, span
+
 # --- CONFIGURATION ---
 
 # 1. PASTE YOUR *CURRENT* APIFY TOKEN HERE
 APIFY_TOKEN = os.getenv("APIFY_TOKEN")
+APIFY_API_URL = os.getenv("APIFY_API_URL") # Unset = api.apify.com; benchmarks/apify_stub.py for offline runs
 
 # 2. Define the path to our database
-DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
+DB_PATH = os.getenv("KSA_DB_PATH") or os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
 
 # 3. Define the CORRECTED Apify Actor ID for Reviews
 REVIEWS_ACTOR_ID = "web_wanderer/amazon-reviews-extractor" # Confirmed actor supports SA
@@ -66,7 +71,7 @@ def scrape_amazon_reviews_apify(conn, products_to_scrape):
     """Scrapes Amazon reviews for a list of products using web_wanderer."""
     print(f"\n--- Starting Amazon Review Scraping for {len(products_to_scrape)} products ---")
 
-    try: client = ApifyClient(APIFY_TOKEN)
+    try: client = ApifyClient(APIFY_TOKEN, api_url=APIFY_API_URL)
     except Exception as e: print(f"!! FATAL ERROR: Init ApifyClient: {e}"); return
 
     reviews_saved_total = 0
@@ -92,44 +97,55 @@ def scrape_amazon_reviews_apify(conn, products_to_scrape):
         }
 
         try:
-            run = client.actor(REVIEWS_ACTOR_ID).call(run_input=actor_input)
+            with span('apify.actor_call', actor=REVIEWS_ACTOR_ID, asin=asin) as s, client_retries(s, client.stats):
+                run = client.actor(REVIEWS_ACTOR_ID).call(run_input=actor_input)
+                run_details = client.run(run['id']).get()
+                if run_details:
+                    s.add(cost=run_details.get('usageTotalUsd')).set(run_status=run_details.get('status'))
             print(f"     Actor run started. Fetching up to 10 recent reviews...")
 
             reviews_saved_for_product = 0
 
-            run_details = client.run(run['id']).get()
             if run_details and run_details.get('status') == 'SUCCEEDED':
                 dataset_client = client.dataset(run["defaultDatasetId"])
-                dataset_info = dataset_client.get()
+                with span('apify.dataset_info', asin=asin) as s, client_retries(s, client.stats):
+                    dataset_info = dataset_client.get()
                 item_count = dataset_info.get('itemCount', 0) if dataset_info else 0
 
                 print(f"     Actor run SUCCEEDED. Found {item_count} total reviews in dataset.")
 
                 if item_count > 0:
                     # Fetch only the number we targeted (1)
-                    dataset_items = dataset_client.list_items(limit=REVIEWS_PER_PRODUCT_TARGET).items
+                    with span('apify.dataset_download', asin=asin) as s, client_retries(s, client.stats):
+                        dataset_items = dataset_client.list_items(limit=REVIEWS_PER_PRODUCT_TARGET).items
+                        s.add(items=len(dataset_items), bytes=json_bytes(dataset_items))
                     print(f"     Fetched {len(dataset_items)} reviews (target {REVIEWS_PER_PRODUCT_TARGET}).")
 
                     rows_to_insert = []
-                    for item in dataset_items:
-                        # --- Extract relevant fields based on web_wanderer output ---
-                        rating = item.get('rating')
-                        review_text = item.get('reviewText') # Matches sample output
-
-                        if review_text or rating is not None:
-                            rows_to_insert.append((
-                                product_id,
-                                rating,
-                                review_text if review_text else ""
-                            ))
+                    with span('scraper.parse', asin=asin) as s:
+                        for item in dataset_items:
+                            # --- Extract relevant fields based on web_wanderer output ---
+                            rating = item.get('rating')
+                            review_text = item.get('reviewText') # Matches sample output
+
+                            if review_text or rating is not None:
+                                rows_to_insert.append((
+                                    product_id,
+                                    rating,
+                                    review_text if review_text else ""
+                                ))
+                        s.add(items=len(dataset_items))
 
                     if rows_to_insert:
-                        cursor.executemany(
-                            """INSERT OR IGNORE INTO reviews (product_id, rating, review_text)
-                               VALUES (?, ?, ?)""",
-                            rows_to_insert
-                        )
-                        conn.commit()
+                        with span('sqlite.insert', table='reviews', asin=asin) as s:
+                            cursor.executemany(
+                                """INSERT OR IGNORE INTO reviews (product_id, rating, review_text)
+                                   VALUES (?, ?, ?)""",
+                                rows_to_insert
+                            )
+                            conn.commit()
+                            s.add(items=len(rows_to_insert))
+                        count('sqlite.commits')
                         reviews_saved_for_product = len(rows_to_insert)
                         reviews_saved_total += reviews_saved_for_product
                         print(f"     SUCCESS: Saved {reviews_saved_for_product} reviews for this product to DB.")
@@ -156,7 +172,8 @@ def scrape_amazon_reviews_apify(conn, products_to_scrape):
 
         sleep_time = random.randint(2, 5)
         print(f"   Waiting {sleep_time} seconds before next product...")
-        time.sleep(sleep_time)
+        with span('scraper.throttle_sleep', seconds=sleep_time):
+            time.sleep(sleep_time)
 
     return reviews_saved_total
 
@@ -201,4 +218,5 @@ def main():
             print("\nDatabase connection closed.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profiled('scraper.reviews'):
+        main()
\ No newline at end of file
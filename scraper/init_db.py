@@ -4,12 +4,12 @@ import os
 # Define the path for our database
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'licensing_data.db')
 
-def create_database():
+def create_database(db_path=DB_PATH):
     # Create the data directory if it doesn't exist
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
 
-    print(f"Connecting to database at {DB_PATH}...")
-    conn = sqlite3.connect(DB_PATH)
+    print(f"Connecting to database at {db_path}...")
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     # --- Create 'brands' table (No change) ---
@@ -85,6 +85,11 @@ def create_database():
     ''')
     print("Created 'reviews' table.")
 
+    # --- Indexes for the analytics aggregates (brand_metrics, hype_velocity) ---
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_brand_date ON tweets (brand_name, tweet_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_brand_id ON products (brand_id)")
+    print("Created indexes.")
+
     # Commit the changes and close the connection
     conn.commit()
     conn.close()